@@ -0,0 +1,32 @@
+import os
+import random
+import sys
+from functools import lru_cache
+import pytest
+
+# Los módulos se importan como en la aplicación (core.*, ui.*, metrics.*):
+# puzzle_ia en sys.path, se lance pytest desde donde se lance
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.algorithms import BFS
+from core.generator import random_walk
+from core.problem import Puzzle
+
+@lru_cache(maxsize=None)
+def _bfs_length(board):
+    path, _ = BFS(Puzzle(board))
+    return None if path is None else len(path) - 1
+
+@pytest.fixture
+def optimal():
+    # Longitud óptima de un tablero por BFS: la referencia de los demás algoritmos
+    return _bfs_length
+
+@pytest.fixture
+def boards():
+    # boards(seed, k, depth): k tableros 3x3 reproducibles a `depth` movimientos
+    # como mucho de la meta (la BFS de referencia sigue siendo rápida)
+    def make(seed, k=6, depth=16):
+        rng = random.Random(seed)
+        return [random_walk(depth, rng=rng) for _ in range(k)]
+    return make
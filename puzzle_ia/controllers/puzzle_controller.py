@@ -1,15 +1,26 @@
 import time
 from kivy.clock import Clock
-from core.heuristics import manhattan, misplaced, linear_conflict
-from ui.dispatcher import solve_puzzle
+from ui.dispatcher import solve_puzzle, HEURISTICS, HEURISTIC_ALGORITHMS, available_heuristics
 from core.problem import Puzzle, PuzzleState
-from core.abstracts import State
+from core.abstracts import State, SearchLimitExceeded
+from core.stats import SearchStats
+from controllers.solve_worker import SolveWorker
+from ui.solve_cache import SolveCache
 
 class PuzzleController:
-    def __init__(self, app, problem, metrics):
+    # Límite de tiempo por búsqueda en segundos (None = sin límite)
+    solve_timeout = 60
+    # Deslizamiento de fichas: fracción del intervalo de animación; por debajo
+    # de tween_min_interval las fichas saltan (no da tiempo a verlo)
+    tween_fraction = 0.6
+    tween_min_interval = 0.15
+
+    def __init__(self, app, problem, metrics, cache=None):
         self.app = app
         self.problem: Puzzle = problem
         self.metrics = metrics
+        # Reset / "Again?" sobre el mismo tablero no vuelven a buscar
+        self.cache = cache if cache is not None else SolveCache()
         self.solution_steps = []
         self.current_step_index = 0
 
@@ -19,14 +30,20 @@ class PuzzleController:
         self.is_animating = False
         self.is_paused = False
 
+        # ---- búsqueda en segundo plano ----
+        self.worker = None
+
     # ------------------------
     # Spinners
     # ------------------------
     def on_algorithm_selected(self, spinner, text):
-        heuristic_algos = ["A*", "Greedy", "Weighted A*", "IDA*"]
-        if text in heuristic_algos:
-            self.app.layout.heuristic_spinner.opacity = 1
-            self.app.layout.heuristic_spinner.disabled = False
+        if text in HEURISTIC_ALGORITHMS:
+            spinner = self.app.layout.heuristic_spinner
+            spinner.values = available_heuristics(self.problem, text)
+            if spinner.text not in spinner.values:
+                spinner.text = "Choose the heuristic"
+            spinner.opacity = 1
+            spinner.disabled = False
         else:
             self.app.layout.heuristic_spinner.opacity = 0
             self.app.layout.heuristic_spinner.disabled = True
@@ -45,62 +62,101 @@ class PuzzleController:
             self.app.show_popup("Info", "Animation is already running. Please wait.")
             return
 
+        if self.is_solving():
+            self.app.show_popup("Info", "A search is already running. Cancel it or wait.")
+            return
+
         self.app.layout.play_button.text = "Solving..."
         self.app.layout.play_button.disabled = True
 
-        Clock.schedule_once(lambda dt: self.solve_puzzle(selected_algorithm), 0.1)
+        self.solve_puzzle(selected_algorithm)
 
     def solve_puzzle(self, algorithm_name):
+        # La búsqueda corre en un hilo; el resultado vuelve por Clock
         print(f"Starting to solve with {algorithm_name}...")
 
-        solution_path = None
-        expanded_nodes = 0
-        elapsed_time = 0
+        stats = SearchStats()
+        heuristic = self.app.layout.heuristic_spinner.text
+        heuristic_func = None
+        if algorithm_name in HEURISTIC_ALGORITHMS and heuristic in available_heuristics(self.problem, algorithm_name):
+            heuristic_func = HEURISTICS[heuristic]
+        if algorithm_name in HEURISTIC_ALGORITHMS and not heuristic_func:
+            self.error_solution("Please select a heuristic for this algorithm.")
+            return
+
+        problem = self.problem
 
-        try:
+        def job(worker):
             start_time = time.time()
-            heuristics = {
-                "Manhattan": manhattan,
-                "Misplaced Tiles": misplaced,
-                "Linear Conflict": linear_conflict,
-            }
-            heuristic = self.app.layout.heuristic_spinner.text
-            heuristic_func = heuristics.get(heuristic)
-
-            if algorithm_name in ["A*", "Greedy", "Weighted A*", "IDA*"]:
-                if heuristic_func:
-                    solution_path, expanded_nodes = solve_puzzle(
-                        self.problem, algorithm_name, heuristic=heuristic_func
-                    )
-                else:
-                    self.error_solution("Please select a heuristic for this algorithm.")
-                    return
-            else:
-                solution_path, expanded_nodes = solve_puzzle(self.problem, algorithm_name)
-
-            elapsed_time = time.time() - start_time
-
-        except ValueError as e:
-            self.app.show_popup("Error", str(e))
-            return
-        except Exception as e:
-            self.app.show_popup("Error", f"An unexpected error occurred: {e}")
-            return
-        finally:
-            if solution_path and all(hasattr(node.state, 'tiles') for node in solution_path):
-                self.solution_steps = solution_path
-                self.current_step_index = 0
-                self.metrics.set(
-                    algoritmo=algorithm_name,
-                    heuristica=heuristic if heuristic_func else None,
-                    solucion_encontrada=True,
-                    pasos=len(solution_path) - 1,
-                    nodos_expandidos=expanded_nodes,
-                    tiempo=round(elapsed_time, 4)
-                )
-                self.start_animation()
+            solution_path, expanded_nodes = self.cache.solve(
+                worker.limited(problem, stats), algorithm_name, heuristic=heuristic_func, stats=stats
+            )
+            return solution_path, expanded_nodes, time.time() - start_time
+
+        def done(result, error):
+            Clock.schedule_once(lambda dt: self._on_solved(
+                algorithm_name, heuristic if heuristic_func else None, stats, result, error))
+
+        self._start_worker(job, done)
+
+    def _on_solved(self, algorithm_name, heuristic, stats, result, error):
+        self._finish_worker()
+        if isinstance(error, SearchLimitExceeded):
+            if error.reason == "cancelado":
+                self.error_solution(f"Search cancelled after {error.expanded} expanded nodes.")
+            elif error.reason == "tiempo":
+                self.error_solution(f"Time limit reached ({self.solve_timeout}s, {error.expanded} expanded nodes).")
             else:
-                self.error_solution("No solution found or invalid solution path.")
+                self.error_solution(f"Search budget exceeded ({error.reason}, {error.expanded} expanded nodes).")
+            return
+        if isinstance(error, ValueError):
+            self.error_solution(str(error))
+            return
+        if error is not None:
+            self.error_solution(f"An unexpected error occurred: {error}")
+            return
+
+        solution_path, expanded_nodes, elapsed_time = result
+        if solution_path and all(hasattr(node.state, 'tiles') for node in solution_path):
+            self.solution_steps = solution_path
+            self.current_step_index = 0
+            self.metrics.set(
+                algoritmo=algorithm_name,
+                heuristica=heuristic,
+                solucion_encontrada=True,
+                pasos=len(solution_path) - 1,
+                nodos_expandidos=expanded_nodes,
+                tiempo=round(elapsed_time, 4),
+                estadisticas=stats
+            )
+            self.start_animation()
+        else:
+            self.error_solution("No solution found or invalid solution path.")
+
+    # ------------------------
+    # Búsqueda en segundo plano
+    # ------------------------
+    def is_solving(self):
+        return self.worker is not None and self.worker.is_running()
+
+    def _start_worker(self, job, on_done):
+        self.worker = SolveWorker(self.solve_timeout, self._on_worker_progress)
+        self.app.layout.cancel_button.disabled = False
+        self.worker.start(job, on_done)
+
+    def _finish_worker(self):
+        self.worker = None
+        self.app.layout.cancel_button.disabled = True
+        self.app.layout.progress_label.text = ""
+
+    def _on_worker_progress(self, expanded, bound):
+        # Llega desde el hilo de trabajo: se pinta en el hilo principal
+        text = f"{expanded} nodes" if bound is None else f"{expanded} nodes | f <= {bound}"
+        Clock.schedule_once(lambda dt: setattr(self.app.layout.progress_label, "text", text))
+
+    def cancel_solve(self, *_):
+        if self.worker is not None:
+            self.worker.cancel()
 
     # ------------------------
     # Animación con play/pause/step
@@ -119,7 +175,7 @@ class PuzzleController:
             return
         if self.current_step_index < len(self.solution_steps):
             state = self.solution_steps[self.current_step_index].state
-            self.update_board_ui(state)
+            self.update_board_ui(state, animate=True)
             self.current_step_index += 1
         else:
             self.stop_animation()
@@ -175,14 +231,14 @@ class PuzzleController:
     # Juego manual
     # ------------------------
     def on_tile_press(self, index):
-        if self.is_animating:
+        if self.is_animating or self.is_solving():
             return
         current_state = self.problem.start
         tiles = list(current_state.tiles)
         empty_index = tiles.index(0)
         if self.is_adjacent(index, empty_index):
             tiles[empty_index], tiles[index] = tiles[index], tiles[empty_index]
-            new_state = PuzzleState(tiles)
+            new_state = PuzzleState(tiles, index)
             self.problem.start = new_state
             self.app.layout.reset_board(new_state.tiles)
             if self.is_goal_state(new_state):
@@ -191,8 +247,9 @@ class PuzzleController:
                 self.app.layout.play_button.disabled = False
 
     def is_adjacent(self, i1, i2):
-        x1, y1 = divmod(i1, 3)
-        x2, y2 = divmod(i2, 3)
+        n = self.problem.n
+        x1, y1 = divmod(i1, n)
+        x2, y2 = divmod(i2, n)
         return abs(x1 - x2) + abs(y1 - y2) == 1
 
     def is_goal_state(self, state: State) -> bool:
@@ -201,11 +258,12 @@ class PuzzleController:
     # ------------------------
     # Utilidades
     # ------------------------
-    def update_board_ui(self, state: State):
-        self.app.layout.board_layout.clear_widgets()
-        for index, tile in enumerate(state.tiles):
-            btn = self.app.layout.create_tile(tile, index)
-            self.app.layout.board_layout.add_widget(btn)
+    def update_board_ui(self, state: State, animate=False):
+        # Solo se mueven las fichas que cambian de celda
+        duration = 0
+        if animate and self.anim_speed >= self.tween_min_interval:
+            duration = self.anim_speed * self.tween_fraction
+        self.app.layout.board_layout.set_state(state.tiles, duration)
 
     def error_solution(self, message):
         self.app.show_popup("Error", message)
@@ -216,30 +274,50 @@ class PuzzleController:
     # Comparador de heurísticas
     # ------------------------
     def run_heuristic_comparison(self, *_ , algorithm="A*"):
-        cases = [
-            ("Manhattan",        manhattan),
-            ("Misplaced Tiles",  misplaced),
-            ("Linear Conflict",  linear_conflict),
-        ]
-        rows = []
-        for name, h in cases:
-            t0 = time.perf_counter()
-            try:
-                path, expanded = solve_puzzle(self.problem, algorithm, heuristic=h)
-                elapsed = time.perf_counter() - t0
-                steps = len(path) - 1 if path else None
-                rows.append({
-                    "Heurística": name,
-                    "Tiempo (s)": round(elapsed, 4),
-                    "Pasos": steps if steps is not None else "-",
-                    "Expandidos": expanded
-                })
-            except Exception as e:
-                rows.append({
-                    "Heurística": name,
-                    "Tiempo (s)": None,
-                    "Pasos": None,
-                    "Expandidos": None,
-                    "Error": str(e)
-                })
+        if self.is_solving():
+            self.app.show_popup("Info", "A search is already running. Cancel it or wait.")
+            return
+        problem = self.problem
+        cases = [(name, HEURISTICS[name]) for name in available_heuristics(problem, algorithm)]
+
+        def job(worker):
+            rows = []
+            for name, h in cases:
+                t0 = time.perf_counter()
+                try:
+                    # sin caché: aquí interesa medir cada heurística
+                    path, expanded = solve_puzzle(worker.limited(problem), algorithm, heuristic=h)
+                    elapsed = time.perf_counter() - t0
+                    steps = len(path) - 1 if path else None
+                    rows.append({
+                        "Heurística": name,
+                        "Tiempo (s)": round(elapsed, 4),
+                        "Pasos": steps if steps is not None else "-",
+                        "Expandidos": expanded
+                    })
+                except Exception as e:
+                    # cancelar corta toda la comparación, no solo esta fila
+                    if isinstance(e, SearchLimitExceeded) and e.reason == "cancelado":
+                        raise
+                    rows.append({
+                        "Heurística": name,
+                        "Tiempo (s)": None,
+                        "Pasos": None,
+                        "Expandidos": None,
+                        "Error": str(e)
+                    })
+            return rows
+
+        def done(rows, error):
+            Clock.schedule_once(lambda dt: self._on_compared(algorithm, rows, error))
+
+        self.app.layout.compare_button.disabled = True
+        self._start_worker(job, done)
+
+    def _on_compared(self, algorithm, rows, error):
+        self._finish_worker()
+        self.app.layout.compare_button.disabled = False
+        if error is not None:
+            self.app.show_popup("Info", str(error))
+            return
         self.app.show_comparison(rows, title=f"Comparación ({algorithm})")
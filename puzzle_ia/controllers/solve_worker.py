@@ -0,0 +1,49 @@
+import threading
+import time
+from core.abstracts import LimitedProblem
+
+# Ejecuta búsquedas en un hilo aparte para no congelar la interfaz.
+# No depende de Kivy: los callbacks se llaman desde el hilo de trabajo y es
+# quien los pasa (el controlador) el que los lleva al hilo principal con Clock.
+
+class SolveWorker:
+    def __init__(self, time_limit=None, on_progress=None, progress_every=0.25):
+        self.time_limit = time_limit          # segundos por cada búsqueda
+        self.on_progress = on_progress        # on_progress(expandidos, cota_f o None)
+        self.progress_every = progress_every
+        self.cancelled = threading.Event()
+        self.thread = None
+        self._stats = None
+        self._last = 0.0
+
+    def limited(self, problem, stats=None):
+        # Problema envuelto con timeout, cancelación y avisos de progreso.
+        # Con stats se informa también la cota f actual (IDA*).
+        self._stats = stats
+        return LimitedProblem(problem, None, self.time_limit, self.cancelled, self._check)
+
+    def _check(self, problem):
+        if self.on_progress is None: return
+        now = time.perf_counter()
+        if now - self._last < self.progress_every: return
+        self._last = now
+        stats = self._stats
+        self.on_progress(problem.expanded, stats.bounds[-1] if stats is not None and stats.bounds else None)
+
+    def start(self, job, on_done):
+        # job(worker) -> resultado; on_done(resultado, excepción o None)
+        def run():
+            try:
+                result = job(self)
+            except Exception as e:
+                on_done(None, e)
+            else:
+                on_done(result, None)
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
@@ -1,4 +1,4 @@
-
+import time
 from typing import Any, Iterable, Optional, List, Tuple
 
 class State:
@@ -11,17 +11,81 @@ class Problem:
     def is_goal(self, s: State) -> bool: raise NotImplementedError
     def actions(self, s: State) -> Iterable[Any]: raise NotImplementedError
     def result(self, s: State, a: Any) -> State: raise NotImplementedError
+    # Solo para búsquedas bidireccionales: el estado meta concreto
+    def goal_state(self) -> State: raise NotImplementedError
     def step_cost(self, s: State, a: Any, sp: State) -> float: return 1.0
 
+class SearchLimitExceeded(Exception):
+    # Se lanza cuando una búsqueda supera su presupuesto (nodos, tiempo, ...)
+    def __init__(self, reason, expanded):
+        super().__init__(f"Límite de búsqueda superado ({reason}) tras {expanded} nodos expandidos")
+        self.reason = reason; self.expanded = expanded
+
+class LimitedProblem(Problem):
+    # Envuelve un problema y corta cualquier algoritmo por nodos o tiempo.
+    # Cada llamada a actions() cuenta como una expansión.
+    # cancel: objeto con is_set() (p. ej. threading.Event) para cancelar desde otro hilo.
+    # on_check(problem): se llama cada 256 expansiones (progreso).
+    def __init__(self, problem: Problem, max_nodes=None, time_limit=None, cancel=None, on_check=None):
+        self.problem = problem; self.max_nodes = max_nodes; self.expanded = 0
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.cancel = cancel; self.on_check = on_check
+        self._periodic = time_limit is not None or cancel is not None or on_check is not None
+    def initial_state(self): return self.problem.initial_state()
+    def is_goal(self, s): return self.problem.is_goal(s)
+    def result(self, s, a): return self.problem.result(s, a)
+    def step_cost(self, s, a, sp): return self.problem.step_cost(s, a, sp)
+    def goal_state(self): return self.problem.goal_state()
+    def tick(self):
+        # Cuenta una expansión; los motores que no llaman a actions() lo usan directamente
+        self.expanded += 1
+        if self.max_nodes is not None and self.expanded > self.max_nodes:
+            raise SearchLimitExceeded("nodos", self.expanded - 1)
+        # reloj, cancelación y progreso solo cada 256 expansiones
+        if self._periodic and not self.expanded & 255:
+            if self.cancel is not None and self.cancel.is_set():
+                raise SearchLimitExceeded("cancelado", self.expanded)
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchLimitExceeded("tiempo", self.expanded)
+            if self.on_check is not None: self.on_check(self)
+    def check(self, expanded):
+        # Para motores que cuentan las expansiones en otros procesos (HDA*,
+        # IDA* paralelo): mismos cortes que tick con el total acumulado
+        self.expanded = expanded
+        if self.max_nodes is not None and expanded > self.max_nodes:
+            raise SearchLimitExceeded("nodos", expanded)
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchLimitExceeded("cancelado", expanded)
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchLimitExceeded("tiempo", expanded)
+        if self.on_check is not None: self.on_check(self)
+    def actions(self, s):
+        self.tick()
+        return self.problem.actions(s)
+    def __getattr__(self, name):
+        # n, goal, tables, print_state... del problema envuelto
+        return getattr(self.problem, name)
+
+class Heuristic:
+    # h(state). Opcionalmente delta(parent_state, action, child_state, parent_h)
+    # devuelve h(child_state) a partir de la del padre sin recorrer todo el tablero.
+    def __call__(self, s: State) -> float: raise NotImplementedError
+
 class Node:
-    __slots__ = ("state","parent","action","g","depth")
-    def __init__(self, state: State, parent: Optional['Node']=None, action=None, g: float=0.0):
+    __slots__ = ("state","parent","action","g","depth","h")
+    def __init__(self, state: State, parent: Optional['Node']=None, action=None, g: float=0, h=None):
         self.state = state; self.parent = parent; self.action = action; self.g = g
         self.depth = 0 if parent is None else parent.depth + 1
-    def expand(self, problem: Problem):
+        self.h = h
+    def expand(self, problem: Problem, h=None):
+        # Con h, cada hijo sale con su h cacheada (vía h.delta si existe)
+        delta = getattr(h, "delta", None) if self.h is not None else None
         for a in problem.actions(self.state):
             sp = problem.result(self.state, a)
-            yield Node(sp, self, a, self.g + problem.step_cost(self.state, a, sp))
+            c = Node(sp, self, a, self.g + problem.step_cost(self.state, a, sp))
+            if delta is not None: c.h = delta(self.state, a, sp, self.h)
+            elif h is not None: c.h = h(sp)
+            yield c
 
 # Function that reconstructs the path from the initial state to the goal state
 def reconstruct_path(node):
@@ -30,3 +94,12 @@ def reconstruct_path(node):
         path.append(node)
         node = node.parent
     return list(reversed(path))
+
+def path_from_actions(problem, actions):
+    # Reconstruye la lista de Node (misma forma que reconstruct_path)
+    n = Node(problem.initial_state()); path = [n]
+    for a in actions:
+        sp = problem.result(n.state, a)
+        n = Node(sp, n, a, n.g + problem.step_cost(n.state, a, sp))
+        path.append(n)
+    return path
@@ -1,22 +1,17 @@
-from core.structures import MinHeap, Queue, Stack
-from core.problem import Problem
-from core.abstracts import Node, reconstruct_path
-
-
-class PriorityQueue:
-    # redefinida aquí para aislar dependencia (opcional: usa la de estructuras)
-    def __init__(self):
-        self._h = MinHeap()
-        self._t = 0
-    def push(self, priority, item):
-        self._t += 1
-        self._h.push((priority, self._t, item))
-    def pop(self):
-        return self._h.pop()[2]
-    def is_empty(self): return self._h.is_empty()
-    def __len__(self): return len(self._h)
-
-def BFS(problem: Problem):
+from core.structures import Queue, Stack, PriorityQueue, IndexedHeap
+from core.problem import Problem, board_tables
+import heapq
+from functools import partial
+from core.abstracts import Node, reconstruct_path, path_from_actions
+from core.ida import ida_star_board
+from core.sma import sma_star
+from core.compact import compact_bfs, compact_ucs
+from core.hda import hda_star
+from core.parallel_ida import parallel_ida_star
+
+# stats: SearchStats opcional (core.stats); con None no hay coste extra
+
+def BFS(problem: Problem, stats=None):
     frontier = Queue()
     frontier.enqueue(Node(problem.initial_state()))
     explored = set()
@@ -24,12 +19,15 @@ def BFS(problem: Problem):
     while not frontier.is_empty():
         n = frontier.dequeue()
         if problem.is_goal(n.state): return reconstruct_path(n), expanded
-        if n.state in explored: continue
+        if n.state in explored:
+            if stats is not None: stats.duplicates += 1
+            continue
         explored.add(n.state); expanded += 1
-        for c in n.expand(problem): frontier.enqueue(c)
+        for c in (n.expand(problem) if stats is None else stats.expand(n, problem)): frontier.enqueue(c)
+        if stats is not None: stats.after_expand(len(frontier))
     return None, expanded
 
-def DFS(problem: Problem, depth_limit=None):
+def DFS(problem: Problem, depth_limit=None, stats=None):
     frontier = Stack()
     frontier.push(Node(problem.initial_state()))
     explored = set()
@@ -37,100 +35,273 @@ def DFS(problem: Problem, depth_limit=None):
     while not frontier.is_empty():
         n = frontier.pop()
         if problem.is_goal(n.state): return reconstruct_path(n), expanded
-        if n.state in explored: continue
+        if n.state in explored:
+            if stats is not None: stats.duplicates += 1
+            continue
         if depth_limit is not None and n.depth > depth_limit: continue
         explored.add(n.state); expanded += 1
-        for c in n.expand(problem): frontier.push(c)
+        for c in (n.expand(problem) if stats is None else stats.expand(n, problem)): frontier.push(c)
+        if stats is not None: stats.after_expand(len(frontier))
     return None, expanded
 
-def UCS(problem: Problem):
-    pq = PriorityQueue()
+def UCS(problem: Problem, frontier=PriorityQueue, stats=None):
+    pq = frontier()
     start = Node(problem.initial_state())
-    pq.push(0.0, start)
-    best = {start.state: 0.0}
+    pq.push(0, start)
+    best = {start.state: 0}
     expanded = 0
     while not pq.is_empty():
         n = pq.pop()
         if problem.is_goal(n.state): return reconstruct_path(n), expanded
         expanded += 1
-        for c in n.expand(problem):
+        for c in (n.expand(problem) if stats is None else stats.expand(n, problem)):
             if c.state not in best or c.g < best[c.state]:
+                if stats is not None and c.state in best: stats.reopened += 1
                 best[c.state] = c.g
                 pq.push(c.g, c)
+            elif stats is not None: stats.duplicates += 1
+        if stats is not None: stats.after_expand(len(pq))
     return None, expanded
 
-def Greedy(problem: Problem, h):
-    pq = PriorityQueue()
+def Greedy(problem: Problem, h, frontier=PriorityQueue, stats=None):
+    pq = frontier()
     start = Node(problem.initial_state())
-    pq.push(h(start.state), start)
+    start.h = h(start.state)
+    pq.push(start.h, start)
     seen = set()
     expanded = 0
     while not pq.is_empty():
         n = pq.pop()
         if problem.is_goal(n.state): return reconstruct_path(n), expanded
-        if n.state in seen: continue
+        if n.state in seen:
+            if stats is not None: stats.duplicates += 1
+            continue
         seen.add(n.state); expanded += 1
-        for c in n.expand(problem): pq.push(h(c.state), c)
+        for c in (n.expand(problem, h) if stats is None else stats.expand(n, problem, h)): pq.push(c.h, c)
+        if stats is not None: stats.after_expand(len(pq))
     return None, expanded
 
-def A_star(problem: Problem, h):
-    pq = PriorityQueue()
+def _best_first(problem, h, weight, frontier, stats, decrease_key, consistent):
+    # Núcleo común de A* y Weighted A*: f = g + weight*h.
+    # - Entradas obsoletas (g peor que best[estado]) se descartan al sacarlas.
+    # - decrease_key: frontera IndexedHeap, una sola entrada por estado.
+    # - consistent: con h consistente un estado cerrado nunca se reabre.
+    # best hace de lista abierta y cerrada a la vez: guarda g mientras el
+    # estado está abierto y -1-g cuando se cierra (negativo = cerrado), así
+    # no hace falta un set aparte.
+    pq = IndexedHeap() if decrease_key else frontier()
     start = Node(problem.initial_state())
-    pq.push(h(start.state) + start.g, start)
-    best = {start.state: 0.0}
+    start.h = h(start.state)
+    f_start = start.g + weight * start.h
+    if decrease_key: pq.push(f_start, start, start.state)
+    else: pq.push(f_start, start)
+    best = {start.state: 0}
     expanded = 0
     while not pq.is_empty():
         n = pq.pop()
+        g = best[n.state]
+        if g < 0 or n.g > g:
+            if stats is not None: stats.duplicates += 1
+            continue
         if problem.is_goal(n.state): return reconstruct_path(n), expanded
+        best[n.state] = -1 - n.g
         expanded += 1
-        for c in n.expand(problem):
-            f = c.g + h(c.state)
-            if c.state not in best or c.g < best[c.state]:
-                best[c.state] = c.g
-                pq.push(f, c)
+        for c in (n.expand(problem, h) if stats is None else stats.expand(n, problem, h)):
+            s = c.state
+            g = best.get(s)
+            if g is not None:
+                if g < 0:
+                    if consistent or c.g >= -1 - g:
+                        if stats is not None: stats.duplicates += 1
+                        continue
+                    if stats is not None: stats.reopened += 1
+                elif c.g >= g:
+                    if stats is not None: stats.duplicates += 1
+                    continue
+            best[s] = c.g
+            f = c.g + weight * c.h
+            if decrease_key: pq.push(f, c, s)
+            else: pq.push(f, c)
+        if stats is not None: stats.after_expand(len(pq))
     return None, expanded
 
-def IDA_star(problem: Problem, h):
+def A_star(problem: Problem, h, frontier=PriorityQueue, stats=None, decrease_key=False, consistent=False):
+    return _best_first(problem, h, 1, frontier, stats, decrease_key, consistent)
+
+def IDA_star(problem: Problem, h, stats=None, tt_size=None):
+    # Tableros: motor iterativo en el sitio (core.ida). tt_size activa la tabla de transposición.
+    if hasattr(problem, "tables"):
+        return ida_star_board(problem, h, tt_size, stats)
     from math import inf
     start = Node(problem.initial_state())
-    bound = h(start.state)
+    start.h = bound = h(start.state)
     expanded_total = 0
 
-    def dfs_limited(n, g, bound):
-        nonlocal expanded_total
-        f = g + h(n.state)
-        if f > bound: return f, None
-        if problem.is_goal(n.state): return f, reconstruct_path(n)
+    # Versión genérica con pila explícita: (nodo, iterador de hijos)
+    while True:
+        if stats is not None: stats.bounds.append(bound)
         m = inf
-        for c in n.expand(problem):
-            expanded_total += 1
-            t, sol = dfs_limited(c, g + (c.g - n.g), bound)
-            if sol is not None: return t, sol
-            if t < m: m = t
-        return m, None
+        stack = [(start, None)]
+        while stack:
+            n, children = stack[-1]
+            if children is None:
+                f = n.g + n.h
+                if f > bound:
+                    stack.pop()
+                    if f < m: m = f
+                    continue
+                if problem.is_goal(n.state): return reconstruct_path(n), expanded_total
+                children = iter(n.expand(problem, h) if stats is None else stats.expand(n, problem, h))
+                stack[-1] = (n, children)
+                if stats is not None: stats.after_expand(len(stack))
+            c = next(children, None)
+            if c is None:
+                stack.pop()
+            elif n.parent is None or c.state != n.parent.state:
+                expanded_total += 1
+                stack.append((c, None))
+        if m == inf: return None, expanded_total
+        bound = m
 
-    while True:
-        t, sol = dfs_limited(start, 0, bound)
-        if sol is not None: return sol, expanded_total
-        if t == float("inf"): return None, expanded_total
-        bound = t
+def Weighted_A_star(problem: Problem, h, weight=1.5, frontier=PriorityQueue, stats=None,
+                    decrease_key=False, consistent=False):
+    return _best_first(problem, h, weight, frontier, stats, decrease_key, consistent)
 
-def Weighted_A_star(problem: Problem, h, weight=1.5):
-    pq = PriorityQueue()
-    start = Node(problem.initial_state())
-    f_start = start.g + weight * h(start.state)
-    pq.push(f_start, start)
-    best = {start.state: 0.0}
+def Compact_BFS(problem: Problem, stats=None):
+    # BFS sobre tableros empaquetados (core.compact): ~10x menos memoria que BFS
+    return compact_bfs(problem, stats)
+
+def Compact_UCS(problem: Problem, cost=None, stats=None):
+    # cost(ficha) -> coste entero del movimiento; por defecto 1
+    return compact_ucs(problem, cost, stats)
+
+def SMA_star(problem: Problem, h, max_nodes=None, max_bytes=None, stats=None):
+    # A* con memoria acotada (core.sma): presupuesto en nodos o en bytes estimados
+    return sma_star(problem, h, max_nodes, max_bytes, stats)
+
+def HDA_star(problem: Problem, h, workers=None, stats=None):
+    # A* en varios procesos con el espacio repartido por hash (core.hda); solo tableros
+    if not hasattr(problem, "tables"):
+        return A_star(problem, h, stats=stats)
+    return hda_star(problem, h, workers, stats=stats)
+
+def Parallel_IDA_star(problem: Problem, h, workers=None, stats=None):
+    # IDA* con los subárboles de una frontera poco profunda repartidos en procesos (core.parallel_ida)
+    if not hasattr(problem, "tables"):
+        return IDA_star(problem, h, stats=stats)
+    return parallel_ida_star(problem, h, workers, stats=stats)
+
+# ---- Búsquedas bidireccionales (requieren problem.goal_state() y movimientos reversibles) ----
+
+def _join_paths(problem, node_f, node_b):
+    # node_f: inicio -> encuentro; node_b: meta -> encuentro (hacia atrás).
+    # Las acciones de la mitad trasera se recalculan hacia delante.
+    actions = [n.action for n in reconstruct_path(node_f)[1:]]
+    cur, nb = node_f.state, node_b
+    while nb.parent is not None:
+        nxt = nb.parent.state
+        actions.append(next(a for a in problem.actions(cur) if problem.result(cur, a) == nxt))
+        cur, nb = nxt, nb.parent
+    return path_from_actions(problem, actions)
+
+def Bidirectional_BFS(problem: Problem, stats=None):
+    start, goal = Node(problem.initial_state()), Node(problem.goal_state())
+    if problem.is_goal(start.state): return [start], 0
+    seen = ({start.state: start}, {goal.state: goal})
+    layers = ([start], [goal])
     expanded = 0
+    while layers[0] and layers[1]:
+        # se expande entera la capa más pequeña; el mejor encuentro de la capa es óptimo
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        mine, other = seen[side], seen[1 - side]
+        meet, best = None, None
+        nxt = []
+        for n in layers[side]:
+            expanded += 1
+            for c in (n.expand(problem) if stats is None else stats.expand(n, problem)):
+                if c.state in mine:
+                    if stats is not None: stats.duplicates += 1
+                    continue
+                mine[c.state] = c; nxt.append(c)
+                o = other.get(c.state)
+                if o is not None and (best is None or c.g + o.g < best):
+                    best, meet = c.g + o.g, (c, o)
+        if stats is not None: stats.after_expand(len(nxt) + len(layers[1 - side]))
+        if meet is not None:
+            f, b = meet if side == 0 else meet[::-1]
+            return _join_paths(problem, f, b), expanded
+        layers = (nxt, layers[1]) if side == 0 else (layers[0], nxt)
+    return None, expanded
 
-    while not pq.is_empty():
-        n = pq.pop()
-        if problem.is_goal(n.state):
-            return reconstruct_path(n), expanded
+def Bidirectional_A_star(problem: Problem, h, h_back=None, stats=None):
+    # A* bidireccional "front-to-end": hacia delante h estima la distancia a la
+    # meta y hacia atrás h_back la distancia al inicio. Por defecto h_back es
+    # h.for_goal(inicio) o, si no existe, h(s, goal=inicio).
+    # Termina cuando el mejor camino encontrado mu <= max(fmin adelante, fmin atrás).
+    start, goal = Node(problem.initial_state()), Node(problem.goal_state())
+    if problem.is_goal(start.state): return [start], 0
+    if h_back is None:
+        h_back = h.for_goal(start.state.tiles) if hasattr(h, "for_goal") else partial(h, goal=start.state.tiles)
+    hs = (h, h_back)
+    try:
+        start.h, goal.h = h(start.state), h_back(goal.state)
+    except ValueError as e:
+        # tablas precalculadas para una sola meta (PDB, base de soluciones)
+        raise ValueError(f"Bidirectional A* necesita una heurística que admita otra meta: {e}") from e
+    heaps = ([(start.h, 0, start)], [(goal.h, 0, goal)])
+    best = ({start.state: start}, {goal.state: goal})
+    closed = (set(), set())
+    mu, meet = float("inf"), None
+    t = expanded = 0
+    while heaps[0] and heaps[1]:
+        if mu <= max(heaps[0][0][0], heaps[1][0][0]): break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        heap, mine, other = heaps[side], best[side], best[1 - side]
+        n = heapq.heappop(heap)[2]
+        if mine[n.state] is not n or n.state in closed[side]:
+            if stats is not None: stats.duplicates += 1
+            continue
+        closed[side].add(n.state)
         expanded += 1
-        for c in n.expand(problem):
-            f = c.g + weight * h(c.state)
-            if c.state not in best or c.g < best[c.state]:
-                best[c.state] = c.g
-                pq.push(f, c)
-    return None, expanded
+        for c in (n.expand(problem, hs[side]) if stats is None else stats.expand(n, problem, hs[side])):
+            old = mine.get(c.state)
+            if old is not None and old.g <= c.g:
+                if stats is not None: stats.duplicates += 1
+                continue
+            if old is not None and stats is not None: stats.reopened += 1
+            mine[c.state] = c
+            closed[side].discard(c.state)
+            t += 1
+            heapq.heappush(heap, (c.g + c.h, t, c))
+            o = other.get(c.state)
+            if o is not None and c.g + o.g < mu:
+                mu, meet = c.g + o.g, (c, o) if side == 0 else (o, c)
+        if stats is not None: stats.after_expand(len(heaps[0]) + len(heaps[1]))
+    if meet is None: return None, expanded
+    return _join_paths(problem, *meet), expanded
+
+# ---- Base de soluciones (solo 3x3 con la meta estándar) ----
+
+def Solution_DB(problem: Problem, stats=None):
+    # Consulta la tabla precalculada (core.solution_db): un acceso por paso y
+    # ninguna expansión, así que devuelve 0 expandidos
+    from core.solution_db import load_or_build
+    if tuple(problem.goal_state().tiles) != board_tables(3).goal:
+        raise ValueError("La base de soluciones solo cubre el 3x3 con la meta estándar")
+    s = problem.initial_state()
+    actions = load_or_build().solve(s.tiles)
+    if actions is None: return None, 0
+    return path_from_actions(problem, actions), 0
+
+def Layered_BFS(problem: Problem, stats=None):
+    # BFS por capas con NumPy (core.layered): la tabla de distancias de la
+    # meta se calcula una vez y se comparte entre llamadas; solo 3x3 o menor.
+    # Expandidos: los estados de esa BFS si esta llamada la construye, si no 0
+    from core.layered import solve_boards
+    from core.stats import SearchStats
+    own = stats if stats is not None else SearchStats()
+    before = own.expanded
+    actions = solve_boards([problem.initial_state().tiles], problem.goal_state().tiles, own)[0]
+    expanded = own.expanded - before
+    if actions is None: return None, expanded
+    return path_from_actions(problem, actions), expanded
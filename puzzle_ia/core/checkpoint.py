@@ -0,0 +1,505 @@
+import argparse
+import os
+import signal
+import struct
+import threading
+import time
+import zlib
+from array import array
+from contextlib import contextmanager
+from math import inf
+from core.abstracts import path_from_actions
+from core.compact import CompactStore, ROOT, reconstruct_actions, _new_codes, _start
+from core.ida import ida_iteration
+from core.packed import unpack
+from core.parallel_ida import initial_tasks, split_task
+from core.problem import Puzzle, PuzzleState, board_tables
+
+# Puntos de control para búsquedas largas sobre tableros (BFS, A*, IDA*).
+# - Checkpointer decide cuándo toca (cada N expansiones y/o cada T segundos).
+#   En el hilo de la búsqueda solo se copian buffers planos (arrays del
+#   CompactStore y de la frontera: memcpy); el formato, zlib (que suelta el
+#   GIL) y la escritura van en otro hilo y el archivo se sustituye con
+#   os.replace (nunca queda a medias). Si la escritura anterior no ha
+#   terminado, esa instantánea se salta.
+# - Los motores continúan desde el archivo si existe. Al cortarse por límites
+#   o Ctrl-C se escribe una última instantánea antes de salir; al terminar,
+#   el archivo se borra.
+# - Ctrl-C se aplaza al principio del bucle (_deferred_interrupt) y un nodo
+#   a medio expandir vuelve a la frontera: la última instantánea siempre es
+#   un estado coherente.
+# Formato (enteros little-endian, arrays en el orden de bytes de la máquina):
+#   cabecera _HEAD (magia, versión, algoritmo, n), inicio y meta (un byte por
+#   celda), nombre de la heurística, contadores (int64) y secciones: tipo
+#   ('Q', 'H', 'B' o 'W' = claves anchas de `ancho` bytes), ancho, longitud y
+#   datos comprimidos. Se lee sin pickle: un archivo ajeno no ejecuta código,
+#   como mucho da ValueError.
+
+MAGIC = b"CKPT"
+VERSION = 3
+CHECKPOINT_ALGORITHMS = ("BFS", "A*", "IDA*")
+_HEAD = struct.Struct("<4sBBB")       # magia, versión, algoritmo, n
+_SECTION = struct.Struct("<cBQQ")     # tipo, ancho, bytes sin comprimir, bytes guardados
+ACTIONS = ("DOWN", "UP", "RIGHT", "LEFT")
+
+def _section(obj, width=0):
+    # Buffer plano -> (tipo, ancho, objeto); las listas son claves anchas (5x5+)
+    if isinstance(obj, list): return b"W", width, obj
+    if isinstance(obj, array): return obj.typecode.encode(), 0, obj
+    return b"B", 0, obj
+
+def _encode(snapshot):
+    algorithm, start, goal, name = snapshot["busqueda"]
+    out = [_HEAD.pack(MAGIC, VERSION, CHECKPOINT_ALGORITHMS.index(algorithm), snapshot["n"]),
+           bytes(start), bytes(goal)]
+    name = b"\xff" if name is None else name.encode()
+    out += [struct.pack("<B", len(name)), name]
+    counters = snapshot["counters"]
+    out.append(struct.pack(f"<B{len(counters)}q", len(counters), *counters))
+    # las secciones pueden venir diferidas: se arman aquí, fuera de la búsqueda
+    sections = snapshot["sections"]
+    if callable(sections): sections = sections()
+    out.append(struct.pack("<B", len(sections)))
+    for kind, width, obj in sections:
+        raw = b"".join(k.to_bytes(width, "little") for k in obj) if kind == b"W" else memoryview(obj).cast("B")
+        data = zlib.compress(raw, 1)
+        out += [_SECTION.pack(kind, width, len(raw), len(data)), data]
+    return out
+
+def _decode(raw, path):
+    bad = ValueError(f"{path} no es un punto de control válido")
+    try:
+        magic, version, algorithm, n = _HEAD.unpack_from(raw)
+        if magic != MAGIC or version != VERSION or algorithm >= len(CHECKPOINT_ALGORITHMS):
+            raise bad
+        off = _HEAD.size; size = n * n
+        start, goal = tuple(raw[off:off + size]), tuple(raw[off + size:off + 2 * size]); off += 2 * size
+        k = raw[off]; name = raw[off + 1:off + 1 + k]; off += 1 + k
+        name = None if name == b"\xff" else name.decode()
+        k = raw[off]; counters = list(struct.unpack_from(f"<{k}q", raw, off + 1)); off += 1 + 8 * k
+        sections = []
+        count = raw[off]; off += 1
+        for _ in range(count):
+            kind, width, length, stored = _SECTION.unpack_from(raw, off); off += _SECTION.size
+            data = zlib.decompress(raw[off:off + stored]); off += stored
+            if len(data) != length: raise bad
+            if kind == b"W":
+                sections.append([int.from_bytes(data[i:i + width], "little") for i in range(0, length, width)])
+            elif kind == b"B":
+                sections.append(bytearray(data))
+            else:
+                a = array(kind.decode()); a.frombytes(data); sections.append(a)
+    except (struct.error, IndexError, zlib.error, UnicodeDecodeError, ValueError) as e:
+        raise bad from e
+    return {"busqueda": (CHECKPOINT_ALGORITHMS[algorithm], start, goal, name), "n": n,
+            "counters": counters, "sections": sections}
+
+class Checkpointer:
+    def __init__(self, path, every_nodes=None, every_seconds=None):
+        self.path = path
+        self.every_nodes = every_nodes
+        self.every_seconds = every_seconds
+        self.writes = self.skipped = 0
+        self._thread = None
+        self._nodes = self._checked = 0
+        self._time = time.monotonic()
+
+    def due(self, expanded):
+        # Barato: el reloj solo se mira cada 1024 expansiones
+        if self.every_nodes is not None and expanded - self._nodes >= self.every_nodes: return True
+        if self.every_seconds is not None and expanded - self._checked >= 1024:
+            self._checked = expanded
+            return time.monotonic() - self._time >= self.every_seconds
+        return False
+
+    def save(self, snapshot, expanded=0, block=False):
+        # snapshot: cabecera + secciones ya copiadas (no deben cambiar mientras se escriben)
+        self._nodes = self._checked = expanded; self._time = time.monotonic()
+        if self._thread is not None and self._thread.is_alive():
+            if not block:
+                self.skipped += 1; return False
+            self._thread.join()
+        self._thread = threading.Thread(target=self._write, args=(snapshot,), daemon=True)
+        self._thread.start()
+        if block: self._thread.join()
+        return True
+
+    def _write(self, snapshot):
+        parts = _encode(snapshot)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            for p in parts: f.write(p)
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.writes += 1
+
+    def load(self):
+        # Última instantánea o None si no hay
+        try:
+            with open(self.path, "rb") as f: raw = f.read()
+        except FileNotFoundError:
+            return None
+        return _decode(raw, self.path)
+
+    def wait(self):
+        if self._thread is not None: self._thread.join()
+
+    def clear(self):
+        self.wait()
+        if os.path.exists(self.path): os.remove(self.path)
+
+@contextmanager
+def _deferred_interrupt():
+    # Ctrl-C solo activa la bandera; el motor lanza KeyboardInterrupt donde
+    # su estado es coherente. Las señales solo se capturan en el hilo principal
+    flag = [False]
+    if threading.current_thread() is not threading.main_thread():
+        yield flag; return
+    def handler(signum, frame): flag[0] = True
+    old = signal.signal(signal.SIGINT, handler)
+    try:
+        yield flag
+    finally:
+        signal.signal(signal.SIGINT, old if old is not None else signal.SIG_DFL)
+
+class _Frontier:
+    # Frontera de A* en cubetas [f][g] de arrays (códigos y huecos): se saca
+    # el menor f y, a igual f, el mayor g, como el montículo de (f, -g)
+    def __init__(self, tables):
+        self.wide = tables.bits * tables.size > 64
+        self.codes, self.blanks, self.counts = [], [], []
+        self.min = self.n = 0
+
+    def push(self, f, g, code, blank):
+        while len(self.codes) <= f:
+            self.codes.append([]); self.blanks.append([]); self.counts.append(0)
+        cf, bf = self.codes[f], self.blanks[f]
+        while len(cf) <= g:
+            cf.append([] if self.wide else array("Q")); bf.append(bytearray())
+        cf[g].append(code); bf[g].append(blank)
+        self.counts[f] += 1; self.n += 1
+        if f < self.min: self.min = f
+
+    def pop(self):
+        while not self.counts[self.min]: self.min += 1
+        f = self.min
+        cf, bf = self.codes[f], self.blanks[f]
+        while not cf[-1]:
+            cf.pop(); bf.pop()
+        self.counts[f] -= 1; self.n -= 1
+        return f, len(cf) - 1, cf[-1].pop(), bf[-1].pop()
+
+    def arrays(self):
+        # Copia plana: (f, g, cuántos) de cada cubeta + códigos y huecos concatenados
+        index = array("Q"); codes = [] if self.wide else array("Q"); blanks = bytearray()
+        for f, (cf, bf) in enumerate(zip(self.codes, self.blanks)):
+            for g, (c, b) in enumerate(zip(cf, bf)):
+                if c:
+                    index.extend((f, g, len(c))); codes.extend(c); blanks += b
+        return index, codes, blanks
+
+    @classmethod
+    def from_arrays(cls, tables, index, codes, blanks):
+        frontier = cls(tables); k = 0
+        for i in range(0, len(index), 3):
+            f, g, count = index[i:i + 3]
+            for j in range(k, k + count): frontier.push(f, g, codes[j], blanks[j])
+            k += count
+        return frontier
+
+    def __len__(self): return self.n
+
+def _heuristic_name(h):
+    if h is None: return None
+    return getattr(h, "name", None) or getattr(h, "__name__", None) or type(h).__name__
+
+def _resume(ckpt, algorithm, problem, h):
+    # Instantánea de esta misma búsqueda o None; otra búsqueda en el archivo es un error
+    snap = ckpt.load()
+    if snap is None: return None
+    key = (algorithm, tuple(problem.initial_state().tiles), tuple(problem.tables.goal), _heuristic_name(h))
+    if snap["busqueda"] != key:
+        raise ValueError(f"{ckpt.path} pertenece a otra búsqueda: {snap['busqueda']}")
+    return snap
+
+def _header(algorithm, problem, h):
+    return {"busqueda": (algorithm, tuple(problem.initial_state().tiles), tuple(problem.tables.goal),
+                         _heuristic_name(h)), "n": problem.tables.n}
+
+def _key_width(t):
+    return (t.bits * t.size + 7) // 8
+
+def _store_sections(t, store):
+    w = _key_width(t)
+    return [_section(a, w) for a in store.arrays()]
+
+def _restore_store(t, sections, size):
+    keys, g, parent = sections
+    return CompactStore.from_arrays(t.bits * t.size, keys, g, parent, size)
+
+def _guard(ckpt, snapshot, expanded):
+    # Al salir por una excepción (límites, cancelación, Ctrl-C) se guarda lo hecho
+    try:
+        ckpt.save(snapshot(), expanded, block=True)
+    except Exception:
+        pass
+
+def checkpointed_bfs(problem, ckpt, stats=None):
+    # Igual que compact_bfs; la instantánea es el almacén, lo que falta de la
+    # capa actual y lo generado de la siguiente. Un nodo a medio expandir se
+    # repite al reanudar: sus hijos ya guardados cuentan como duplicados
+    t, store, start, blank, goal = _start(problem)
+    if start == goal: return path_from_actions(problem, []), 0
+    moves, shifts, mask = t.moves, t.shifts, t.mask
+    tick = getattr(problem, "tick", None)
+    codes, blanks = _new_codes(t), bytearray([blank]); codes.append(start)
+    ncodes, nblanks = _new_codes(t), bytearray()
+    depth = expanded = 0
+    snap = _resume(ckpt, "BFS", problem, None)
+    if snap is not None:
+        depth, expanded, size = snap["counters"]
+        store = _restore_store(t, snap["sections"][:3], size)
+        codes, blanks, ncodes, nblanks = snap["sections"][3:]
+    i = 0
+    def snapshot():
+        w = _key_width(t)
+        return dict(_header("BFS", problem, None), counters=[depth, expanded, store.size],
+                    sections=_store_sections(t, store) + [_section(codes[i:], w), _section(blanks[i:]),
+                                                          _section(ncodes[:], w), _section(nblanks[:])])
+    with _deferred_interrupt() as interrupted:
+        try:
+            while codes:
+                while i < len(codes):
+                    if interrupted[0]: raise KeyboardInterrupt
+                    if ckpt.due(expanded): ckpt.save(snapshot(), expanded)
+                    if tick is not None: tick()
+                    code, b = codes[i], blanks[i]
+                    expanded += 1
+                    for _, j in moves[b]:
+                        tile = (code >> shifts[j]) & mask
+                        child = code - (tile << shifts[j]) + (tile << shifts[b])
+                        if store.find(child) >= 0:
+                            if stats is not None: stats.duplicates += 1
+                            continue
+                        store.put(child, depth + 1, b)
+                        if stats is not None: stats.generated += 1
+                        if child == goal:
+                            if stats is not None: stats.expanded += expanded
+                            ckpt.clear()
+                            return path_from_actions(problem, reconstruct_actions(store, t, child, j)), expanded
+                        ncodes.append(child); nblanks.append(j)
+                    i += 1
+                if stats is not None: stats.after_expand(len(ncodes))
+                codes, blanks, ncodes, nblanks = ncodes, nblanks, _new_codes(t), bytearray()
+                i = 0; depth += 1
+        except BaseException:
+            _guard(ckpt, snapshot, expanded)
+            raise
+    if stats is not None: stats.expanded += expanded
+    ckpt.clear()
+    return None, expanded
+
+def checkpointed_a_star(problem, h, ckpt, stats=None):
+    # A* sobre códigos empaquetados: g y padre en un CompactStore, frontera
+    # _Frontier; entradas con g peor que la guardada se descartan. Si la
+    # expansión se corta (p. ej. la heurística lanza), el nodo vuelve a la
+    # frontera: los hijos ya guardados también están en ella y el resto se
+    # genera al repetirla
+    t, store, start, blank, goal = _start(problem)
+    moves, shifts, mask = t.moves, t.shifts, t.mask
+    move_delta = getattr(h, "move_delta", None)
+    tick = getattr(problem, "tick", None)
+    h0 = h(PuzzleState(problem.initial_state().tiles, blank))
+    if int(h0) != h0:
+        raise ValueError("El A* con puntos de control requiere una heurística entera")
+    frontier = _Frontier(t)
+    frontier.push(h0, 0, start, blank)
+    expanded = 0
+    snap = _resume(ckpt, "A*", problem, h)
+    if snap is not None:
+        expanded, size = snap["counters"]
+        store = _restore_store(t, snap["sections"][:3], size)
+        frontier = _Frontier.from_arrays(t, *snap["sections"][3:])
+    current = None
+    def snapshot():
+        index, codes, blanks = frontier.arrays()
+        return dict(_header("A*", problem, h), counters=[expanded, store.size],
+                    sections=_store_sections(t, store) + [_section(index), _section(codes, _key_width(t)),
+                                                          _section(blanks)])
+    with _deferred_interrupt() as interrupted:
+        try:
+            while frontier:
+                if interrupted[0]: raise KeyboardInterrupt
+                if ckpt.due(expanded): ckpt.save(snapshot(), expanded)
+                if tick is not None: tick()
+                current = f, g, code, b = frontier.pop()
+                if store.g[store.find(code)] < g:
+                    current = None
+                    if stats is not None: stats.duplicates += 1
+                    continue
+                if code == goal:
+                    if stats is not None: stats.expanded += expanded
+                    ckpt.clear()
+                    return path_from_actions(problem, reconstruct_actions(store, t, code, b)), expanded
+                tiles = unpack(code, t); hv0 = f - g
+                for _, j in moves[b]:
+                    tile = (code >> shifts[j]) & mask
+                    child = code - (tile << shifts[j]) + (tile << shifts[b])
+                    i = store.find(child)
+                    if i >= 0:
+                        if store.g[i] <= g + 1:
+                            if stats is not None: stats.duplicates += 1
+                            continue
+                        if stats is not None: stats.reopened += 1
+                    # h antes de tocar el almacén: si lanza, el hijo queda sin generar
+                    if move_delta is not None:
+                        hv = hv0 + move_delta(tiles, b, j)
+                    else:
+                        ct = list(tiles); ct[b] = tile; ct[j] = 0
+                        hv = h(PuzzleState(ct, j))
+                    store.put(child, g + 1, b)
+                    if stats is not None: stats.generated += 1
+                    frontier.push(g + 1 + hv, g + 1, child, j)
+                current = None
+                expanded += 1
+                if stats is not None: stats.after_expand(len(frontier))
+        except BaseException:
+            if current is not None: frontier.push(*current)
+            _guard(ckpt, snapshot, expanded)
+            raise
+    if stats is not None: stats.expanded += expanded
+    ckpt.clear()
+    return None, expanded
+
+class _Split(Exception): pass
+
+def _task_sections(tasks, todo):
+    # Tareas de IDA* -> arrays: tableros, huecos, hueco anterior (255 = ninguno),
+    # g, h, número de acciones, acciones (índice en ACTIONS) y orden de `todo`
+    index = {task[5]: i for i, task in enumerate(tasks)}
+    boards, blanks, prevs, acts = bytearray(), bytearray(), bytearray(), bytearray()
+    gs, hs, lens = array("H"), array("H"), array("H")
+    for board, blank, prev, g, hv, a in tasks:
+        boards += bytes(board); blanks.append(blank); prevs.append(255 if prev < 0 else prev)
+        gs.append(g); hs.append(hv); lens.append(len(a))
+        acts += bytes(ACTIONS.index(x) for x in a)
+    order = array("Q", (index[task[5]] for task in todo or ()))
+    return [_section(x) for x in (boards, blanks, prevs, gs, hs, lens, acts, order)]
+
+def _restore_tasks(size, sections, has_todo):
+    boards, blanks, prevs, gs, hs, lens, acts, order = sections
+    tasks = []; k = 0
+    for i in range(len(blanks)):
+        a = tuple(ACTIONS[x] for x in acts[k:k + lens[i]]); k += lens[i]
+        tasks.append((tuple(boards[i * size:(i + 1) * size]), blanks[i], -1 if prevs[i] == 255 else prevs[i],
+                      gs[i], hs[i], a))
+    todo = [tasks[i] for i in order] if has_todo else None
+    return {task[5]: task for task in tasks}, todo
+
+def checkpointed_ida_star(problem, h, ckpt, split_nodes=200_000, tasks=64, stats=None):
+    # IDA* por subárboles (los de core.parallel_ida, en un solo proceso). La
+    # instantánea guarda la cota, las tareas que faltan en esta cota y el
+    # mínimo f excedido hasta ahora; un subárbol de más de split_nodes nodos
+    # se parte en sus hijos, así nunca se pierde más que eso al reanudar.
+    # Una tarea solo sale de la lista al terminarla
+    t = problem.tables
+    s = problem.initial_state()
+    h0 = h(PuzzleState(s.tiles, s.blank))
+    if s.tiles == t.goal: return path_from_actions(problem, []), 0
+    check = getattr(problem, "check", None)  # LimitedProblem
+    snap = _resume(ckpt, "IDA*", problem, h)
+    if snap is None:
+        level, found = initial_tasks(t, h, (tuple(s.tiles), s.blank, -1, 0, h0, ()), tasks, 12)
+        if found is not None:
+            ckpt.clear()
+            return path_from_actions(problem, found), 0
+        all_tasks = {task[5]: task for task in level}
+        bound, total, m, todo = h0, 0, inf, None
+    else:
+        bound, total, m, has_todo = snap["counters"]
+        m = inf if m < 0 else m
+        all_tasks, todo = _restore_tasks(t.size, snap["sections"], has_todo)
+    resumed = total  # los límites de LimitedProblem cuentan solo esta ejecución
+    def snapshot():
+        # copias de las listas (tuplas inmutables); los arrays se arman al escribir
+        tasks_now, todo_now = list(all_tasks.values()), None if todo is None else list(todo)
+        return dict(_header("IDA*", problem, h), counters=[bound, total, -1 if m == inf else m, todo is not None],
+                    sections=lambda: _task_sections(tasks_now, todo_now))
+    count = 0
+    with _deferred_interrupt() as interrupted:
+        def tick():
+            nonlocal count
+            count += 1
+            if not count & 1023 and interrupted[0]: raise KeyboardInterrupt
+            if count > split_nodes: raise _Split
+        try:
+            while True:
+                if todo is None:
+                    if stats is not None: stats.bounds.append(bound)
+                    todo = sorted(all_tasks.values(), key=lambda x: x[3] + x[4], reverse=True)
+                while todo:
+                    if interrupted[0]: raise KeyboardInterrupt
+                    if ckpt.due(total): ckpt.save(snapshot(), total)
+                    if check is not None: check(total - resumed)
+                    task = todo[-1]
+                    board, blank, prev, g, hv, acts = task
+                    if g + hv > bound:
+                        if g + hv < m: m = g + hv
+                        todo.pop(); continue
+                    count = 0
+                    try:
+                        found, mt, generated = ida_iteration(t, list(board), blank, hv, bound, h, g0=g,
+                                                             prev=prev, tick=tick)
+                    except _Split:
+                        # se sustituye por sus hijos (en esta cota y las siguientes); los
+                        # hijos entran antes de quitar la tarea, nunca se pierde ninguna
+                        total += count
+                        children = split_task(t, h, task)
+                        all_tasks.update((c[5], c) for c in children)
+                        todo[-1:] = children
+                        del all_tasks[acts]
+                        continue
+                    total += generated
+                    todo.pop()
+                    if found is not None:
+                        if stats is not None: stats.expanded += total; stats.generated += total
+                        ckpt.clear()
+                        return path_from_actions(problem, acts + tuple(found)), total
+                    if mt < m: m = mt
+                if m == inf:
+                    if stats is not None: stats.expanded += total; stats.generated += total
+                    ckpt.clear()
+                    return None, total
+                bound, m, todo = m, inf, None
+        except BaseException:
+            _guard(ckpt, snapshot, total)
+            raise
+
+def solve_checkpointed(problem, algorithm, heuristic, checkpoint, stats=None, **kwargs):
+    # checkpoint: Checkpointer o ruta (entonces cada 60 s)
+    ckpt = checkpoint if isinstance(checkpoint, Checkpointer) else Checkpointer(checkpoint, every_seconds=60)
+    if algorithm == "BFS": return checkpointed_bfs(problem, ckpt, stats=stats)
+    if algorithm == "A*": return checkpointed_a_star(problem, heuristic, ckpt, stats=stats)
+    if algorithm == "IDA*": return checkpointed_ida_star(problem, heuristic, ckpt, stats=stats, **kwargs)
+    raise ValueError(f"{algorithm} no admite puntos de control: {', '.join(CHECKPOINT_ALGORITHMS)}")
+
+def main(argv=None):
+    # Pensado para máquinas que pueden cortarse: relanzar el mismo comando continúa
+    from ui.dispatcher import HEURISTICS
+    parser = argparse.ArgumentParser(description="Búsqueda larga con puntos de control (se reanuda sola).")
+    parser.add_argument("file", help="archivo del punto de control")
+    parser.add_argument("board", help="tablero, números separados por comas")
+    parser.add_argument("-a", "--algorithm", default="A*", choices=CHECKPOINT_ALGORITHMS)
+    parser.add_argument("-H", "--heuristic", default="Linear Conflict", choices=list(HEURISTICS))
+    parser.add_argument("--every-nodes", type=int, default=None)
+    parser.add_argument("--every-seconds", type=float, default=60)
+    args = parser.parse_args(argv)
+    problem = Puzzle(tuple(int(x) for x in args.board.split(",")))
+    ckpt = Checkpointer(args.file, args.every_nodes, args.every_seconds)
+    if os.path.exists(args.file): print(f"Reanudando desde {args.file}")
+    path, expanded = solve_checkpointed(problem, args.algorithm, HEURISTICS[args.heuristic], ckpt)
+    print(f"{'sin solución' if path is None else f'{len(path) - 1} movimientos'}, {expanded} nodos, "
+          f"{ckpt.writes} instantáneas ({ckpt.skipped} saltadas)")
+
+if __name__ == "__main__":
+    main()
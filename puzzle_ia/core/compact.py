@@ -0,0 +1,179 @@
+from array import array
+from core.abstracts import path_from_actions
+from core.packed import pack
+
+# Almacén compacto de estados visitados para BFS/UCS grandes.
+# En vez de Node + PuzzleState + set (cientos de bytes por estado) se guarda,
+# por tablero empaquetado (core.packed), solo g y la celda donde estaba el
+# hueco en el padre, en una tabla hash de direccionamiento abierto sobre
+# array/bytearray: 11 bytes por ranura, carga máxima 0,8.
+# El camino se reconstruye deshaciendo movimientos desde la meta.
+
+ROOT = 255  # marca de "sin padre" en parent
+
+class CompactStore:
+    def __init__(self, key_bits=64, capacity=1024):
+        # Claves de más de 64 bits (5x5 en adelante) van en una lista de ints
+        self.wide = key_bits > 64
+        self.size = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self.keys = [0] * capacity if self.wide else array("Q", bytes(8 * capacity))
+        self.g = array("H", bytes(2 * capacity))
+        self.parent = bytearray(capacity)
+
+    def _slot(self, key):
+        # Hash multiplicativo (Fibonacci) + sondeo lineal; la clave 0 marca
+        # hueco libre (ningún tablero válido se empaqueta como 0)
+        h = key ^ (key >> 64) if self.wide else key
+        i = ((h * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self._shift
+        keys, mask = self.keys, self.capacity - 1
+        while True:
+            k = keys[i]
+            if k == key or k == 0: return i
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = (self.keys, self.g, self.parent)
+        self._alloc(self.capacity * 2)
+        for k, g, p in zip(*old):
+            if k:
+                i = self._slot(k)
+                self.keys[i] = k; self.g[i] = g; self.parent[i] = p
+
+    def find(self, key):
+        # Ranura de `key` o -1 si no está
+        i = self._slot(key)
+        return i if self.keys[i] else -1
+
+    def put(self, key, g, parent):
+        # Inserta o sobrescribe; devuelve la ranura
+        if 5 * (self.size + 1) > 4 * self.capacity: self._grow()
+        i = self._slot(key)
+        if not self.keys[i]:
+            self.keys[i] = key; self.size += 1
+        self.g[i] = g; self.parent[i] = parent
+        return i
+
+    def arrays(self):
+        # Copia plana de la tabla (memcpy); core.checkpoint la guarda tal cual
+        return self.keys[:], self.g[:], self.parent[:]
+
+    @classmethod
+    def from_arrays(cls, key_bits, keys, g, parent, size):
+        capacity = len(g)
+        if capacity & (capacity - 1) or not len(keys) == len(parent) == capacity:
+            raise ValueError("Tabla compacta inconsistente")
+        store = cls.__new__(cls)
+        store.wide = key_bits > 64
+        store.capacity = capacity; store._shift = 64 - (capacity.bit_length() - 1)
+        store.keys, store.g, store.parent, store.size = keys, g, parent, size
+        return store
+
+    def __contains__(self, key): return self.find(key) >= 0
+    def __len__(self): return self.size
+
+    def nbytes(self):
+        key_bytes = 8 if not self.wide else 8 + 36  # puntero de la lista + int grande
+        return self.capacity * (key_bytes + 2 + 1)
+
+def _new_codes(tables):
+    return [] if tables.bits * tables.size > 64 else array("Q")
+
+def reconstruct_actions(store, tables, code, blank):
+    # Sigue las celdas del hueco padre hasta la raíz deshaciendo cada movimiento
+    shifts, mask, moves = tables.shifts, tables.mask, tables.moves
+    acts = []
+    while True:
+        pb = store.parent[store.find(code)]
+        if pb == ROOT: break
+        # el hueco pasó de pb a blank: la ficha que ahora está en pb vuelve a blank
+        tile = (code >> shifts[pb]) & mask
+        code = code - (tile << shifts[pb]) + (tile << shifts[blank])
+        acts.append(next(a for a, j in moves[pb] if j == blank))
+        blank = pb
+    return acts[::-1]
+
+def _start(problem):
+    t = problem.tables
+    s = problem.initial_state()
+    store = CompactStore(t.bits * t.size)
+    start = pack(s.tiles, t.bits)
+    store.put(start, 0, ROOT)
+    return t, store, start, s.blank, pack(t.goal, t.bits)
+
+def compact_bfs(problem, stats=None):
+    # BFS por capas; los estados se marcan al generarse, así cada tablero entra
+    # una sola vez en la frontera (arrays de códigos + bytearray de huecos)
+    t, store, start, blank, goal = _start(problem)
+    if start == goal: return path_from_actions(problem, []), 0
+    moves, shifts, mask = t.moves, t.shifts, t.mask
+    tick = getattr(problem, "tick", None)
+    codes, blanks = _new_codes(t), bytearray([blank]); codes.append(start)
+    depth = expanded = 0
+    while codes:
+        depth += 1
+        ncodes, nblanks = _new_codes(t), bytearray()
+        for code, b in zip(codes, blanks):
+            if tick is not None: tick()
+            expanded += 1
+            for _, j in moves[b]:
+                tile = (code >> shifts[j]) & mask
+                child = code - (tile << shifts[j]) + (tile << shifts[b])
+                if store.find(child) >= 0:
+                    if stats is not None: stats.duplicates += 1
+                    continue
+                store.put(child, depth, b)
+                if stats is not None: stats.generated += 1
+                if child == goal:
+                    if stats is not None: stats.expanded += expanded
+                    return path_from_actions(problem, reconstruct_actions(store, t, child, j)), expanded
+                ncodes.append(child); nblanks.append(j)
+        if stats is not None: stats.after_expand(len(ncodes))
+        codes, blanks = ncodes, nblanks
+    if stats is not None: stats.expanded += expanded
+    return None, expanded
+
+def compact_ucs(problem, cost=None, stats=None):
+    # UCS con cubetas por g (costes enteros >= 1). cost(ficha) da el coste de
+    # mover esa ficha; por defecto 1. Entradas obsoletas se descartan al sacarlas.
+    t, store, start, blank, goal = _start(problem)
+    moves, shifts, mask = t.moves, t.shifts, t.mask
+    tick = getattr(problem, "tick", None)
+    buckets = [(_new_codes(t), bytearray())]
+    buckets[0][0].append(start); buckets[0][1].append(blank)
+    g = expanded = 0; pending = 1
+    while pending:
+        codes, blanks = buckets[g]
+        if not codes:
+            buckets[g] = None; g += 1
+            continue
+        code = codes.pop(); b = blanks.pop(); pending -= 1
+        if store.g[store.find(code)] != g:
+            if stats is not None: stats.duplicates += 1
+            continue
+        if code == goal:
+            if stats is not None: stats.expanded += expanded
+            return path_from_actions(problem, reconstruct_actions(store, t, code, b)), expanded
+        if tick is not None: tick()
+        expanded += 1
+        for _, j in moves[b]:
+            tile = (code >> shifts[j]) & mask
+            child = code - (tile << shifts[j]) + (tile << shifts[b])
+            gc = g + (1 if cost is None else cost(tile))
+            i = store.find(child)
+            if i >= 0:
+                if store.g[i] <= gc:
+                    if stats is not None: stats.duplicates += 1
+                    continue
+                if stats is not None: stats.reopened += 1
+            store.put(child, gc, b)
+            if stats is not None: stats.generated += 1
+            while len(buckets) <= gc: buckets.append((_new_codes(t), bytearray()))
+            buckets[gc][0].append(child); buckets[gc][1].append(j); pending += 1
+        if stats is not None: stats.after_expand(pending)
+    if stats is not None: stats.expanded += expanded
+    return None, expanded
@@ -1,20 +1,14 @@
-import random
+from math import isqrt
+from core.generator import parity, random_solvable
+from core.problem import default_goal
 
-# Verificar si el estado es resoluble
-def validate_state(puzzle):
-    inv_count = 0
-    tiles = [x for x in puzzle if x != 0]
-    for i in range(len(tiles)):
-        for j in range(i+1, len(tiles)):
-            if tiles[i] > tiles[j]:
-                inv_count += 1
-    return inv_count % 2 == 0
+# Verificar si el estado es resoluble (alcanzable desde/hasta la meta)
+def validate_state(puzzle, goal=None):
+    n = isqrt(len(puzzle))
+    goal = default_goal(n) if goal is None else goal
+    return parity(puzzle, n) == parity(goal, n)
 
-# Crear un estado aleatorio resoluble
-def create_state():
-    while True:
-        state = list(range(9))
-        random.shuffle(state)
-        state = tuple(state)
-        if validate_state(state):
-            return state
\ No newline at end of file
+# Crear un estado aleatorio resoluble (core.generator: sin rechazo; rng opcional
+# para reproducir la misma secuencia)
+def create_state(n=3, goal=None, rng=None):
+    return random_solvable(n, goal, rng)
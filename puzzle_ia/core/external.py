@@ -0,0 +1,203 @@
+import argparse
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from core.abstracts import Heuristic
+from core.packed import pack
+from core.problem import board_size, board_tables
+
+# BFS en memoria externa con detección de duplicados diferida.
+# Cada capa vive en disco como un archivo ordenado de tableros empaquetados
+# (uint64, orden de bytes de la máquina). Para generar la capa d+1:
+#   1) se lee la capa d por bloques y sus hijos se acumulan en un buffer de
+#      chunk_size códigos; lleno, se ordena, se deduplica y se vuelca a un
+#      archivo de tramo (run);
+#   2) los tramos se mezclan (heapq.merge) en un solo flujo ordenado, se
+#      quitan repetidos y los que ya están en las capas d y d-1 (también
+#      ordenadas, leídas en paralelo) y el resultado es la capa d+1.
+# Con movimientos reversibles un hijo solo puede estar en d-1, d o d+1, así
+# que basta con las dos capas anteriores. Memoria: el buffer más un bloque
+# de lectura por archivo abierto; E/S siempre secuencial.
+# Solo tableros que caben en 64 bits (hasta 4x4).
+
+BLOCK = 8192  # códigos por lectura/escritura
+MAGIC = b"EDT1"
+HEADER = struct.Struct("<4sBBxxQ")  # magia, n, profundidad máxima, número de estados
+
+def _read(path):
+    with open(path, "rb") as f:
+        while True:
+            buf = f.read(8 * BLOCK)
+            if not buf: return
+            a = array("Q"); a.frombytes(buf)
+            yield from a
+
+class _Writer:
+    def __init__(self, path):
+        self.f = open(path, "wb"); self.buf = array("Q"); self.count = 0
+    def write(self, code):
+        self.buf.append(code); self.count += 1
+        if len(self.buf) >= BLOCK:
+            self.buf.tofile(self.f); self.buf = array("Q")
+    def close(self):
+        self.buf.tofile(self.f); self.f.close()
+
+def _unique(stream):
+    last = None
+    for x in stream:
+        if x != last:
+            yield x; last = x
+
+def _subtract(stream, old):
+    # Elementos de `stream` (ordenado) que no están en `old` (ordenado)
+    old = iter(old)
+    o = next(old, None)
+    for x in stream:
+        while o is not None and o < x: o = next(old, None)
+        if o != x: yield x
+
+class _Expander:
+    def __init__(self, t):
+        self.moves, self.shifts, self.mask = t.moves, t.shifts, t.mask
+    def children(self, code):
+        shifts, mask = self.shifts, self.mask
+        b = next(i for i, k in enumerate(shifts) if not (code >> k) & mask)
+        for _, j in self.moves[b]:
+            tile = (code >> shifts[j]) & mask
+            yield code - (tile << shifts[j]) + (tile << shifts[b])
+
+def _spill(buf, path):
+    # Tramo ordenado y sin repetidos
+    a = array("Q", sorted(set(buf)))
+    with open(path, "wb") as f: a.tofile(f)
+
+def external_bfs(boards, workdir=None, chunk_size=1 << 20, max_depth=None, table_path=None, keep=False):
+    # Devuelve el número de estados de cada profundidad desde `boards`.
+    # table_path: además escribe una tabla de distancias en disco (DiskDistanceTable).
+    # keep: no borra el directorio de trabajo (capas layer_<d>.bin)
+    boards = [tuple(b) for b in boards]
+    n = board_size(boards[0])
+    t = board_tables(n)
+    if t.bits * t.size > 64:
+        raise ValueError("La BFS externa solo admite tableros que caben en 64 bits (hasta 4x4)")
+    if table_path is not None and max_depth is not None and max_depth > 255:
+        raise ValueError("La tabla de distancias guarda profundidades de un byte")
+    work = tempfile.mkdtemp(prefix="ext_bfs_", dir=workdir)
+    layer = lambda d: os.path.join(work, f"layer_{d}.bin")
+    exp = _Expander(t)
+    try:
+        _spill([pack(b, t.bits) for b in boards], layer(0))
+        counts = [os.path.getsize(layer(0)) // 8]
+        d = 0
+        while counts[-1] and (max_depth is None or d < max_depth):
+            runs = []; buf = []
+            for code in _read(layer(d)):
+                buf.extend(exp.children(code))
+                if len(buf) >= chunk_size:
+                    runs.append(os.path.join(work, f"run_{len(runs)}.bin")); _spill(buf, runs[-1]); buf = []
+            if buf:
+                runs.append(os.path.join(work, f"run_{len(runs)}.bin")); _spill(buf, runs[-1])
+            old = heapq.merge(_read(layer(d)), _read(layer(d - 1))) if d else _read(layer(d))
+            out = _Writer(layer(d + 1))
+            for code in _subtract(_unique(heapq.merge(*[_read(r) for r in runs])), old):
+                out.write(code)
+            out.close()
+            for r in runs: os.remove(r)
+            # la capa d-1 ya no hace falta (salvo para la tabla final)
+            if d and table_path is None and not keep: os.remove(layer(d - 1))
+            d += 1
+            counts.append(out.count)
+        if not counts[-1]: counts.pop()
+        if table_path is not None:
+            _write_table(table_path, n, [layer(k) for k in range(len(counts))], sum(counts))
+        return counts
+    finally:
+        if not keep: shutil.rmtree(work, ignore_errors=True)
+
+def _tagged(path, depth):
+    for c in _read(path): yield c, depth
+
+def _write_table(path, n, layers, total):
+    # Cabecera + códigos ordenados (uint64) + profundidad de cada uno (uint8).
+    # Dos pasadas de mezcla: primero los códigos, luego las profundidades
+    tagged = lambda: heapq.merge(*[_tagged(p, d) for d, p in enumerate(layers)])
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, n, len(layers) - 1, total))
+        buf = array("Q")
+        for c, _ in tagged():
+            buf.append(c)
+            if len(buf) >= BLOCK: buf.tofile(f); buf = array("Q")
+        buf.tofile(f)
+        dbuf = bytearray()
+        for _, d in tagged():
+            dbuf.append(d)
+            if len(dbuf) >= BLOCK: f.write(dbuf); dbuf = bytearray()
+        f.write(dbuf)
+    os.replace(tmp, path)
+
+class DiskDistanceTable(Heuristic):
+    # Tabla de distancias en disco (mmap + búsqueda binaria). Construida desde
+    # la meta es una heurística admisible: exacta hasta max_depth y
+    # max_depth+1 para los tableros que no aparecen (están más lejos).
+    # Misma interfaz que las tablas de core.pdb / core.solution_db: `goal` es
+    # la meta estándar si la tabla sale de ella (None si no) y cualquier otra
+    # meta se rechaza. No está en ui.dispatcher.HEURISTICS: necesita la ruta
+    # de una tabla construida antes (python -m core.external --table ...)
+    name = "Disk Distance Table"
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n, self.max_depth, self.count = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or len(self._mm) != HEADER.size + 9 * self.count:
+            self._mm.close()
+            raise ValueError(f"{path} no es una tabla de distancias válida")
+        self.tables = board_tables(self.n)
+        self.codes = memoryview(self._mm)[HEADER.size:HEADER.size + 8 * self.count].cast("Q")
+        self.depths = memoryview(self._mm)[HEADER.size + 8 * self.count:]
+        self.goal = self.tables.goal if self.distance(self.tables.goal) == 0 else None
+
+    def distance(self, tiles):
+        # Profundidad registrada o None si no está en la tabla
+        code = pack(tiles, self.tables.bits)
+        i = bisect_left(self.codes, code)
+        return self.depths[i] if i < self.count and self.codes[i] == code else None
+
+    def _h(self, tiles):
+        d = self.distance(tiles)
+        return self.max_depth + 1 if d is None else d
+
+    def __call__(self, s, goal=None):
+        if len(s.tiles) != self.n * self.n or (goal is not None and (self.goal is None or tuple(goal) != self.goal)):
+            raise ValueError("La tabla de distancias no corresponde a este tablero/meta")
+        return self._h(s.tiles)
+
+    def move_delta(self, tiles, blank, target):
+        child = list(tiles); child[blank] = child[target]; child[target] = 0
+        return self._h(child) - self._h(tiles)
+
+    def close(self):
+        self.codes.release(); self.depths.release(); self._mm.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BFS en disco desde la meta: estados por profundidad.")
+    parser.add_argument("-n", "--size", type=int, default=3)
+    parser.add_argument("-d", "--max-depth", type=int, default=None)
+    parser.add_argument("--workdir", default=None, help="directorio para las capas temporales")
+    parser.add_argument("--chunk", type=int, default=1 << 20, help="códigos en memoria antes de volcar un tramo")
+    parser.add_argument("--table", default=None, help="escribe la tabla de distancias en este archivo")
+    args = parser.parse_args(argv)
+    counts = external_bfs([board_tables(args.size).goal], args.workdir, args.chunk, args.max_depth, args.table)
+    for d, c in enumerate(counts):
+        print(f"{d:3d} {c}")
+    print(f"total {sum(counts)}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import argparse
+import random
+import sys
+from math import factorial, isqrt
+from core.compact import CompactStore, ROOT
+from core.packed import pack
+from core.problem import board_tables
+
+# Generación de tableros reproducible (cada función acepta un random.Random;
+# sin él se crea uno con `seed`):
+# - parity: paridad de inversiones por ciclos, O(n), sin contarlas
+# - random_solvable: permutación uniforme entre las resolubles, sin rechazo
+#   (si la paridad no coincide se intercambian dos fichas, lo que la invierte)
+# - random_walk: paseo desde la meta; exact=True garantiza que la distancia
+#   óptima sea exactamente `depth` (3x3, con la base de soluciones)
+# - unique_instances: flujo de tableros distintos; los vistos se guardan
+#   empaquetados en un CompactStore (11 bytes por ranura)
+
+def _rng(rng, seed):
+    return rng if rng is not None else random.Random(seed)
+
+def parity(tiles, n=None):
+    # Paridad de inversiones sin contarlas: la de la permutación completa
+    # (celdas - ciclos) más la posición del hueco (el 0 invierte con todo lo
+    # que tiene delante).
+    # Ancho impar: basta la paridad de inversiones.
+    # Ancho par: cada movimiento vertical cambia la paridad de inversiones
+    # y la fila del hueco a la vez, así que se suman ambas.
+    n = n or isqrt(len(tiles))
+    size = len(tiles)
+    seen = [False] * size
+    p = size
+    for i in range(size):
+        if not seen[i]:
+            p -= 1
+            while not seen[i]:
+                seen[i] = True; i = tiles[i]
+    blank = list(tiles).index(0)
+    p += blank
+    if n % 2 == 0:
+        p += blank // n
+    return p % 2
+
+def solvable(tiles, goal=None):
+    n = isqrt(len(tiles))
+    return parity(tiles, n) == parity(board_tables(n, goal).goal, n)
+
+def random_solvable(n=3, goal=None, rng=None, seed=None):
+    rng = _rng(rng, seed)
+    target = parity(board_tables(n, goal).goal, n)
+    tiles = list(range(n * n))
+    rng.shuffle(tiles)
+    if parity(tiles, n) != target:
+        # Intercambiar las dos primeras fichas (no el hueco) cambia la paridad:
+        # biyección entre ambas clases, la muestra sigue siendo uniforme
+        i, j = [k for k, v in enumerate(tiles) if v][:2]
+        tiles[i], tiles[j] = tiles[j], tiles[i]
+    return tuple(tiles)
+
+def _walk(t, depth, rng):
+    # Sin deshacer el movimiento anterior
+    tiles = list(t.goal); blank = t.goal_pos[0]; prev = None
+    for _ in range(depth):
+        opts = [j for _, j in t.moves[blank] if j != prev]
+        j = rng.choice(opts)
+        tiles[blank], tiles[j] = tiles[j], 0
+        prev, blank = blank, j
+    return tuple(tiles)
+
+def _exact_walk(t, depth, rng):
+    # Profundidad aleatoria que solo sube a vecinos con distancia óptima d+1.
+    # Un paseo voraz se atasca en máximos locales (a distancia 31 solo hay 2
+    # tableros); con vuelta atrás siempre llega si existe alguno
+    from core.solution_db import load_or_build
+    db = load_or_build()
+    stack = [(t.goal, t.goal_pos[0], 0)]; seen = {t.goal}
+    while stack:
+        tiles, blank, d = stack.pop()
+        if d == depth: return tiles
+        opts = []
+        for _, j in t.moves[blank]:
+            child = list(tiles); child[blank] = child[j]; child[j] = 0
+            child = tuple(child)
+            if child not in seen and db.distance(child, j) == d + 1:
+                seen.add(child); opts.append((child, j, d + 1))
+        rng.shuffle(opts)
+        stack.extend(opts)
+    raise ValueError(f"No hay tableros a distancia {depth}")
+
+def random_walk(depth, n=3, goal=None, rng=None, seed=None, exact=False):
+    # exact: distancia óptima == depth (solo 3x3 con la meta estándar, máximo 31)
+    rng = _rng(rng, seed)
+    t = board_tables(n, goal)
+    if not exact:
+        return _walk(t, depth, rng)
+    if n != 3 or t.goal != board_tables(3).goal:
+        raise ValueError("La profundidad exacta solo está disponible para el 3x3 con la meta estándar")
+    return _exact_walk(t, depth, rng)
+
+def unique_instances(count=None, n=3, goal=None, rng=None, seed=None, depth=None, exact=False,
+                     max_misses=10000):
+    # Generador de tableros resolubles distintos (count=None: sin fin, hasta
+    # agotar el espacio). depth: paseos desde la meta en vez de permutaciones
+    # uniformes; a poca profundidad se agotan, y el flujo termina tras
+    # max_misses repetidos seguidos
+    rng = _rng(rng, seed)
+    t = board_tables(n, goal)
+    total = factorial(n * n) // 2
+    if count is not None and count > total:
+        raise ValueError(f"Solo hay {total} tableros resolubles de {n}x{n}")
+    seen = CompactStore(t.bits * t.size)
+    produced = misses = 0
+    while count is None or produced < count:
+        # el muestreo uniforme siempre acaba encontrando tableros nuevos
+        if len(seen) >= total or (depth is not None and misses >= max_misses): return
+        if depth is None:
+            tiles = random_solvable(n, goal, rng)
+        else:
+            tiles = random_walk(depth, n, goal, rng, exact=exact)
+        code = pack(tiles, t.bits)
+        if code in seen:
+            misses += 1; continue
+        seen.put(code, 0, ROOT)
+        produced += 1; misses = 0
+        yield tiles
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera tableros resolubles distintos (uno por línea).")
+    parser.add_argument("-c", "--count", type=int, default=10)
+    parser.add_argument("-n", "--size", type=int, default=3)
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument("-d", "--depth", type=int, default=None, help="longitud del paseo desde la meta")
+    parser.add_argument("--exact", action="store_true", help="distancia óptima exacta = depth (3x3)")
+    args = parser.parse_args(argv)
+    out = sys.stdout
+    for tiles in unique_instances(args.count, args.size, seed=args.seed, depth=args.depth, exact=args.exact):
+        out.write(" ".join(map(str, tiles)) + "\n")
+
+if __name__ == "__main__":
+    main()
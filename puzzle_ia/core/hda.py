@@ -0,0 +1,190 @@
+import heapq
+import multiprocessing as mp
+import os
+import time
+from queue import Empty
+from core.abstracts import path_from_actions
+from core.compact import ROOT
+from core.packed import pack, unpack
+from core.problem import PuzzleState, board_tables
+
+# A* paralelo distribuido por hash (HDA*) para tableros.
+# - Cada proceso es dueño de los estados cuyo tablero empaquetado cae en su
+#   partición (hash multiplicativo del código) y guarda su lista abierta y
+#   sus g (best: código -> (g, celda del hueco en el padre)).
+# - Los hijos ajenos se envían en lotes por la cola de su dueño.
+# - Coste de la mejor solución encontrada (incumbente) compartido: se podan
+#   los nodos con f >= incumbente.
+# - Terminación: todos ociosos y ningún nodo en vuelo (enviados == recibidos),
+#   comprobado en dos lecturas seguidas idénticas (los contadores no se leen
+#   de forma atómica entre procesos).
+# - El camino se recorre hacia atrás preguntando a cada dueño por el padre.
+
+INF = 1 << 62
+EXPAND_BLOCK = 64  # expansiones entre lecturas de la cola
+
+def owner(code, workers):
+    h = code ^ (code >> 64)
+    return (((h * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % workers
+
+def _worker(w, workers, n, goal, h, inboxes, results, incumbent, sent, received, idle, expanded_arr,
+            batch_size):
+    t = board_tables(n, goal)
+    moves, shifts, mask = t.moves, t.shifts, t.mask
+    goal_code = pack(t.goal, t.bits)
+    move_delta = getattr(h, "move_delta", None)
+    inbox = inboxes[w]
+    out = [[] for _ in range(workers)]
+    best = {}
+    heap = []
+    st = {"expandidos": 0, "generados": 0, "duplicados": 0, "reabiertos": 0,
+          "enviados": 0, "recibidos": 0, "pico_frontera": 0}
+
+    def add(code, b, g, hv, pb):
+        old = best.get(code)
+        if old is not None:
+            if old[0] <= g:
+                st["duplicados"] += 1; return
+            st["reabiertos"] += 1
+        best[code] = (g, pb)
+        if code == goal_code:
+            with incumbent.get_lock():
+                if g < incumbent.value: incumbent.value = g
+        elif g + hv < incumbent.value:
+            heapq.heappush(heap, (g + hv, -g, code, b))
+
+    def flush(k):
+        batch = out[k]; out[k] = []
+        sent[w] += len(batch); st["enviados"] += len(batch)
+        inboxes[k].put(("nodes", batch))
+
+    while True:
+        # 1) cola de entrada: sin bloquear si hay trabajo, con espera si no
+        while True:
+            try:
+                msg = inbox.get_nowait() if heap else inbox.get(timeout=0.01)
+            except Empty:
+                break
+            idle[w] = 0
+            kind = msg[0]
+            if kind == "nodes":
+                for node in msg[1]: add(*node)
+                received[w] += len(msg[1]); st["recibidos"] += len(msg[1])
+            elif kind == "parent":
+                results.put(("parent", best[msg[1]][1]))
+            elif kind == "stop":
+                st["estados"] = len(best)
+                results.put(("stats", w, st))
+                # lotes aún sin entregar a otros procesos: no esperar a vaciarlos al salir
+                for q in inboxes: q.cancel_join_thread()
+                return
+            if not heap: break
+        # 2) un bloque de expansiones
+        k = 0
+        while heap and k < EXPAND_BLOCK:
+            f, ng, code, b = heapq.heappop(heap)
+            if f >= incumbent.value:
+                heap.clear(); break  # ningún nodo restante puede mejorar la solución
+            g, pb = best[code]
+            if g < -ng:
+                st["duplicados"] += 1; continue
+            k += 1
+            tiles = unpack(code, t)
+            hv0 = f - g
+            for _, j in moves[b]:
+                if j == pb: continue
+                tile = (code >> shifts[j]) & mask
+                child = code - (tile << shifts[j]) + (tile << shifts[b])
+                if move_delta is not None:
+                    hv = hv0 + move_delta(tiles, b, j)
+                else:
+                    ct = list(tiles); ct[b] = tile; ct[j] = 0
+                    hv = h(PuzzleState(ct, j))
+                st["generados"] += 1
+                dest = owner(child, workers)
+                if dest == w:
+                    add(child, j, g + 1, hv, b)
+                else:
+                    out[dest].append((child, j, g + 1, hv, b))
+                    if len(out[dest]) >= batch_size: flush(dest)
+        st["expandidos"] += k; expanded_arr[w] = st["expandidos"]
+        if len(heap) > st["pico_frontera"]: st["pico_frontera"] = len(heap)
+        # 3) lo pendiente sale antes de quedarse ocioso o al acabar el bloque
+        for d in range(workers):
+            if out[d]: flush(d)
+        if not heap: idle[w] = 1
+
+def _trace(t, inboxes, results, workers, goal_code):
+    # Acciones desde el inicio: cada dueño devuelve la celda del hueco en el padre
+    code, b = goal_code, t.goal_pos[0]
+    actions = []
+    while True:
+        inboxes[owner(code, workers)].put(("parent", code))
+        pb = results.get()[1]
+        if pb == ROOT: break
+        actions.append(next(a for a, j in t.moves[pb] if j == b))
+        tile = (code >> t.shifts[pb]) & t.mask
+        code = code - (tile << t.shifts[pb]) + (tile << t.shifts[b])
+        b = pb
+    actions.reverse()
+    return actions
+
+def hda_star(problem, h, workers=None, batch_size=256, stats=None, poll=0.005):
+    # Misma firma y resultado que A_star: (camino, expandidos). Con stats,
+    # stats.workers recibe los contadores de cada proceso.
+    workers = workers or os.cpu_count() or 1
+    t = problem.tables
+    s = problem.initial_state()
+    start = pack(s.tiles, t.bits)
+    goal_code = pack(t.goal, t.bits)
+    if start == goal_code: return path_from_actions(problem, []), 0
+    h0 = h(PuzzleState(s.tiles, s.blank))
+
+    inboxes = [mp.Queue() for _ in range(workers)]
+    results = mp.Queue()
+    incumbent = mp.Value("q", INF)
+    # la última posición de sent es el coordinador (nodo inicial)
+    sent = mp.Array("q", workers + 1, lock=False)
+    received = mp.Array("q", workers, lock=False)
+    idle = mp.Array("b", workers, lock=False)
+    expanded_arr = mp.Array("q", workers, lock=False)
+    procs = [mp.Process(target=_worker, daemon=True,
+                        args=(w, workers, t.n, t.goal, h, inboxes, results, incumbent, sent, received,
+                              idle, expanded_arr, batch_size))
+             for w in range(workers)]
+    for p in procs: p.start()
+    sent[workers] = 1
+    inboxes[owner(start, workers)].put(("nodes", [(start, s.blank, 0, h0, ROOT)]))
+
+    check = getattr(problem, "check", None)  # LimitedProblem
+    per_worker = [None] * workers
+    try:
+        last = None
+        while True:
+            time.sleep(poll)
+            if check is not None: check(sum(expanded_arr))
+            snap = (all(idle), tuple(sent), tuple(received))
+            if snap[0] and sum(snap[1]) == sum(snap[2]) and snap == last: break
+            last = snap
+        actions = _trace(t, inboxes, results, workers, goal_code) if incumbent.value < INF else None
+    finally:
+        for q in inboxes: q.put(("stop",))
+        for _ in range(workers):
+            try:
+                _, w, st = results.get(timeout=5)
+                per_worker[w] = st
+            except Empty:
+                break
+        for p in procs:
+            p.join(timeout=1)
+            if p.is_alive(): p.terminate()
+    expanded = sum(st["expandidos"] for st in per_worker if st)
+    if stats is not None:
+        stats.workers = per_worker
+        for st in per_worker:
+            if not st: continue
+            stats.expanded += st["expandidos"]; stats.generated += st["generados"]
+            stats.duplicates += st["duplicados"]; stats.reopened += st["reabiertos"]
+            stats.frontier_peak = max(stats.frontier_peak, st["pico_frontera"])
+    if actions is None: return None, expanded
+    return path_from_actions(problem, actions), expanded
@@ -1,49 +1,105 @@
-from core.problem import PuzzleState, GOAL, GOAL_POS
+from core.abstracts import Heuristic
+from core.problem import PuzzleState, board_size, board_tables
 
-def misplaced(s: PuzzleState) -> int:
-    return sum(1 for i,v in enumerate(s.tiles) if v != 0 and v != GOAL[i])
+# Todas aceptan tableros n x n; `goal` permite una meta distinta a la estándar.
+# Las instancias de abajo (manhattan, misplaced, linear_conflict) usan la meta
+# estándar; para otra meta: Manhattan(goal=...).
 
-def manhattan(s: PuzzleState) -> int:
-    dist = 0
-    for i,v in enumerate(s.tiles):
-        if v == 0: continue
-        gi = GOAL_POS[v]
-        x1,y1 = divmod(i,3); x2,y2 = divmod(gi,3)
-        dist += abs(x1-x2) + abs(y1-y2)
-    return dist
+class _BoardHeuristic(Heuristic):
+    def __init__(self, goal=None):
+        self.goal = None if goal is None else tuple(goal)
+        self._by_len = {}
 
-def linear_conflict(s: PuzzleState):
-    # Primero, calculamos la distancia Manhattan
-    dist = manhattan(s)
+    def _tables(self, tiles, goal=None):
+        if goal is not None:
+            return board_tables(board_size(tiles), goal)
+        t = self._by_len.get(len(tiles))
+        if t is None:
+            t = self._by_len[len(tiles)] = board_tables(board_size(tiles), self.goal)
+        return t
 
-    # Ahora sumamos conflictos lineales
+    def for_goal(self, goal):
+        # La misma heurística hacia otra meta (p. ej. la búsqueda hacia atrás)
+        return type(self)(goal)
+
+    def delta(self, parent_state, action, child_state, parent_h):
+        # La ficha que estaba en child.blank pasa a parent.blank
+        return parent_h + self.move_delta(parent_state.tiles, parent_state.blank, child_state.blank)
+
+class Misplaced(_BoardHeuristic):
+    name = "Misplaced Tiles"
+
+    def __call__(self, s: PuzzleState, goal=None) -> int:
+        goal = self._tables(s.tiles, goal).goal
+        return sum(1 for i,v in enumerate(s.tiles) if v != 0 and v != goal[i])
+
+    def move_delta(self, tiles, blank, target):
+        goal = self._tables(tiles).goal
+        v = tiles[target]
+        return (v != goal[blank]) - (v != goal[target])
+
+class Manhattan(_BoardHeuristic):
+    name = "Manhattan"
+
+    def __call__(self, s: PuzzleState, goal=None) -> int:
+        dist = self._tables(s.tiles, goal).dist
+        return sum(dist[v][i] for i,v in enumerate(s.tiles))
+
+    def move_delta(self, tiles, blank, target):
+        dist = self._tables(tiles).dist[tiles[target]]
+        return dist[blank] - dist[target]
+
+def _line_conflicts(line, goal_pos, n, axis, index):
+    # Pares en la misma línea que también van en esa línea en la meta, pero invertidos
     conflicts = 0
+    for i in range(n):
+        a = line[i]
+        if a == 0: continue
+        ga = goal_pos[a]
+        if (ga // n if axis == 0 else ga % n) != index: continue
+        for j in range(i + 1, n):
+            b = line[j]
+            if b == 0: continue
+            gb = goal_pos[b]
+            if (gb // n if axis == 0 else gb % n) == index and ga > gb:
+                conflicts += 1
+    return conflicts
+
+def _line(tiles, n, axis, k):
+    return tiles[k*n:(k+1)*n] if axis == 0 else tiles[k::n]
+
+class LinearConflict(_BoardHeuristic):
+    name = "Linear Conflict"
+
+    def __call__(self, s: PuzzleState, goal=None):
+        t = self._tables(s.tiles, goal)
+        n, tiles = t.n, s.tiles
+
+        # Primero, calculamos la distancia Manhattan
+        dist = sum(t.dist[v][i] for i,v in enumerate(tiles))
+
+        # Ahora sumamos conflictos lineales: filas (axis 0) y columnas (axis 1)
+        conflicts = 0
+        for k in range(n):
+            conflicts += _line_conflicts(_line(tiles, n, 0, k), t.goal_pos, n, 0, k)
+            conflicts += _line_conflicts(_line(tiles, n, 1, k), t.goal_pos, n, 1, k)
+
+        return dist + 2 * conflicts
 
-    # Revisa filas
-    for row in range(3):
-        row_tiles = [s.tiles[row * 3 + col] for col in range(3)]
-        for i in range(3):
-            for j in range(i + 1, 3):
-                a, b = row_tiles[i], row_tiles[j]
-                if a != 0 and b != 0:
-                    ga, gb = GOAL_POS[a], GOAL_POS[b]
-                    # Ambos deben estar en esta fila en el estado meta
-                    if ga // 3 == row and gb // 3 == row:
-                        # Conflicto si están en orden invertido
-                        if ga > gb:
-                            conflicts += 1
-
-    # Revisa columnas
-    for col in range(3):
-        col_tiles = [s.tiles[row * 3 + col] for row in range(3)]
-        for i in range(3):
-            for j in range(i + 1, 3):
-                a, b = col_tiles[i], col_tiles[j]
-                if a != 0 and b != 0:
-                    ga, gb = GOAL_POS[a], GOAL_POS[b]
-                    if ga % 3 == col and gb % 3 == col:
-                        if ga > gb:
-                            conflicts += 1
-
-    return dist + 2 * conflicts
+    def move_delta(self, tiles, blank, target):
+        t = self._tables(tiles)
+        n, v = t.n, tiles[target]
+        d = t.dist[v][blank] - t.dist[v][target]
+        # Un movimiento horizontal no altera el orden dentro de la fila, solo
+        # cambia las dos columnas implicadas (y al revés en vertical).
+        axis = 1 if blank // n == target // n else 0
+        after = list(tiles); after[blank], after[target] = v, 0
+        for p in (blank, target):
+            k = p % n if axis == 1 else p // n
+            d += 2 * (_line_conflicts(_line(after, n, axis, k), t.goal_pos, n, axis, k)
+                      - _line_conflicts(_line(tiles, n, axis, k), t.goal_pos, n, axis, k))
+        return d
 
+misplaced = Misplaced()
+manhattan = Manhattan()
+linear_conflict = LinearConflict()
@@ -0,0 +1,129 @@
+from math import inf
+from core.abstracts import path_from_actions
+from core.problem import PuzzleState
+
+# Motor IDA* iterativo para tableros (Puzzle / PackedPuzzle).
+# - Pila explícita: sin recursión, sin límite de profundidad de Python.
+# - El tablero es una sola lista que se modifica en el sitio y se deshace al volver.
+# - Nunca deshace el movimiento anterior (poda del movimiento inverso).
+# - h se actualiza con h.move_delta(tiles, blank, target) si existe.
+# - Tabla de transposición opcional y acotada: guarda, por (tablero, hueco
+#   anterior), la cota inferior aprendida (mínimo f excedido - g) y la
+#   reutiliza en las siguientes iteraciones. El hueco anterior forma parte de
+#   la clave porque el subárbol explorado excluye volver por ese movimiento.
+#   Llena, reemplaza (TranspositionTable): no deja de aprender a mitad de búsqueda.
+
+class TranspositionTable:
+    # Tamaño fijo, cubetas de dos entradas: la "profunda" se queda con la
+    # cota mayor (el subárbol más caro de recalcular) y la otra se reemplaza
+    # siempre, así las posiciones recientes también entran con la tabla llena
+    def __init__(self, size):
+        self.buckets = max(1, size // 2)
+        self.deep = [None] * self.buckets
+        self.recent = [None] * self.buckets
+
+    def get(self, key, default=0):
+        i = hash(key) % self.buckets
+        e = self.deep[i]
+        if e is not None and e[0] == key: return e[1]
+        e = self.recent[i]
+        if e is not None and e[0] == key: return e[1]
+        return default
+
+    def store(self, key, value):
+        i = hash(key) % self.buckets
+        e = self.deep[i]
+        if e is None or e[0] == key or value >= e[1]:
+            # la entrada profunda desplazada pasa a la de reemplazo
+            if e is not None and e[0] != key: self.recent[i] = e
+            self.deep[i] = (key, value)
+        else:
+            self.recent[i] = (key, value)
+
+    def __len__(self):
+        return sum(e is not None for e in self.deep) + sum(e is not None for e in self.recent)
+
+def _full_h(h):
+    return lambda board, blank: h(PuzzleState(board, blank))
+
+def ida_iteration(tables, board, blank, h0, bound, h, g0=0, prev=-1, tt=None,
+                  tick=None, stats=None, stop=None):
+    # Recorre en profundidad desde `board` (g = g0) sin pasar de `bound`.
+    # Devuelve (acciones hasta la meta o None, mínimo f que excedió la cota, generados).
+    # `board` vuelve intacto salvo si se encuentra la meta.
+    moves, goal = tables.moves, list(tables.goal)
+    move_delta = getattr(h, "move_delta", None)
+    full_h = None if move_delta is not None else _full_h(h)
+
+    blanks = [blank]; hs = [h0]; idx = [0]; ms = [inf]; acts = []
+    generated = 0
+    # meta por comparación directa: con una heurística de otra meta h no es 0 en ella
+    if board == goal: return acts, g0, generated
+    if tick is not None: tick()
+    if stats is not None: stats.expanded += 1
+    d = 0
+    while True:
+        b = blanks[d]; opts = moves[b]; g = g0 + d + 1
+        pushed = False
+        while idx[d] < len(opts):
+            a, j = opts[idx[d]]; idx[d] += 1
+            if j == (blanks[d-1] if d else prev): continue
+            generated += 1
+            if move_delta is not None:
+                hv = hs[d] + move_delta(board, b, j)
+                board[b] = board[j]; board[j] = 0
+            else:
+                board[b] = board[j]; board[j] = 0
+                hv = full_h(board, j)
+            he = hv
+            if tt is not None:
+                he = max(hv, tt.get((tuple(board), b), 0))
+            f = g + he
+            if f > bound:
+                if f < ms[d]: ms[d] = f
+                board[j] = board[b]; board[b] = 0
+                continue
+            acts.append(a)
+            if board == goal: return acts, f, generated
+            if stop is not None and stop():
+                board[j] = board[b]; board[b] = 0
+                return None, inf, generated
+            if tick is not None: tick()
+            if stats is not None:
+                stats.expanded += 1
+                if d + 2 > stats.frontier_peak: stats.frontier_peak = d + 2
+            blanks.append(j); hs.append(hv); idx.append(0); ms.append(inf)
+            d += 1; pushed = True
+            break
+        if pushed: continue
+        # subárbol agotado: se aprende su cota y se deshace el movimiento
+        m = ms.pop()
+        if tt is not None and m < inf:
+            key = (tuple(board), blanks[d-1] if d else prev)
+            if m - (g - 1) > tt.get(key, 0):
+                tt.store(key, m - (g - 1))
+        if d == 0:
+            return None, m, generated
+        blanks.pop(); hs.pop(); idx.pop(); acts.pop()
+        pb = blanks[d-1]
+        board[b] = board[pb]; board[pb] = 0
+        d -= 1
+        if m < ms[d]: ms[d] = m
+
+def ida_star_board(problem, h, tt_size=None, stats=None):
+    tables = problem.tables
+    s = problem.initial_state()
+    board = list(s.tiles); blank = s.blank
+    h0 = bound = h(PuzzleState(board, blank))
+    tt = TranspositionTable(tt_size) if tt_size else None
+    tick = getattr(problem, "tick", None)
+    total = 0
+    while True:
+        if stats is not None: stats.bounds.append(bound)
+        acts, t, generated = ida_iteration(tables, board, blank, h0, bound, h,
+                                           tt=tt, tick=tick, stats=stats)
+        total += generated
+        if stats is not None: stats.generated += generated
+        if acts is not None: return path_from_actions(problem, acts), total
+        if t == inf: return None, total
+        bound = t
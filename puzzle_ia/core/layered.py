@@ -0,0 +1,165 @@
+import sys
+from math import factorial
+import numpy as np
+from core.problem import board_size, board_tables
+from core.vectorized import boards_array
+
+# BFS por capas con NumPy: en vez de sacar un Node cada vez, se genera de una
+# vez toda la capa siguiente como array (m, n*n) de uint8, se calcula el rango
+# de cada permutación y se descartan los ya vistos con un mapa de visitados
+# indexado por rango (un byte por permutación, mientras quepa: 3x3 = 362.880).
+# Si el espacio no cabe (4x4 en adelante) se usa que el grafo es bipartito
+# (cada movimiento cambia la paridad del hueco): los hijos de la capa k solo
+# pueden estar en k-1 o k+1, así que basta restar la capa anterior.
+# Usos: histograma de profundidades, tablas de distancias y resolver muchos
+# tableros con una sola búsqueda compartida.
+
+BITMAP_LIMIT = factorial(10)
+RANK_LIMIT = 2 ** 63  # los rangos van en int64: hasta 20 celdas (4x4)
+ACTIONS = ("DOWN", "UP", "RIGHT", "LEFT")
+UNSEEN = 255
+
+class _LayerTables:
+    def __init__(self, t):
+        size = t.size
+        self.size = size
+        self.space = factorial(size)
+        # target[acción, hueco] -> celda destino; el propio hueco si no se puede mover
+        self.target = np.tile(np.arange(size, dtype=np.intp), (len(ACTIONS), 1))
+        for b, opts in enumerate(t.moves):
+            for a, j in opts:
+                self.target[ACTIONS.index(a), b] = j
+
+_LAYER = {}
+
+def _layer_tables(n, goal=None):
+    t = board_tables(n, goal)
+    lt = _LAYER.get(id(t))
+    if lt is None:
+        lt = _LAYER[id(t)] = _LayerTables(t)
+    return lt
+
+def rank_boards(boards):
+    # Rango de Lehmer de cada fila (int64; vale hasta 20 celdas)
+    boards = np.asarray(boards, dtype=np.uint8)
+    m, size = boards.shape
+    if factorial(size) > RANK_LIMIT:
+        raise ValueError(f"Los rangos de tableros de {size} celdas no caben en int64")
+    r = np.zeros(m, dtype=np.int64)
+    for i in range(size - 1):
+        r += (boards[:, i+1:] < boards[:, i:i+1]).sum(axis=1) * factorial(size - 1 - i)
+    return r
+
+def _blanks(boards):
+    return (boards == 0).argmax(axis=1)
+
+def _move(boards, blanks, targets):
+    # Copia de los tableros con el hueco movido a `targets`
+    rows = np.arange(len(boards))
+    out = boards.copy()
+    out[rows, blanks] = out[rows, targets]
+    out[rows, targets] = 0
+    return out
+
+def expand_layer(boards, lt):
+    # Todos los sucesores de una capa, concatenados
+    blanks = _blanks(boards)
+    children = []
+    for a in range(len(ACTIONS)):
+        j = lt.target[a][blanks]
+        ok = j != blanks
+        children.append(_move(boards[ok], blanks[ok], j[ok]))
+    return np.concatenate(children)
+
+def bfs_layers(boards, max_depth=None):
+    # Generador de (profundidad, array de tableros) desde uno o varios orígenes
+    boards = boards_array(boards)
+    n = board_size(boards[0])
+    lt = _layer_tables(n)
+    if lt.space > RANK_LIMIT:
+        raise ValueError(f"La BFS por capas solo admite tableros de hasta 20 celdas, no {n}x{n}")
+    ranks, first = np.unique(rank_boards(boards), return_index=True)
+    layer = boards[first]
+    bitmap = lt.space <= BITMAP_LIMIT
+    if bitmap:
+        seen = np.zeros(lt.space, dtype=np.bool_)
+        seen[ranks] = True
+    prev = np.empty(0, dtype=np.int64)
+    depth = 0
+    while len(layer):
+        yield depth, layer
+        if max_depth is not None and depth >= max_depth: return
+        children = expand_layer(layer, lt)
+        r, first = np.unique(rank_boards(children), return_index=True)
+        if bitmap:
+            new = ~seen[r]
+            seen[r[new]] = True
+        else:
+            new = ~np.isin(r, prev, assume_unique=True)
+            prev = ranks
+        ranks = r[new]
+        layer = children[first[new]]
+        depth += 1
+
+def depth_histogram(n=3, goal=None, max_depth=None):
+    # Número de estados a cada distancia de la meta
+    start = board_tables(n, goal).goal
+    return [len(layer) for _, layer in bfs_layers([start], max_depth)]
+
+_DIST = {}
+
+def distance_table(n=3, goal=None, stats=None):
+    # Distancia a la meta de cada permutación (por rango); UNSEEN si no es alcanzable.
+    # Se calcula una vez por (n, meta); stats: cuenta los estados de la BFS
+    # solo cuando la tabla se construye (en caché no se expande nada)
+    t = board_tables(n, goal)
+    table = _DIST.get(id(t))
+    if table is None:
+        lt = _layer_tables(n, goal)
+        if lt.space > BITMAP_LIMIT:
+            raise ValueError(f"El espacio de un {n}x{n} no cabe en una tabla de distancias")
+        table = np.full(lt.space, UNSEEN, dtype=np.uint8)
+        for d, layer in bfs_layers([t.goal]):
+            table[rank_boards(layer)] = d
+            if stats is not None:
+                stats.expanded += len(layer); stats.generated += len(layer)
+        table = _DIST[id(t)] = table
+    return table
+
+def solve_boards(boards, goal=None, stats=None):
+    # Acciones óptimas de cada tablero (None si no tiene solución) con una sola
+    # búsqueda compartida: todos bajan a la vez por la tabla de distancias
+    boards = boards_array(boards)
+    if not len(boards): return []
+    n = board_size(boards[0])
+    lt = _layer_tables(n, goal)
+    table = distance_table(n, goal, stats)
+    d = table[rank_boards(boards)].astype(np.int16)
+    start = d.copy()
+    acts = np.zeros((len(boards), max(int(d[d != UNSEEN].max(initial=0)), 1)), dtype=np.uint8)
+    active = np.flatnonzero((d > 0) & (d != UNSEEN))
+    step = 0
+    while len(active):
+        cur = boards[active]; blanks = _blanks(cur)
+        chosen = np.full(len(active), -1, dtype=np.int8)
+        nxt = cur
+        for a in range(len(ACTIONS)):
+            j = lt.target[a][blanks]
+            child = _move(cur, blanks, j)
+            hit = (chosen < 0) & (j != blanks) & (table[rank_boards(child)] == d[active] - 1)
+            chosen[hit] = a
+            nxt = np.where(hit[:, None], child, nxt)
+        boards[active] = nxt
+        acts[active, step] = chosen
+        d[active] -= 1
+        active = active[d[active] > 0]
+        step += 1
+    return [None if s == UNSEEN else [ACTIONS[x] for x in acts[i, :s]] for i, s in enumerate(start.tolist())]
+
+if __name__ == "__main__":
+    # python -m core.layered [n]: histograma de profundidades del espacio completo
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    hist = depth_histogram(n)
+    for d, c in enumerate(hist):
+        print(f"{d:3d} {c}")
+    print(f"total {sum(hist)}")
@@ -0,0 +1,74 @@
+from core.abstracts import State, Problem
+from core.problem import board_size, board_tables
+
+# Representación compacta: el tablero cabe en un int (4 bits por ficha hasta
+# 4x4, 5 bits para 5x5; la celda i ocupa los bits desde bits*i) y se guarda
+# la posición del hueco. El ancho sale de BoardTables.
+def pack(tiles, bits=4):
+    code = 0
+    for i, v in enumerate(tiles):
+        code |= v << (bits * i)
+    return code
+
+def unpack(code, tables):
+    mask = tables.mask
+    return tuple([(code >> k) & mask for k in tables.shifts])
+
+class PackedState(State):
+    __slots__ = ("code", "blank", "layout")
+    def __init__(self, code, blank, layout):
+        self.code = code; self.blank = blank; self.layout = layout
+
+    @classmethod
+    def from_tiles(cls, tiles, layout=None):
+        layout = layout or board_tables(board_size(tiles))
+        return cls(pack(tiles, layout.bits), list(tiles).index(0), layout)
+
+    @property
+    def tiles(self):
+        return unpack(self.code, self.layout)
+
+    def key(self): return self.code
+    def __hash__(self): return hash(self.code)
+    def __eq__(self, o): return isinstance(o, PackedState) and self.code == o.code
+
+    def __repr__(self):
+        return f"PackedState{self.tiles}"
+
+class PackedPuzzle(Problem):
+    # Misma interfaz que Puzzle: BFS, A_star, etc. funcionan sin cambios
+    def __init__(self, start, goal=None):
+        self.n = board_size(start)
+        self.tables = board_tables(self.n, goal)
+        self.goal = self.tables.goal
+        self.start = PackedState.from_tiles(start, self.tables)
+        self.goal_code = pack(self.goal, self.tables.bits)
+
+    def initial_state(self) -> State:
+        return self.start
+
+    def is_goal(self, s: PackedState) -> bool:
+        return s.code == self.goal_code
+
+    def goal_state(self) -> PackedState:
+        return PackedState.from_tiles(self.goal, self.tables)
+
+    def actions(self, s: PackedState):
+        for a, _ in self.tables.moves[s.blank]:
+            yield a
+
+    def result(self, s: PackedState, a):
+        t = self.tables
+        i = s.blank; j = t.move_to[i][a]
+        # la ficha en j pasa a la celda i (que valía 0)
+        tile = (s.code >> t.shifts[j]) & t.mask
+        return PackedState(s.code - (tile << t.shifts[j]) + (tile << t.shifts[i]), j, t)
+
+    def step_cost(self, s, a, sp):
+        return 1
+
+    def print_state(self, s: PackedState):
+        n = self.n; tiles = s.tiles
+        for i in range(0, n*n, n):
+            print(tiles[i:i+n])
+        print()
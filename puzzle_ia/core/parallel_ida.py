@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from math import inf
+import multiprocessing as mp
+from core.abstracts import path_from_actions
+from core.ida import ida_iteration
+from core.problem import PuzzleState, board_tables
+
+# IDA* en paralelo para tableros.
+# - Se expande el inicio por niveles hasta tener unas cuantas tareas por
+#   proceso; cada tarea es un subárbol (tablero, hueco, hueco anterior, g, h,
+#   acciones desde el inicio).
+# - En cada cota, las tareas con f <= cota van a un pool de procesos que
+#   ejecutan ida_iteration desde ese nodo; la siguiente cota es el mínimo f
+#   excedido que devuelven.
+# - Un subárbol que pasa de split_nodes nodos se corta y se sustituye por sus
+#   hijos (para esta cota y las siguientes): reparto de carga dinámico.
+# - La primera meta encontrada activa un Event compartido y el resto de
+#   tareas abandona. Cualquier meta dentro de la cota es óptima: las cotas
+#   anteriores ya descartaron todo camino más corto.
+
+class _Split(Exception): pass
+class _Stopped(Exception): pass
+
+_W = {}  # estado de cada proceso del pool
+
+def _init(n, goal, h, stop):
+    _W.update(tables=board_tables(n, goal), h=h, stop=stop)
+
+def _search(task, bound, split_nodes):
+    board, blank, prev, g, hv, _ = task
+    stop = _W["stop"]
+    count = 0
+    def tick():
+        nonlocal count
+        count += 1
+        if not count & 1023 and stop.is_set(): raise _Stopped
+        if count > split_nodes: raise _Split
+    try:
+        acts, m, generated = ida_iteration(_W["tables"], list(board), blank, hv, bound, _W["h"],
+                                           g0=g, prev=prev, tick=tick)
+    except _Split:
+        return "split", None, count
+    except _Stopped:
+        return "stopped", None, count
+    if acts is not None:
+        stop.set()
+        return "goal", acts, generated
+    return "bound", m, generated
+
+def split_task(tables, h, task):
+    board, blank, prev, g, hv, acts = task
+    move_delta = getattr(h, "move_delta", None)
+    out = []
+    for a, j in tables.moves[blank]:
+        if j == prev: continue
+        child = list(board)
+        if move_delta is not None: ch = hv + move_delta(child, blank, j)
+        child[blank] = child[j]; child[j] = 0
+        if move_delta is None: ch = h(PuzzleState(child, j))
+        out.append((tuple(child), j, blank, g + 1, ch, acts + (a,)))
+    return out
+
+def initial_tasks(tables, h, root, target, max_depth):
+    # Por niveles hasta `target` tareas; devuelve (tareas, acciones si la meta apareció antes)
+    level = [root]
+    for _ in range(max_depth):
+        if len(level) >= target: break
+        nxt = []
+        for task in level:
+            for c in split_task(tables, h, task):
+                if c[0] == tables.goal: return [], c[5]
+                nxt.append(c)
+        level = nxt
+    return level, None
+
+def parallel_ida_star(problem, h, workers=None, split_nodes=200_000, tasks_per_worker=8, max_depth=12,
+                      stats=None, poll=0.05):
+    # Mismo resultado que IDA_star: (camino, generados)
+    workers = workers or os.cpu_count() or 1
+    t = problem.tables
+    s = problem.initial_state()
+    h0 = h(PuzzleState(s.tiles, s.blank))
+    if s.tiles == t.goal: return path_from_actions(problem, []), 0
+    root = (tuple(s.tiles), s.blank, -1, 0, h0, ())
+    level, found = initial_tasks(t, h, root, workers * tasks_per_worker, max_depth)
+    if found is not None: return path_from_actions(problem, found), 0
+    tasks = {task[5]: task for task in level}
+    check = getattr(problem, "check", None)  # LimitedProblem
+    stop = mp.Event()
+    total = 0
+    bound = h0
+    pool = ProcessPoolExecutor(workers, initializer=_init, initargs=(t.n, t.goal, h, stop))
+    try:
+        while True:
+            if stats is not None: stats.bounds.append(bound)
+            stop.clear()
+            m = inf; found = None; pending = {}
+
+            def submit(task):
+                nonlocal m
+                f = task[3] + task[4]
+                if f > bound:
+                    if f < m: m = f
+                else:
+                    pending[pool.submit(_search, task, bound, split_nodes)] = task
+
+            for task in sorted(tasks.values(), key=lambda x: x[3] + x[4]): submit(task)
+            while pending:
+                done, _ = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    task = pending.pop(fut)
+                    kind, value, generated = fut.result()
+                    total += generated
+                    if kind == "goal":
+                        if found is None: found = task[5] + tuple(value)
+                    elif kind == "bound":
+                        if value < m: m = value
+                    elif kind == "split":
+                        del tasks[task[5]]
+                        for c in split_task(t, h, task):
+                            tasks[c[5]] = c
+                            if found is None: submit(c)
+                if check is not None: check(total)
+            if found is not None or m == inf: break
+            bound = m
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+    if stats is not None:
+        stats.expanded += total; stats.generated += total
+    if found is None: return None, total
+    return path_from_actions(problem, found), total
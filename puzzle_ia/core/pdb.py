@@ -0,0 +1,171 @@
+import mmap
+import os
+import struct
+import sys
+from collections import deque
+from core.abstracts import Heuristic
+from core.problem import board_size, board_tables
+
+# Bases de datos de patrones aditivas y disjuntas.
+# Cada grupo de fichas guarda, para cada colocación posible de sus fichas,
+# el mínimo de movimientos *de esas fichas* necesario para llevarlas a la meta.
+# Como los grupos no comparten fichas, la suma de los grupos es admisible.
+
+MAGIC = b"PDB1"
+UNSEEN = 255
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+DEFAULT_GROUPS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)),
+}
+
+def table_size(cells, k):
+    # Número de colocaciones de k fichas distinguibles en `cells` celdas
+    size = 1
+    for i in range(k):
+        size *= cells - i
+    return size
+
+def rank_positions(positions, cells):
+    # Rango de una k-permutación de celdas (base mixta cells, cells-1, ...)
+    r = 0
+    for i, p in enumerate(positions):
+        smaller = 0
+        for q in positions[:i]:
+            if q < p: smaller += 1
+        r = r * (cells - i) + (p - smaller)
+    return r
+
+def _build_group(t, group):
+    cells, k, moves = t.size, len(group), t.moves
+    table = bytearray([UNSEEN]) * table_size(cells, k)
+    seen = bytearray(table_size(cells, k) * cells)
+    start = tuple(t.goal_pos[v] for v in group)
+    # BFS 0-1 retrógrada desde la meta: mover el hueco sobre una celda libre
+    # cuesta 0, desplazar una ficha del grupo cuesta 1.
+    dq = deque([(0, start, t.goal_pos[0])])
+    while dq:
+        d, pos, blank = dq.popleft()
+        r = rank_positions(pos, cells)
+        key = r * cells + blank
+        if seen[key]: continue
+        seen[key] = 1
+        if d < table[r]: table[r] = d
+        for _, j in moves[blank]:
+            if j in pos:
+                moved = tuple(blank if p == j else p for p in pos)
+                if not seen[rank_positions(moved, cells) * cells + j]:
+                    dq.append((d + 1, moved, j))
+            elif not seen[r * cells + j]:
+                dq.appendleft((d, pos, j))
+    return table
+
+class PatternDatabase(Heuristic):
+    name = "Pattern Database"
+
+    def __init__(self, n, goal, groups, tables, source=None):
+        self.n = n; self.goal = tuple(goal)
+        self.groups = tuple(tuple(g) for g in groups)
+        self.tables = tables
+        self._group_of = {v: k for k, g in enumerate(self.groups) for v in g}
+        self._source = source  # mmap abierto (si viene de disco)
+
+    def __call__(self, s, goal=None):
+        tiles = s.tiles
+        if len(tiles) != self.n * self.n or (goal is not None and tuple(goal) != self.goal):
+            raise ValueError("La base de patrones no corresponde a este tablero/meta")
+        cells = len(tiles)
+        where = [0] * cells
+        for i, v in enumerate(tiles):
+            where[v] = i
+        h = 0
+        for group, table in zip(self.groups, self.tables):
+            h += table[rank_positions([where[v] for v in group], cells)]
+        return h
+
+    def move_delta(self, tiles, blank, target):
+        # Solo cambia la entrada del grupo al que pertenece la ficha movida
+        k = self._group_of.get(tiles[target])
+        if k is None: return 0
+        group, table, cells = self.groups[k], self.tables[k], len(tiles)
+        before = [tiles.index(v) for v in group]
+        after = [blank if p == target else p for p in before]
+        return table[rank_positions(after, cells)] - table[rank_positions(before, cells)]
+
+    def delta(self, parent_state, action, child_state, parent_h):
+        return parent_h + self.move_delta(parent_state.tiles, parent_state.blank, child_state.blank)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<BB", self.n, len(self.groups)))
+            f.write(bytes(self.goal))
+            for g in self.groups:
+                f.write(struct.pack("<B", len(g)) + bytes(g))
+            for table in self.tables:
+                f.write(table)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        # Se mapea el archivo en memoria: varios procesos comparten la misma
+        # copia en la caché de páginas del sistema operativo.
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:4] != MAGIC:
+            mm.close()
+            raise ValueError(f"{path} no es una base de patrones válida")
+        n, count = struct.unpack_from("<BB", mm, 4)
+        off = 6
+        goal = tuple(mm[off:off + n*n]); off += n*n
+        groups = []
+        for _ in range(count):
+            k = mm[off]; groups.append(tuple(mm[off+1:off+1+k])); off += 1 + k
+        view = memoryview(mm)
+        tables = []
+        for g in groups:
+            size = table_size(n*n, len(g))
+            tables.append(view[off:off + size]); off += size
+        return cls(n, goal, groups, tables, mm)
+
+    def close(self):
+        if self._source is not None:
+            self.tables = []
+            self._source.close(); self._source = None
+
+def build_pdb(n=3, groups=None, goal=None):
+    t = board_tables(n, goal)
+    groups = groups or DEFAULT_GROUPS[n]
+    tiles = [v for g in groups for v in g]
+    if 0 in tiles or len(tiles) != len(set(tiles)):
+        raise ValueError("Los grupos deben ser disjuntos y no incluir el hueco")
+    return PatternDatabase(n, t.goal, groups, [_build_group(t, g) for g in groups])
+
+def default_path(n=3):
+    return os.path.join(DATA_DIR, f"pdb_{n}x{n}.bin")
+
+_LOADED = {}
+
+def load_or_build(n=3, path=None):
+    # Carga perezosa con caché por proceso; construye y guarda si no existe
+    path = path or default_path(n)
+    pdb = _LOADED.get(path)
+    if pdb is None:
+        if not os.path.exists(path):
+            build_pdb(n).save(path)
+        pdb = _LOADED[path] = PatternDatabase.load(path)
+    return pdb
+
+def pattern_database(s, goal=None):
+    # Heurística h(state) lista para A*, IDA*, Greedy y Weighted A*
+    return load_or_build(board_size(s.tiles))(s, goal)
+
+if __name__ == "__main__":
+    # python -m core.pdb [n] [archivo]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    path = sys.argv[2] if len(sys.argv) > 2 else default_path(n)
+    build_pdb(n).save(path)
+    print(f"Base de patrones {n}x{n} guardada en {path}")
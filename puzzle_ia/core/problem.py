@@ -1,48 +1,107 @@
+from math import isqrt
 from core.structures import MinHeap, Queue, Stack
 from core.abstracts import State, Problem
 
-# Representación: tupla de 9 ints; 0 = hueco
-GOAL = (1,2,3,4,5,6,7,8,0)
+# Representación: tupla de n*n ints; 0 = hueco
+def default_goal(n=3):
+    return tuple(range(1, n*n)) + (0,)
+
+GOAL = default_goal(3)
 GOAL_POS = {v:i for i,v in enumerate(GOAL)}
 
+def board_size(tiles):
+    n = isqrt(len(tiles))
+    if n < 2 or n * n != len(tiles):
+        raise ValueError(f"El tablero debe ser cuadrado (n*n celdas), recibido {len(tiles)}")
+    return n
+
+class BoardTables:
+    # Tablas precalculadas para un tamaño y una meta concretos
+    __slots__ = ("n","size","goal","goal_pos","moves","move_to","dist","bits","mask","shifts")
+    def __init__(self, n, goal):
+        self.n = n; self.size = n*n; self.goal = goal
+        if sorted(goal) != list(range(self.size)):
+            raise ValueError(f"Meta inválida para un tablero {n}x{n}: {goal}")
+        self.goal_pos = tuple(goal.index(v) for v in range(self.size))
+        moves = []
+        for i in range(self.size):
+            x, y = divmod(i, n)
+            opts = []
+            for dx,dy,a in ((1,0,"DOWN"),(-1,0,"UP"),(0,1,"RIGHT"),(0,-1,"LEFT")):
+                nx,ny = x+dx,y+dy
+                if 0 <= nx < n and 0 <= ny < n:
+                    opts.append((a, nx*n + ny))
+            moves.append(tuple(opts))
+        # moves[hueco] -> ((acción, celda destino), ...)
+        self.moves = tuple(moves)
+        self.move_to = tuple({a: j for a, j in opts} for opts in moves)
+        # dist[ficha][celda] -> distancia Manhattan a su celda meta
+        self.dist = tuple(
+            tuple(0 if v == 0 else abs(i//n - self.goal_pos[v]//n) + abs(i%n - self.goal_pos[v]%n)
+                  for i in range(self.size))
+            for v in range(self.size))
+        # parámetros del empaquetado en un int (ver core.packed)
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.shifts = tuple(self.bits * i for i in range(self.size))
+
+_TABLES = {}
+
+def board_tables(n=3, goal=None):
+    # Compartidas entre instancias: se construyen una vez por (n, meta)
+    key = (n, None if goal is None else tuple(goal))
+    t = _TABLES.get(key)
+    if t is None:
+        goal = default_goal(n) if goal is None else tuple(goal)
+        t = _TABLES.get((n, goal)) or BoardTables(n, goal)
+        _TABLES[key] = _TABLES[(n, goal)] = t
+    return t
+
 class PuzzleState(State):
-    __slots__ = ("tiles",)
-    def __init__(self, tiles): 
+    __slots__ = ("tiles","blank")
+    def __init__(self, tiles, blank=None):
         self.tiles = tuple(tiles)
+        self.blank = self.tiles.index(0) if blank is None else blank
 
-    def key(self): 
+    def key(self):
         return self.tiles
 
-    def __repr__(self): 
+    def __repr__(self):
         return f"PuzzleState{self.tiles}"
 
 class Puzzle(Problem):
-    def __init__(self, start):
+    def __init__(self, start, goal=None):
+        self.n = board_size(start)
+        self.tables = board_tables(self.n, goal)
+        self.goal = self.tables.goal
         self.start = PuzzleState(start)
 
-    def initial_state(self) -> State: 
+    def initial_state(self) -> State:
         return self.start
 
-    def is_goal(self, s: PuzzleState) -> bool: 
-        return s.tiles == GOAL
+    def is_goal(self, s: PuzzleState) -> bool:
+        return s.tiles == self.goal
+
+    def goal_state(self) -> PuzzleState:
+        return PuzzleState(self.goal)
 
     def actions(self, s: PuzzleState):
-        i = s.tiles.index(0); x,y = divmod(i,3)
-        for dx,dy,a in ((1,0,"DOWN"),(-1,0,"UP"),(0,1,"RIGHT"),(0,-1,"LEFT")):
-            nx,ny = x+dx,y+dy
-            if 0 <= nx < 3 and 0 <= ny < 3: 
-                yield a
+        for a, _ in self.tables.moves[s.blank]:
+            yield a
 
     def result(self, s: PuzzleState, a):
-        delta = {"DOWN":(1,0),"UP":(-1,0),"RIGHT":(0,1),"LEFT":(0,-1)}[a]
-        i = s.tiles.index(0); x,y = divmod(i,3)
-        nx,ny = x+delta[0], y+delta[1]; j = nx*3+ny
+        i = s.blank; j = self.tables.move_to[i][a]
         tiles = list(s.tiles); tiles[i], tiles[j] = tiles[j], tiles[i]
-        
-        new_state = PuzzleState(tiles)
+
+        new_state = PuzzleState(tiles, j)
         return new_state
 
+    def step_cost(self, s, a, sp):
+        # Coste entero: g se queda en ints pequeños (cacheados por Python)
+        return 1
+
     def print_state(self, s: PuzzleState):
-        for i in range(0, 9, 3):
-            print(s.tiles[i:i+3])
+        n = self.n
+        for i in range(0, n*n, n):
+            print(s.tiles[i:i+n])
         print()
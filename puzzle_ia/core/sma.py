@@ -0,0 +1,151 @@
+import heapq
+import sys
+from math import inf
+from core.abstracts import SearchLimitExceeded, path_from_actions
+
+# SMA* (Simplified Memory-bounded A*): como A*, pero con un máximo de nodos
+# en memoria. Cuando no caben los hijos se olvida la hoja peor (mayor f, la
+# menos profunda) y su f se sube al padre, que vuelve a la frontera para
+# regenerarla si algún día es la mejor opción.
+# - f de un hijo = max(g + h, f del padre) (pathmax), así f nunca baja.
+# - f de un nodo expandido = mínimo f de sus hijos vivos y olvidados.
+# - Un estado ya en memoria con g <= la nueva g no se duplica.
+# - El padre recuerda el f de cada hijo olvidado: al regenerarlo parte de ese
+#   f (no de g + h) y los que quedaron en inf no se regeneran. Sin esto, con
+#   poca memoria, la misma rama sin salida se reexploraba en bucle.
+# Si el presupuesto no alcanza para ninguna solución (mejor f = inf, o no
+# queda hoja que olvidar) se lanza SearchLimitExceeded("memoria", expandidos).
+# Sin solución y con poca memoria puede tardar muchísimo en demostrarlo:
+# conviene combinarlo con LimitedProblem (límite de nodos o de tiempo).
+
+DEFAULT_MAX_NODES = 100_000
+
+class _SMANode:
+    __slots__ = ("state", "parent", "action", "g", "f", "depth", "children",
+                 "forgotten", "alive", "in_open")
+    def __init__(self, state, parent, action, g, f):
+        self.state = state; self.parent = parent; self.action = action
+        self.g = g; self.f = f
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.children = {}      # acción -> hijo en memoria
+        self.forgotten = {}     # acción -> f del hijo olvidado
+        self.alive = True
+        self.in_open = False
+
+def node_bytes(state):
+    # Estimación de lo que ocupa un nodo en memoria: el propio nodo, el estado,
+    # su dict de hijos y las entradas en el mapa de estados y en los montículos
+    size = sys.getsizeof(_SMANode(state, None, None, 0, 0)) + sys.getsizeof({})
+    size += sys.getsizeof(state) + sys.getsizeof(getattr(state, "tiles", ()))
+    return size + 3 * 100
+
+def sma_star(problem, h, max_nodes=None, max_bytes=None, stats=None):
+    # max_nodes o max_bytes (convertido a nodos con node_bytes); por defecto DEFAULT_MAX_NODES
+    s0 = problem.initial_state()
+    if max_nodes is None:
+        max_nodes = max_bytes // node_bytes(s0) if max_bytes is not None else DEFAULT_MAX_NODES
+    if max_nodes < 2:
+        raise ValueError("SMA* necesita memoria para al menos dos nodos")
+    root = _SMANode(s0, None, None, 0, h(s0))
+    where = {s0: root}
+    openh = []   # (f, -profundidad, t, nodo): mejor primero, más profundo en empates
+    leaves = []  # (-f, profundidad, t, nodo): peor hoja primero, menos profunda en empates
+    t = 0; used = 1; expanded = 0
+    cut = False  # se olvidó algo o se cortó por profundidad: agotar no prueba que no haya solución
+
+    def push_open(n):
+        nonlocal t
+        n.in_open = True; t += 1
+        heapq.heappush(openh, (n.f, -n.depth, t, n))
+
+    def push_leaf(n):
+        nonlocal t
+        t += 1
+        heapq.heappush(leaves, (-n.f, n.depth, t, n))
+
+    def backup(n):
+        # Sube el f mínimo de los hijos (vivos y olvidados) hacia la raíz
+        while n is not None:
+            f = min([c.f for c in n.children.values()] + list(n.forgotten.values()), default=inf)
+            if f <= n.f: return
+            n.f = f
+            if n.in_open: push_open(n)
+            if not n.children: push_leaf(n)
+            n = n.parent
+
+    def forget(keep):
+        # Olvida la peor hoja (nunca `keep` ni la raíz); False si no hay ninguna
+        nonlocal used, cut
+        skipped = []
+        try:
+            while leaves:
+                entry = heapq.heappop(leaves)
+                m = entry[3]
+                if not m.alive or m.children or m.parent is None or -entry[0] != m.f: continue
+                if m is keep:
+                    skipped.append(entry); continue
+                m.alive = False; m.in_open = False; used -= 1; cut = True
+                if where.get(m.state) is m: del where[m.state]
+                p = m.parent
+                del p.children[m.action]
+                p.forgotten[m.action] = m.f
+                if m.f < inf and not p.in_open: push_open(p)
+                if not p.children: push_leaf(p)
+                return True
+            return False
+        finally:
+            for entry in skipped: heapq.heappush(leaves, entry)
+
+    push_open(root); push_leaf(root)
+    while openh:
+        f, _, _, n = heapq.heappop(openh)
+        if not n.alive or not n.in_open or f != n.f: continue
+        if n.f == inf: break
+        if problem.is_goal(n.state):
+            acts = []
+            while n.parent is not None:
+                acts.append(n.action); n = n.parent
+            return path_from_actions(problem, acts[::-1]), expanded
+        n.in_open = False
+        expanded += 1
+        # hijos que faltan en memoria (todos la primera vez, los olvidados después)
+        new = []
+        for a in problem.actions(n.state):
+            if a in n.children: continue
+            lost = n.forgotten.get(a, 0)
+            if lost == inf: continue
+            n.forgotten.pop(a, None)
+            sp = problem.result(n.state, a)
+            if n.parent is not None and sp == n.parent.state: continue
+            g = n.g + problem.step_cost(n.state, a, sp)
+            old = where.get(sp)
+            if old is not None and old.g <= g:
+                if stats is not None: stats.duplicates += 1
+                continue
+            c = _SMANode(sp, n, a, g, 0)
+            # un camino que no cabe en memoria no puede terminar: f = inf
+            if c.depth < max_nodes - 1 or problem.is_goal(sp):
+                c.f = max(g + h(sp), n.f, lost)
+            else:
+                c.f = inf; cut = True
+            new.append(c)
+        if stats is not None:
+            stats.expanded += 1; stats.generated += len(new)
+        while used + len(new) > max_nodes:
+            if not forget(n):
+                raise SearchLimitExceeded("memoria", expanded)
+        for c in new:
+            n.children[c.action] = c; where[c.state] = c
+            push_open(c); push_leaf(c)
+        used += len(new)
+        # f del nodo = mínimo de sus hijos (y de los olvidados en inf); sin
+        # hijos queda como hoja muerta (inf)
+        f = min([c.f for c in n.children.values()] + list(n.forgotten.values()), default=inf)
+        if f != n.f:
+            n.f = f
+            if not n.children: push_leaf(n)
+            if n.parent is not None: backup(n.parent)
+        if stats is not None: stats.after_expand(len(openh))
+    if cut:
+        raise SearchLimitExceeded("memoria", expanded)
+    return None, expanded
@@ -0,0 +1,174 @@
+import mmap
+import os
+import sys
+from collections import deque
+from core.abstracts import Heuristic
+from core.pdb import DATA_DIR
+from core.problem import board_tables
+
+# Base de soluciones completa del 8-puzzle: distancia exacta a la meta de los
+# 181.440 estados resolubles, un byte por estado.
+# Índice: hueco * 8!/2 + rango(orden de las fichas sin el hueco) // 2.
+# Intercambiar las dos últimas fichas cambia la paridad y mueve el rango en 1,
+# así que de cada par (2k, 2k+1) solo uno es resoluble y basta con k.
+
+MAGIC = b"SDB1"
+UNSEEN = 255
+N = 3
+HALF = 20160  # 8! / 2
+
+def rank_tiles(tiles):
+    # Rango de Lehmer de las fichas 1..8 en el orden en que aparecen
+    r = 0; k = 8
+    seq = [v for v in tiles if v]
+    for i, v in enumerate(seq):
+        smaller = 0
+        for w in seq[i+1:]:
+            if w < v: smaller += 1
+        k -= 1
+        r = r * (k + 1) + smaller
+    return r
+
+def index(tiles, blank):
+    return blank * HALF + (rank_tiles(tiles) >> 1)
+
+def solvable(tiles):
+    # Con ancho impar basta la paridad de inversiones (la meta tiene 0)
+    seq = [v for v in tiles if v]
+    inv = 0
+    for i, v in enumerate(seq):
+        for w in seq[i+1:]:
+            if w < v: inv += 1
+    return inv % 2 == 0
+
+def _build_table_layered():
+    # Con NumPy: la BFS por capas (core.layered) recorre el espacio en
+    # bloque y cada capa se escribe en la tabla con un solo acceso indexado
+    import numpy as np
+    from core.layered import bfs_layers, rank_boards
+    table = bytearray([UNSEEN]) * (N * N * HALF)
+    view = np.frombuffer(table, dtype=np.uint8)
+    for d, layer in bfs_layers([board_tables(N).goal]):
+        blanks = (layer == 0).argmax(axis=1)
+        tiles = layer[layer != 0].reshape(len(layer), N * N - 1)
+        view[blanks * HALF + (rank_boards(tiles) >> 1)] = d
+    return table
+
+def build_table():
+    # BFS retrógrada desde la meta por todo el espacio de estados
+    try:
+        return _build_table_layered()
+    except ImportError:
+        pass
+    t = board_tables(N)
+    moves = t.moves
+    table = bytearray([UNSEEN]) * (N * N * HALF)
+    goal = list(t.goal); blank = t.goal_pos[0]
+    table[index(goal, blank)] = 0
+    frontier = deque([(tuple(goal), blank)])
+    while frontier:
+        tiles, b = frontier.popleft()
+        d = table[index(tiles, b)] + 1
+        for _, j in moves[b]:
+            child = list(tiles); child[b] = child[j]; child[j] = 0
+            k = index(child, j)
+            if table[k] == UNSEEN:
+                table[k] = d
+                frontier.append((tuple(child), j))
+    return table
+
+class SolutionDatabase(Heuristic):
+    name = "Solution DB"
+
+    def __init__(self, table, source=None):
+        self.table = table
+        self.tables = board_tables(N)
+        self._source = source  # mmap abierto (si viene de disco)
+
+    def _check(self, tiles, goal=None):
+        if len(tiles) != N * N or (goal is not None and tuple(goal) != self.tables.goal):
+            raise ValueError("La base de soluciones solo cubre el 3x3 con la meta estándar")
+
+    def distance(self, tiles, blank=None):
+        # Movimientos óptimos hasta la meta, o None si el tablero no es resoluble
+        self._check(tiles)
+        if not solvable(tiles): return None
+        if blank is None: blank = list(tiles).index(0)
+        d = self.table[index(tiles, blank)]
+        return None if d == UNSEEN else d
+
+    def solve(self, tiles):
+        # Acciones óptimas: en cada paso se baja a un vecino con distancia d-1
+        d = self.distance(tiles)
+        if d is None: return None
+        tiles = list(tiles); b = tiles.index(0)
+        actions = []
+        while d:
+            for a, j in self.tables.moves[b]:
+                tiles[b] = tiles[j]; tiles[j] = 0
+                if self.table[index(tiles, j)] == d - 1: break
+                tiles[j] = tiles[b]; tiles[b] = 0
+            actions.append(a); b = j; d -= 1
+        return actions
+
+    # Heurística exacta (h = h*): A*/IDA* van directos a la meta.
+    # Un tablero no resoluble comparte índice con su pareja resoluble: se
+    # devuelve 0 para que la búsqueda agote el espacio y termine sin solución.
+    def __call__(self, s, goal=None):
+        self._check(s.tiles, goal)
+        if not solvable(s.tiles): return 0
+        return self.table[index(s.tiles, s.blank)]
+
+    def move_delta(self, tiles, blank, target):
+        child = list(tiles); child[blank] = child[target]; child[target] = 0
+        return self.table[index(child, target)] - self.table[index(tiles, blank)]
+
+    def delta(self, parent_state, action, child_state, parent_h):
+        return self.table[index(child_state.tiles, child_state.blank)]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(self.table)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:4] != MAGIC or len(mm) != 4 + N * N * HALF:
+            mm.close()
+            raise ValueError(f"{path} no es una base de soluciones válida")
+        return cls(memoryview(mm)[4:], mm)
+
+    def close(self):
+        if self._source is not None:
+            self.table = b""
+            self._source.close(); self._source = None
+
+def default_path():
+    return os.path.join(DATA_DIR, "solutions_3x3.bin")
+
+_LOADED = {}
+
+def load_or_build(path=None):
+    # Carga perezosa con caché por proceso; construye y guarda si no existe
+    path = path or default_path()
+    db = _LOADED.get(path)
+    if db is None:
+        if not os.path.exists(path):
+            SolutionDatabase(build_table()).save(path)
+        db = _LOADED[path] = SolutionDatabase.load(path)
+    return db
+
+def solution_db(s, goal=None):
+    # Heurística exacta h(state) para el 3x3
+    return load_or_build()(s, goal)
+
+if __name__ == "__main__":
+    # python -m core.solution_db [archivo]
+    path = sys.argv[1] if len(sys.argv) > 1 else default_path()
+    SolutionDatabase(build_table()).save(path)
+    print(f"Base de soluciones 3x3 guardada en {path}")
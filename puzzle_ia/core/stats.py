@@ -0,0 +1,75 @@
+import time
+
+# Instrumentación opcional de las búsquedas. Los algoritmos reciben stats=None
+# por defecto y en ese caso no hacen nada extra; con un SearchStats cuentan
+# nodos y, cada `sample_every` expansiones, cronometran expandir/heurística/frontera.
+
+class _TimedHeuristic:
+    # Envuelve h para sumar su tiempo en stats.timers["heuristic"]
+    def __init__(self, h, timers):
+        self._h = h; self._timers = timers
+        if getattr(h, "delta", None) is not None:
+            self.delta = self._delta
+    def __call__(self, s):
+        t0 = time.perf_counter()
+        v = self._h(s)
+        self._timers["heuristic"] += time.perf_counter() - t0
+        return v
+    def _delta(self, parent_state, action, child_state, parent_h):
+        t0 = time.perf_counter()
+        v = self._h.delta(parent_state, action, child_state, parent_h)
+        self._timers["heuristic"] += time.perf_counter() - t0
+        return v
+
+class SearchStats:
+    def __init__(self, sample_every=64):
+        self.expanded = 0        # nodos expandidos
+        self.generated = 0       # hijos generados
+        self.duplicates = 0      # hijos/nodos descartados por repetidos o peores
+        self.reopened = 0        # estados ya vistos que vuelven a la frontera con menor g
+        self.frontier_peak = 0   # tamaño máximo de la frontera (o de la pila en IDA*)
+        self.bounds = []         # cotas f de cada iteración de IDA*
+        self.workers = []        # contadores por proceso (HDA*)
+        self.sample_every = sample_every
+        self.samples = 0
+        # "expand" incluye el tiempo de "heuristic"
+        self.timers = {"expand": 0.0, "heuristic": 0.0, "frontier": 0.0}
+        self._mark = None
+
+    def expand(self, node, problem, h=None):
+        # Sustituye a node.expand(problem, h) contando y, si toca, cronometrando
+        self.expanded += 1
+        if self.expanded % self.sample_every:
+            children = list(node.expand(problem, h))
+        else:
+            self.samples += 1
+            t0 = time.perf_counter()
+            children = list(node.expand(problem, None if h is None else _TimedHeuristic(h, self.timers)))
+            self._mark = time.perf_counter()
+            self.timers["expand"] += self._mark - t0
+        self.generated += len(children)
+        return children
+
+    def after_expand(self, frontier_size):
+        # Llamar tras encolar los hijos: cierra la muestra de frontera
+        if frontier_size > self.frontier_peak: self.frontier_peak = frontier_size
+        if self._mark is not None:
+            self.timers["frontier"] += time.perf_counter() - self._mark
+            self._mark = None
+
+    def to_dict(self):
+        scale = self.expanded / self.samples if self.samples else 0.0
+        d = {
+            "expandidos": self.expanded,
+            "generados": self.generated,
+            "duplicados": self.duplicates,
+            "reabiertos": self.reopened,
+            "pico_frontera": self.frontier_peak,
+            "muestras": self.samples,
+        }
+        if self.bounds: d["cotas_ida"] = list(self.bounds)
+        if self.workers: d["trabajadores"] = list(self.workers)
+        # tiempos muestreados extrapolados al total de expansiones
+        for k, v in self.timers.items():
+            d[f"tiempo_{k}_estimado"] = round(v * scale, 4)
+        return d
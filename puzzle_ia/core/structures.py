@@ -1,3 +1,4 @@
+import heapq
 
 class Stack:
     def __init__(self): self._a = []
@@ -68,4 +69,90 @@ class PriorityQueue:
     def is_empty(self): return self._h.is_empty()
     def __len__(self): return len(self._h)
 
+# Todas las fronteras con prioridad comparten la interfaz de PriorityQueue:
+# push(priority, item), pop(), is_empty(), __len__()
 
+class HeapQueue:
+    # Igual que PriorityQueue pero sobre heapq (implementado en C)
+    def __init__(self): self._h = []; self._t = 0
+    def push(self, priority, item):
+        self._t += 1
+        heapq.heappush(self._h, (priority, self._t, item))
+    def pop(self):
+        if not self._h: raise IndexError("pop from empty heap")
+        return heapq.heappop(self._h)[2]
+    def is_empty(self): return not self._h
+    def __len__(self): return len(self._h)
+
+class BucketQueue:
+    # Una cubeta por prioridad entera: push/pop O(1) amortizado.
+    # Dentro de una cubeta se saca el último en entrar (LIFO), que en A*
+    # suele ser el nodo más profundo, así los empates se resuelven antes.
+    def __init__(self): self._b = []; self._min = 0; self._n = 0
+    def push(self, priority, item):
+        p = int(priority)
+        if p != priority or p < 0:
+            raise ValueError(f"BucketQueue requiere prioridades enteras >= 0, recibido {priority}")
+        while len(self._b) <= p: self._b.append([])
+        self._b[p].append(item)
+        if p < self._min: self._min = p
+        self._n += 1
+    def pop(self):
+        if self._n == 0: raise IndexError("pop from empty BucketQueue")
+        b = self._b
+        while not b[self._min]: self._min += 1
+        self._n -= 1
+        return b[self._min].pop()
+    def is_empty(self): return self._n == 0
+    def __len__(self): return self._n
+
+class IndexedHeap:
+    # Montículo binario con índice clave -> posición para decrease-key.
+    # Cada clave está como mucho una vez en el montículo.
+    def __init__(self): self._a = []; self._pos = {}; self._t = 0
+    def __len__(self): return len(self._a)
+    def is_empty(self): return not self._a
+    def __contains__(self, key): return key in self._pos
+    def push(self, priority, item, key):
+        # Inserta o, si la clave ya está y mejora la prioridad, la actualiza
+        self._t += 1
+        i = self._pos.get(key)
+        if i is None:
+            self._a.append([priority, self._t, key, item])
+            self._pos[key] = len(self._a) - 1
+            self._sift_up(len(self._a) - 1)
+        elif priority < self._a[i][0]:
+            self._a[i] = [priority, self._t, key, item]
+            self._sift_up(i)
+    def pop(self):
+        if not self._a: raise IndexError("pop from empty heap")
+        a = self._a; root = a[0]; last = a.pop()
+        del self._pos[root[2]]
+        if a:
+            a[0] = last; self._pos[last[2]] = 0; self._sift_down(0)
+        return root[3]
+    def _swap(self, i, j):
+        a = self._a
+        a[i], a[j] = a[j], a[i]
+        self._pos[a[i][2]] = i; self._pos[a[j][2]] = j
+    def _less(self, i, j):
+        a, b = self._a[i], self._a[j]
+        return (a[0], a[1]) < (b[0], b[1])
+    def _sift_up(self, i):
+        while i > 0:
+            p = (i - 1) // 2
+            if not self._less(i, p): break
+            self._swap(i, p); i = p
+    def _sift_down(self, i):
+        n = len(self._a)
+        while 2*i + 1 < n:
+            l, r = 2*i + 1, 2*i + 2
+            m = l if r >= n or self._less(l, r) else r
+            if not self._less(m, i): break
+            self._swap(i, m); i = m
+
+FRONTIERS = {
+    "bucket": BucketQueue,
+    "heapq": HeapQueue,
+    "minheap": PriorityQueue,
+}
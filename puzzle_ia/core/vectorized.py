@@ -0,0 +1,133 @@
+import heapq
+import numpy as np
+from core.abstracts import Node, reconstruct_path
+from core.problem import board_size, board_tables
+
+# Heurísticas en lote con NumPy: reciben un array (m, n*n) de uint8 (un
+# tablero por fila) y devuelven las m heurísticas de una vez (int32).
+# Mismos valores que core.heuristics, con tablas de consulta precalculadas
+# por (n, meta). NumPy es opcional: solo se importa este módulo cuando se usa.
+
+class _VecTables:
+    def __init__(self, t):
+        n, size = t.n, t.size
+        self.n = n
+        self.goal = np.array(t.goal, dtype=np.uint8)
+        goal_pos = np.array(t.goal_pos, dtype=np.int16)
+        self.goal_pos = goal_pos
+        # dist[ficha, celda] (Manhattan, 0 para el hueco)
+        self.dist = np.array(t.dist, dtype=np.int16)
+        # fila / columna meta de cada ficha; -1 para el hueco (nunca entra en conflicto)
+        self.line_of = (np.where(np.arange(size) == 0, -1, goal_pos // n).astype(np.int16),
+                        np.where(np.arange(size) == 0, -1, goal_pos % n).astype(np.int16))
+        # celdas de cada fila (axis 0) y de cada columna (axis 1)
+        self.lines = (tuple(tuple(range(k*n, (k+1)*n)) for k in range(n)),
+                      tuple(tuple(range(k, size, n)) for k in range(n)))
+        self.cells = np.arange(size)
+
+_VEC = {}
+
+def _vec_tables(n, goal=None):
+    t = board_tables(n, goal)
+    vt = _VEC.get(id(t))
+    if vt is None:
+        vt = _VEC[id(t)] = _VecTables(t)
+    return vt
+
+def boards_array(boards):
+    # Lista de tuplas (o de estados con .tiles) -> array (m, n*n) uint8
+    boards = [getattr(b, "tiles", b) for b in boards]
+    return np.array(boards, dtype=np.uint8).reshape(len(boards), -1)
+
+def _prepare(boards, goal):
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim == 1: boards = boards[None, :]
+    return boards, _vec_tables(board_size(boards[0]) if len(boards) else 3, goal)
+
+def manhattan_batch(boards, goal=None):
+    boards, vt = _prepare(boards, goal)
+    return vt.dist[boards, vt.cells].sum(axis=1, dtype=np.int32)
+
+def misplaced_batch(boards, goal=None):
+    boards, vt = _prepare(boards, goal)
+    return ((boards != vt.goal) & (boards != 0)).sum(axis=1, dtype=np.int32)
+
+def linear_conflict_batch(boards, goal=None):
+    # Manhattan + 2 por cada par invertido de fichas que comparten fila
+    # (o columna) con su fila (o columna) meta, igual que LinearConflict
+    boards, vt = _prepare(boards, goal)
+    h = vt.dist[boards, vt.cells].sum(axis=1, dtype=np.int32)
+    gpos = vt.goal_pos[boards]
+    for axis in (0, 1):
+        home = vt.line_of[axis][boards]
+        for k, cells in enumerate(vt.lines[axis]):
+            ok = home[:, cells] == k
+            gp = gpos[:, cells]
+            for i in range(vt.n):
+                for j in range(i + 1, vt.n):
+                    h += 2 * (ok[:, i] & ok[:, j] & (gp[:, i] > gp[:, j]))
+    return h
+
+BATCH_HEURISTICS = {
+    "Manhattan": manhattan_batch,
+    "Misplaced Tiles": misplaced_batch,
+    "Linear Conflict": linear_conflict_batch,
+}
+
+def batch_for(h):
+    # Versión en lote de una heurística escalar de core.heuristics (por su nombre)
+    hb = BATCH_HEURISTICS.get(getattr(h, "name", None))
+    if hb is None:
+        raise ValueError(f"No hay versión en lote de la heurística {getattr(h, 'name', h)}")
+    return hb
+
+def batched_a_star(problem, h_batch, batch_size=256, stats=None):
+    # A* que expande juntos los nodos de la frontera con el mismo f mínimo
+    # (hasta batch_size) y puntúa a todos sus hijos con una sola llamada.
+    # Expandir a la vez nodos con el mismo f no cambia la optimalidad: la meta
+    # se sigue comprobando al sacar el nodo. best: g abierto, -1-g cerrado.
+    goal = problem.goal
+    s0 = problem.initial_state()
+    start = Node(s0)
+    start.h = int(h_batch(boards_array([s0]), goal)[0])
+    heap = [(start.h, 0, start)]
+    best = {s0: 0}
+    t = expanded = 0
+    while heap:
+        f = heap[0][0]
+        batch = []
+        while heap and heap[0][0] == f and len(batch) < batch_size:
+            n = heapq.heappop(heap)[2]
+            g = best[n.state]
+            if g < 0 or n.g > g:
+                if stats is not None: stats.duplicates += 1
+                continue
+            if problem.is_goal(n.state): return reconstruct_path(n), expanded
+            best[n.state] = -1 - n.g
+            batch.append(n)
+        expanded += len(batch)
+        children = []
+        for n in batch:
+            for a in problem.actions(n.state):
+                sp = problem.result(n.state, a)
+                c = Node(sp, n, a, n.g + problem.step_cost(n.state, a, sp))
+                g = best.get(sp)
+                if g is None or (c.g < -1 - g if g < 0 else c.g < g):
+                    children.append(c)
+                elif stats is not None: stats.duplicates += 1
+        if stats is not None:
+            stats.expanded += len(batch); stats.generated += len(children)
+        if not children: continue
+        hs = h_batch(boards_array([c.state for c in children]), goal).tolist()
+        for c, hv in zip(children, hs):
+            # repetidos dentro del mismo lote: gana la menor g
+            g = best.get(c.state)
+            if g is not None and (c.g >= -1 - g if g < 0 else c.g >= g):
+                if stats is not None: stats.duplicates += 1
+                continue
+            if g is not None and stats is not None: stats.reopened += 1
+            best[c.state] = c.g; c.h = hv
+            t += 1
+            heapq.heappush(heap, (c.g + hv, t, c))
+        if stats is not None: stats.after_expand(len(heap))
+    return None, expanded
@@ -0,0 +1,133 @@
+import argparse
+import csv
+import json
+import random
+import sys
+
+# Resumen por algoritmo de un archivo de resultados (JSONL o CSV, p. ej. la
+# salida de ui.batch) leyendo registro a registro: memoria acotada aunque el
+# archivo tenga millones de líneas. Media, mínimo y máximo son exactos; los
+# percentiles salen de un muestreo de reservorio (exactos mientras el grupo
+# quepa en el reservorio).
+
+FIELDS = ("tiempo", "nodos_expandidos", "pasos")
+GROUP_BY = ("algoritmo", "heuristica")
+PERCENTILES = (50, 90, 99)
+
+def _number(v):
+    if isinstance(v, (int, float)) or v is None: return v
+    if v == "": return None
+    for conv in (int, float):
+        try:
+            return conv(v)
+        except ValueError:
+            pass
+    return v
+
+def read_records(path):
+    # Generador de dicts; '-' = stdin (JSONL)
+    f = sys.stdin if path == "-" else open(path, newline="" if path.endswith(".csv") else None)
+    try:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield {k: _number(v) for k, v in row.items()}
+        else:
+            for line in f:
+                if line.strip(): yield json.loads(line)
+    finally:
+        if f is not sys.stdin: f.close()
+
+class Reservoir:
+    # Muestra uniforme de tamaño fijo de un flujo (algoritmo R)
+    def __init__(self, size=10000, rng=None):
+        self.size = size; self.count = 0; self.items = []
+        self.rng = rng or random.Random(0)
+
+    def add(self, x):
+        self.count += 1
+        if len(self.items) < self.size:
+            self.items.append(x)
+        else:
+            j = self.rng.randrange(self.count)
+            if j < self.size: self.items[j] = x
+
+    def percentile(self, p):
+        # Interpolación lineal entre los dos valores más cercanos
+        if not self.items: return None
+        xs = sorted(self.items)
+        k = (len(xs) - 1) * p / 100
+        lo = int(k); hi = min(lo + 1, len(xs) - 1)
+        return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+class _FieldSummary:
+    def __init__(self, reservoir, rng):
+        self.n = 0; self.total = 0.0; self.min = None; self.max = None
+        self.sample = Reservoir(reservoir, rng)
+
+    def add(self, x):
+        self.n += 1; self.total += x
+        if self.min is None or x < self.min: self.min = x
+        if self.max is None or x > self.max: self.max = x
+        self.sample.add(x)
+
+    def to_dict(self, percentiles):
+        d = {"n": self.n, "media": self.total / self.n if self.n else None, "min": self.min, "max": self.max}
+        for p in percentiles:
+            d[f"p{p}"] = self.sample.percentile(p)
+        return d
+
+def aggregate(records, fields=FIELDS, group_by=GROUP_BY, percentiles=PERCENTILES, reservoir=10000, seed=0):
+    rng = random.Random(seed)
+    groups = {}
+    for r in records:
+        key = tuple(r.get(g) for g in group_by)
+        grp = groups.get(key)
+        if grp is None:
+            grp = groups[key] = {"registros": 0, "resueltos": 0,
+                                 "campos": {f: _FieldSummary(reservoir, rng) for f in fields}}
+        grp["registros"] += 1
+        if r.get("solucion_encontrada") in (True, "True", "true", 1): grp["resueltos"] += 1
+        for f in fields:
+            v = r.get(f)
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                grp["campos"][f].add(v)
+    out = []
+    for key, grp in groups.items():
+        row = dict(zip(group_by, key))
+        row["registros"] = grp["registros"]; row["resueltos"] = grp["resueltos"]
+        for f, s in grp["campos"].items():
+            row[f] = s.to_dict(percentiles)
+        out.append(row)
+    return out
+
+def _fmt(v):
+    if v is None: return "-"
+    return f"{v:.4g}" if isinstance(v, float) else str(v)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Percentiles por algoritmo de un archivo de resultados (JSONL/CSV).")
+    parser.add_argument("file", help="resultados .jsonl o .csv ('-' = stdin)")
+    parser.add_argument("--fields", nargs="+", default=list(FIELDS))
+    parser.add_argument("--by", nargs="+", default=list(GROUP_BY), help="campos de agrupación")
+    parser.add_argument("--percentiles", type=float, nargs="+", default=list(PERCENTILES))
+    parser.add_argument("--reservoir", type=int, default=10000, help="muestras por grupo y campo")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="salida JSON en vez de tabla")
+    args = parser.parse_args(argv)
+    pcts = [int(p) if p == int(p) else p for p in args.percentiles]
+
+    rows = aggregate(read_records(args.file), args.fields, args.by, pcts, args.reservoir, args.seed)
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False); print()
+        return 0
+    for row in rows:
+        title = " / ".join(_fmt(row[g]) for g in args.by)
+        print(f"{title}: {row['registros']} registros, {row['resueltos']} resueltos")
+        for f in args.fields:
+            s = row[f]
+            print(f"  {f:<17} media {_fmt(s['media'])}  min {_fmt(s['min'])}  max {_fmt(s['max'])}  "
+                  + "  ".join(f"p{p} {_fmt(s[f'p{p}'])}" for p in pcts))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import argparse
+import csv
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from core.abstracts import LimitedProblem, SearchLimitExceeded
+from core.algorithms import A_star
+from core.generator import random_walk
+from core.heuristics import linear_conflict
+from core.problem import Puzzle, board_tables
+from ui.dispatcher import solve_puzzle, HEURISTICS, HEURISTIC_ALGORITHMS, FIXED_GOAL_HEURISTICS
+try:
+    from core.vectorized import linear_conflict_batch
+except ImportError:  # NumPy opcional: sin él no hay prefiltro
+    linear_conflict_batch = None
+
+# Banco de pruebas reproducible: corpus fijo (semilla) agrupado por
+# profundidad óptima, todas las combinaciones algoritmo x heurística,
+# calentamiento + repeticiones, y un informe comparable con una línea base.
+
+ALGORITHMS = ("BFS", "DFS", "UCS", "Greedy", "A*", "Weighted A*", "IDA*",
+              "Bidirectional BFS", "Bidirectional A*", "SMA*",
+              "Compact BFS", "Compact UCS", "Solution DB")
+DEFAULT_DEPTHS = (8, 12, 16, 20, 24)
+
+def _useful(buckets, per_depth, lb):
+    # ¿Puede caer en alguna cubeta libre? profundidad >= h y de su misma paridad
+    return any(d >= lb and (d - lb) % 2 == 0 and len(v) < per_depth for d, v in buckets.items())
+
+def build_corpus(seed=0, depths=DEFAULT_DEPTHS, per_depth=3, n=3, max_attempts=20000, chunk=256):
+    # Paseos aleatorios desde la meta; la profundidad real se mide con A*.
+    # Con NumPy, h (conflictos lineales) de cada bloque de candidatos se calcula
+    # de una vez y se descartan sin A* los que no pueden llenar ninguna cubeta;
+    # el corpus resultante es el mismo para la misma semilla.
+    rng = random.Random(seed)
+    t = board_tables(n)
+    buckets = {d: [] for d in depths}
+    seen = set()
+    attempts = 0
+    full = lambda: all(len(v) >= per_depth for v in buckets.values())
+    while attempts < max_attempts and not full():
+        block = [random_walk(rng.randint(min(depths), 2 * max(depths)), n, rng=rng)
+                 for _ in range(min(chunk, max_attempts - attempts))]
+        attempts += len(block)
+        bounds = linear_conflict_batch(block, t.goal).tolist() if linear_conflict_batch else [None] * len(block)
+        for tiles, lb in zip(block, bounds):
+            if full(): break
+            if tiles in seen: continue
+            seen.add(tiles)
+            if lb is not None and not _useful(buckets, per_depth, lb): continue
+            path, _ = A_star(Puzzle(tiles), linear_conflict)
+            d = len(path) - 1
+            if d in buckets and len(buckets[d]) < per_depth:
+                buckets[d].append(tiles)
+    corpus = []
+    for d in depths:
+        for k, tiles in enumerate(buckets[d]):
+            corpus.append({"id": f"d{d}-{k}", "profundidad": d, "estado": list(tiles)})
+    return {"semilla": seed, "n": n, "instancias": corpus}
+
+def _combos(algorithms, heuristics):
+    for a in algorithms:
+        if a in HEURISTIC_ALGORITHMS:
+            for h in heuristics:
+                # la búsqueda hacia atrás necesita h hacia el inicio
+                if a == "Bidirectional A*" and h in FIXED_GOAL_HEURISTICS: continue
+                yield a, h
+        else:
+            yield a, None
+
+def _run(tiles, algorithm, heuristic, weight, node_limit):
+    problem = LimitedProblem(Puzzle(tiles), node_limit)
+    t0 = time.perf_counter()
+    try:
+        path, expanded = solve_puzzle(problem, algorithm, HEURISTICS.get(heuristic), weight)
+        steps = len(path) - 1 if path else None
+    except SearchLimitExceeded as e:
+        path, expanded, steps = None, e.expanded, None
+    return time.perf_counter() - t0, expanded, steps
+
+def _peak_memory(tiles, algorithm, heuristic, weight, node_limit):
+    # Pasada aparte: tracemalloc ralentiza mucho y no debe tocar los tiempos
+    tracemalloc.start()
+    try:
+        _run(tiles, algorithm, heuristic, weight, node_limit)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(corpus, algorithms=ALGORITHMS, heuristics=None, weight=1.5,
+                  warmup=1, repeat=3, node_limit=2_000_000, memory=True, log=None):
+    heuristics = list(heuristics or HEURISTICS)
+    results = []
+    for algorithm, heuristic in _combos(algorithms, heuristics):
+        for inst in corpus["instancias"]:
+            tiles = tuple(inst["estado"])
+            for _ in range(warmup):
+                _run(tiles, algorithm, heuristic, weight, node_limit)
+            times = []
+            for _ in range(repeat):
+                elapsed, expanded, steps = _run(tiles, algorithm, heuristic, weight, node_limit)
+                times.append(elapsed)
+            t_med = statistics.median(times)
+            row = {
+                "algoritmo": algorithm,
+                "heuristica": heuristic,
+                "instancia": inst["id"],
+                "profundidad": inst["profundidad"],
+                "pasos": steps,
+                "nodos_expandidos": expanded,
+                "tiempo_mediana": round(t_med, 6),
+                "tiempo_min": round(min(times), 6),
+                "nodos_por_segundo": round(expanded / t_med) if t_med > 0 else None,
+                "memoria_pico": _peak_memory(tiles, algorithm, heuristic, weight, node_limit) if memory else None,
+            }
+            results.append(row)
+            if log: log(row)
+    return {
+        "meta": {
+            "semilla": corpus["semilla"], "n": corpus["n"], "warmup": warmup, "repeat": repeat,
+            "weight": weight, "node_limit": node_limit,
+            "python": platform.python_version(), "plataforma": platform.platform(),
+        },
+        "resultados": results,
+    }
+
+def write_json(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def write_csv(report, path):
+    rows = report["resultados"]
+    if not rows: return
+    with open(path, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader(); w.writerows(rows)
+
+def compare(report, baseline, tolerance=0.10):
+    # Regresión: más nodos expandidos, o tiempo mediano peor que baseline*(1+tolerance)
+    key = lambda r: (r["algoritmo"], r["heuristica"], r["instancia"])
+    base = {key(r): r for r in baseline["resultados"]}
+    regressions = []
+    for r in report["resultados"]:
+        b = base.get(key(r))
+        if b is None: continue
+        if r["nodos_expandidos"] > b["nodos_expandidos"]:
+            regressions.append((key(r), "nodos_expandidos", b["nodos_expandidos"], r["nodos_expandidos"]))
+        if r["tiempo_mediana"] > b["tiempo_mediana"] * (1 + tolerance):
+            regressions.append((key(r), "tiempo_mediana", b["tiempo_mediana"], r["tiempo_mediana"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reproducible de algoritmos y heurísticas.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depths", type=int, nargs="+", default=list(DEFAULT_DEPTHS))
+    parser.add_argument("--per-depth", type=int, default=3)
+    parser.add_argument("--corpus", help="reutiliza/guarda el corpus en este JSON")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS))
+    parser.add_argument("--heuristics", nargs="+", default=list(HEURISTICS))
+    parser.add_argument("--weight", type=float, default=1.5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--node-limit", type=int, default=2_000_000)
+    parser.add_argument("--no-memory", action="store_true", help="no mide memoria pico")
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--csv")
+    parser.add_argument("--baseline", help="informe JSON previo para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    corpus = None
+    if args.corpus:
+        try:
+            with open(args.corpus) as f: corpus = json.load(f)
+        except FileNotFoundError:
+            pass
+    if corpus is None:
+        corpus = build_corpus(args.seed, args.depths, args.per_depth)
+        if args.corpus: write_json(corpus, args.corpus)
+
+    log = lambda r: print(f"{r['algoritmo']:<12} {str(r['heuristica']):<17} {r['instancia']:<7} "
+                          f"{r['nodos_expandidos']:>9} nodos {r['tiempo_mediana']:.4f}s", file=sys.stderr)
+    report = run_benchmark(corpus, args.algorithms, args.heuristics, args.weight,
+                           args.warmup, args.repeat, args.node_limit, not args.no_memory, log)
+    write_json(report, args.out)
+    if args.csv: write_csv(report, args.csv)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for k, field, old, new in regressions:
+            print(f"REGRESIÓN {k}: {field} {old} -> {new}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,37 @@
 import time
+from math import isqrt
 
-def print_solution(solution):
-    print("\n--- Camino de la solución ---")
+def format_solution(solution):
+    # Generador de líneas: el camino se formatea paso a paso, solo si se consume
+    yield "\n--- Camino de la solución ---"
     for step, node in enumerate(solution):
         action = node.action
         state = node.state
         if action:
-            print(f"Paso {step}: mover {action}")
+            yield f"Paso {step}: mover {action}"
         else:
-            print(f"Paso {step}: (estado inicial)")
+            yield f"Paso {step}: (estado inicial)"
 
         # usamos state.tiles (la tupla con los números)
-        for i in range(0, 9, 3):
-            row = state.tiles[i:i+3]
-            print(" ".join(str(x) if x != 0 else " " for x in row))
-        print("-"*7)
+        tiles = state.tiles; n = isqrt(len(tiles))
+        width = len(str(len(tiles) - 1))
+        for i in range(0, n*n, n):
+            row = tiles[i:i+n]
+            yield " ".join(str(x).rjust(width) if x != 0 else " "*width for x in row)
+        yield "-"*(n*(width+1)-1)
+
+def print_solution(solution, file=None):
+    for line in format_solution(solution):
+        print(line, file=file)
 
 
 # Función para ejecutar un algoritmo y medir métricas
-def run_search(name, func, problem, heuristic=None, **kwargs):
+# stats: SearchStats opcional; sus contadores se añaden al resultado
+# show_path: imprime el camino (desactivar en lotes: imprimir domina el tiempo)
+# sink: destino opcional (metrics.sinks) donde se escribe el resultado
+def run_search(name, func, problem, heuristic=None, stats=None, show_path=True, sink=None, **kwargs):
+    if stats is not None:
+        kwargs["stats"] = stats
     start_time = time.time()
     if heuristic:
         solution, expanded = func(problem, heuristic, **kwargs)
@@ -28,17 +41,22 @@ def run_search(name, func, problem, heuristic=None, **kwargs):
 
     if solution:
         steps = len(solution) - 1
-        print_solution(solution)
+        if show_path: print_solution(solution)
     else:
         steps = None
 
-    return {
+    result = {
         "algoritmo": name,
         "solucion_encontrada": solution is not None,
         "pasos": steps,
         "nodos_expandidos": expanded,
         "tiempo": round(elapsed, 4)
     }
+    if stats is not None:
+        result["estadisticas"] = stats.to_dict()
+    if sink is not None:
+        sink.write(result)
+    return result
 
 class Metrics:
     def __init__(self):
@@ -48,19 +66,48 @@ class Metrics:
             "heuristica": None,
             "pasos": 0,
             "nodos_expandidos": 0,
-            "tiempo": 0.0
+            "tiempo": 0.0,
+            "estadisticas": None
         }
 
-    def set(self, algoritmo, heuristica, solucion_encontrada, pasos, nodos_expandidos, tiempo):
+    def set(self, algoritmo, heuristica, solucion_encontrada, pasos, nodos_expandidos, tiempo, estadisticas=None):
+        # estadisticas: SearchStats (o su to_dict()) de la búsqueda, opcional
+        if hasattr(estadisticas, "to_dict"):
+            estadisticas = estadisticas.to_dict()
         self.metrics.update({
             "algoritmo": algoritmo,
             "solucion_encontrada": solucion_encontrada,
             "heuristica": heuristica,
             "pasos": pasos,
             "nodos_expandidos": nodos_expandidos,
-            "tiempo": tiempo
+            "tiempo": tiempo,
+            "estadisticas": estadisticas
         })
 
+    def to_dict(self):
+        return dict(self.metrics)
+
+    def emit(self, sink):
+        # Registro estructurado (JSONL/CSV) en lugar del texto de get_metrics_string
+        sink.write(self.to_dict())
+
+    def get_stats_string(self):
+        s = self.metrics["estadisticas"]
+        if not s:
+            return ""
+        lines = [
+            f"Generados: {s['generados']}  Duplicados: {s['duplicados']}  Reabiertos: {s['reabiertos']}",
+            f"Pico de frontera: {s['pico_frontera']}",
+        ]
+        if s.get("cotas_ida"):
+            lines.append(f"Cotas IDA*: {', '.join(str(b) for b in s['cotas_ida'])}")
+        if s["muestras"]:
+            lines.append(
+                f"Tiempo estimado: expandir {s['tiempo_expand_estimado']}s "
+                f"(heurística {s['tiempo_heuristic_estimado']}s), frontera {s['tiempo_frontier_estimado']}s"
+            )
+        return "\n" + "\n".join(lines)
+
     def get_metrics_string(self):
         if self.metrics["heuristica"]:
             return (
@@ -70,6 +117,7 @@ class Metrics:
                 f"Pasos: {self.metrics['pasos']}\n"
                 f"Nodos expandidos: {self.metrics['nodos_expandidos']}\n"
                 f"Tiempo de ejecución: {self.metrics['tiempo']} segundos"
+                + self.get_stats_string()
             )
         return (
             f"Algoritmo: {self.metrics['algoritmo']}\n"
@@ -77,4 +125,5 @@ class Metrics:
             f"Pasos: {self.metrics['pasos']}\n"
             f"Nodos expandidos: {self.metrics['nodos_expandidos']}\n"
             f"Tiempo de ejecución: {self.metrics['tiempo']} segundos"
+            + self.get_stats_string()
         )
@@ -0,0 +1,110 @@
+import csv
+import json
+import sys
+
+# Destinos de registros de métricas (un dict por búsqueda).
+# Todos acumulan en memoria hasta `buffer_size` registros y entonces escriben
+# de una vez; flush()/close() vacían el resto. Se usan como context manager:
+#     with open_sink("resultados.jsonl") as sink:
+#         sink.write(metrics.to_dict())
+
+class Sink:
+    def __init__(self, buffer_size=64):
+        self.buffer_size = buffer_size
+        self._buf = []
+
+    def write(self, record):
+        self._buf.append(record)
+        if len(self._buf) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            # se vacía antes: si la escritura falla, close() no repite registros
+            buf, self._buf = self._buf, []
+            self._write_many(buf)
+
+    def _write_many(self, records): raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+class NullSink(Sink):
+    # Descarta todo (p. ej. benchmarks donde no interesa guardar)
+    def write(self, record): pass
+    def _write_many(self, records): pass
+
+class _FileSink(Sink):
+    # `target`: ruta (se abre en modo append) o un archivo ya abierto (p. ej. sys.stdout)
+    def __init__(self, target, buffer_size=64, newline=None):
+        super().__init__(buffer_size)
+        if isinstance(target, str):
+            self._file = open(target, "a", encoding="utf-8", newline=newline); self._owned = True
+        else:
+            self._file = target; self._owned = False
+
+    def flush(self):
+        super().flush()
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owned: self._file.close()
+
+class JsonlSink(_FileSink):
+    def _write_many(self, records):
+        self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+
+# Campos que solo aparecen en algunos registros (búsquedas cortadas o con
+# error): siempre tienen columna aunque el primer registro no los traiga
+OPTIONAL_FIELDS = ("limite", "error")
+
+def _csv_header(path):
+    # Cabecera de un CSV existente (None si no existe o está vacío)
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+class CsvSink(_FileSink):
+    # Columnas fijadas por el primer registro más OPTIONAL_FIELDS (o
+    # `fieldnames`); un campo fuera de ellas es un error, nunca se descarta.
+    # En append sobre un CSV con datos se usa su cabecera, en su orden.
+    # Los valores anidados (estadisticas, acciones...) se guardan como JSON en su celda
+    def __init__(self, target, buffer_size=64, fieldnames=None):
+        header = _csv_header(target) if isinstance(target, str) else None
+        if header and fieldnames is not None and list(fieldnames) != header:
+            raise ValueError(f"{target} ya tiene otras columnas: {header}")
+        super().__init__(target, buffer_size, newline="")
+        self.fieldnames = header or fieldnames
+        self._header = bool(header)
+        self._writer = None
+
+    def _write_many(self, records):
+        if self._writer is None:
+            if self.fieldnames is None:
+                self.fieldnames = list(records[0]) + [k for k in OPTIONAL_FIELDS if k not in records[0]]
+            elif self._header:
+                extra = [k for k in records[0] if k not in self.fieldnames]
+                if extra:
+                    raise ValueError(f"Campos {extra} fuera de la cabecera del CSV existente {self.fieldnames}")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            if not self._header and (not self._file.seekable() or self._file.tell() == 0):
+                self._writer.writeheader()
+        # DictWriter lanza ValueError ante un campo desconocido; lo anterior ya queda escrito
+        self._writer.writerows(
+            {k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v for k, v in r.items()}
+            for r in records)
+
+def open_sink(target, buffer_size=64):
+    # Elige el formato por extensión (.csv -> CSV, resto -> JSONL); "-" = stdout
+    # en JSONL, registro a registro (quien lee la tubería los ve al terminar cada uno)
+    if target == "-":
+        return JsonlSink(sys.stdout, 1)
+    if target.endswith(".csv"):
+        return CsvSink(target, buffer_size)
+    return JsonlSink(target, buffer_size)
@@ -0,0 +1,38 @@
+import pytest
+from core.algorithms import A_star, Weighted_A_star
+from core.heuristics import linear_conflict, manhattan
+from core.problem import Puzzle
+from core.stats import SearchStats
+from core.structures import FRONTIERS
+
+# Núcleo de A* / Weighted A* (_best_first): todas las variantes de frontera y
+# de lista cerrada tienen que dar la longitud óptima de la BFS.
+
+@pytest.mark.parametrize("decrease_key", [False, True])
+@pytest.mark.parametrize("consistent", [False, True])
+@pytest.mark.parametrize("h", [manhattan, linear_conflict])
+def test_a_star_variants_are_optimal(boards, optimal, decrease_key, consistent, h):
+    for board in boards(1):
+        path, expanded = A_star(Puzzle(board), h, decrease_key=decrease_key, consistent=consistent)
+        assert len(path) - 1 == optimal(board)
+        assert path[-1].state.tiles == Puzzle(board).tables.goal
+
+@pytest.mark.parametrize("frontier", sorted(FRONTIERS))
+def test_a_star_frontiers_are_optimal(boards, optimal, frontier):
+    for board in boards(2):
+        path, _ = A_star(Puzzle(board), manhattan, frontier=FRONTIERS[frontier])
+        assert len(path) - 1 == optimal(board)
+
+def test_consistent_h_never_reopens(boards):
+    # Manhattan es consistente: un estado cerrado no se vuelve a abrir
+    for board in boards(3):
+        stats = SearchStats()
+        A_star(Puzzle(board), manhattan, stats=stats)
+        assert stats.reopened == 0
+
+def test_weighted_a_star_stays_within_its_bound(boards, optimal):
+    for board in boards(4):
+        path, _ = Weighted_A_star(Puzzle(board), manhattan, 1)
+        assert len(path) - 1 == optimal(board)
+        path, _ = Weighted_A_star(Puzzle(board), manhattan, 2, decrease_key=True)
+        assert optimal(board) <= len(path) - 1 <= 2 * optimal(board)
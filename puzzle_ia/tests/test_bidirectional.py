@@ -0,0 +1,36 @@
+import pytest
+from core.algorithms import Bidirectional_A_star, Bidirectional_BFS
+from core.heuristics import linear_conflict, manhattan, misplaced
+from core.pdb import pattern_database
+from core.problem import Puzzle
+from ui.dispatcher import solve_puzzle
+
+# Búsquedas bidireccionales: el camino unido tiene la longitud de la BFS y
+# lleva del inicio a la meta.
+
+def _check(path, board, length):
+    assert len(path) - 1 == length
+    assert path[0].state.tiles == board
+    assert path[-1].state.tiles == Puzzle(board).tables.goal
+
+def test_bidirectional_bfs_is_optimal(boards, optimal):
+    for board in boards(20, k=8, depth=20):
+        path, _ = Bidirectional_BFS(Puzzle(board))
+        _check(path, board, optimal(board))
+
+@pytest.mark.parametrize("h", [manhattan, misplaced, linear_conflict])
+def test_bidirectional_a_star_is_optimal(boards, optimal, h):
+    for board in boards(21):
+        path, _ = Bidirectional_A_star(Puzzle(board), h)
+        _check(path, board, optimal(board))
+
+def test_bidirectional_at_goal():
+    goal = Puzzle((1, 2, 3, 4, 5, 6, 7, 8, 0)).tables.goal
+    for algorithm in ("Bidirectional BFS", "Bidirectional A*"):
+        path, _ = solve_puzzle(Puzzle(goal), algorithm, manhattan)
+        assert len(path) == 1
+
+def test_bidirectional_a_star_rejects_fixed_goal_tables():
+    # la búsqueda hacia atrás necesita h hacia el inicio: la PDB no la tiene
+    with pytest.raises(ValueError):
+        Bidirectional_A_star(Puzzle((1, 2, 3, 4, 5, 6, 0, 7, 8)), pattern_database)
@@ -0,0 +1,82 @@
+import random
+import pytest
+from core.abstracts import LimitedProblem, SearchLimitExceeded
+from core.checkpoint import Checkpointer, checkpointed_a_star, checkpointed_bfs, checkpointed_ida_star
+from core.generator import random_solvable, random_walk
+from core.heuristics import Manhattan
+from core.solution_db import load_or_build
+from core.problem import Puzzle
+
+# Se corta la búsqueda con KeyboardInterrupt a mitad de una expansión (desde
+# la heurística) y se reanuda desde el punto de control hasta terminar: el
+# camino tiene que seguir siendo óptimo.
+
+class _Interrupting(Manhattan):
+    # Misma heurística (mismo nombre para el punto de control) que lanza en
+    # la llamada número `at` a move_delta
+    def __init__(self, at):
+        super().__init__()
+        self.calls, self.at = 0, at
+
+    def move_delta(self, tiles, blank, target):
+        self.calls += 1
+        if self.calls == self.at: raise KeyboardInterrupt
+        return super().move_delta(tiles, blank, target)
+
+def _resume_until_done(solve, path, rng, interrupts=4):
+    rounds = 0
+    while True:
+        at = rng.randint(2, 60) if rounds < interrupts else None
+        h = _Interrupting(at)
+        try:
+            return solve(h, Checkpointer(str(path), every_nodes=50)), rounds
+        except KeyboardInterrupt:
+            rounds += 1
+
+@pytest.mark.parametrize("engine", [
+    checkpointed_a_star,
+    lambda p, h, ck: checkpointed_ida_star(p, h, ck, split_nodes=300, tasks=4),
+])
+def test_interrupted_search_resumes_optimally(engine, tmp_path):
+    db = load_or_build()
+    rng = random.Random(7)
+    for k in range(20):
+        board = random_solvable(rng=rng)
+        ckpt = tmp_path / f"{k}.ckp"
+        (path, _), rounds = _resume_until_done(lambda h, ck: engine(Puzzle(board), h, ck), ckpt, rng)
+        assert rounds > 0
+        assert len(path) - 1 == db.distance(board)
+        assert path[-1].state.tiles == Puzzle(board).tables.goal
+        assert not ckpt.exists()
+
+def test_bfs_resumes_after_node_limits(tmp_path):
+    # Cortes por LimitedProblem (escriben la última instantánea) hasta terminar
+    db = load_or_build()
+    rng = random.Random(11)
+    for k in range(5):
+        board = random_walk(20, rng=rng)
+        ckpt = tmp_path / f"bfs{k}.ckp"
+        rounds = 0
+        while True:
+            try:
+                path, _ = checkpointed_bfs(LimitedProblem(Puzzle(board), max_nodes=1000),
+                                           Checkpointer(str(ckpt), every_nodes=300))
+                break
+            except SearchLimitExceeded:
+                rounds += 1
+                assert ckpt.exists()
+        assert rounds > 0
+        assert len(path) - 1 == db.distance(board)
+        assert not ckpt.exists()
+
+def test_foreign_or_corrupt_file_is_rejected(tmp_path):
+    # Sin pickle: un archivo ajeno o truncado da ValueError, nunca se ejecuta
+    board = (8, 6, 7, 2, 5, 4, 3, 0, 1)  # 31 movimientos
+    ckpt = tmp_path / "a.ckp"
+    with pytest.raises(SearchLimitExceeded):
+        checkpointed_a_star(LimitedProblem(Puzzle(board), max_nodes=50), Manhattan(), Checkpointer(str(ckpt)))
+    raw = ckpt.read_bytes()
+    for bad in (b"\x80\x04K\x01.", raw[:len(raw) // 2], b"XXXX" + raw[4:]):
+        ckpt.write_bytes(bad)
+        with pytest.raises(ValueError):
+            checkpointed_a_star(Puzzle(board), Manhattan(), Checkpointer(str(ckpt)))
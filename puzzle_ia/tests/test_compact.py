@@ -0,0 +1,53 @@
+import random
+from core.algorithms import UCS
+from core.compact import CompactStore, ROOT, compact_bfs, compact_ucs
+from core.problem import Puzzle
+
+# BFS/UCS sobre el almacén compacto: misma longitud que la BFS de referencia
+# y caminos que de verdad van del inicio a la meta.
+
+def _check(path, board):
+    assert path[0].state.tiles == board
+    assert path[-1].state.tiles == Puzzle(board).tables.goal
+
+def test_compact_bfs_and_ucs_are_optimal(boards, optimal):
+    for board in boards(40, k=8, depth=20):
+        for solve in (compact_bfs, compact_ucs):
+            path, _ = solve(Puzzle(board))
+            assert len(path) - 1 == optimal(board)
+            _check(path, board)
+
+class _TileCost(Puzzle):
+    # mover la ficha v cuesta v
+    def step_cost(self, s, a, sp):
+        return s.tiles[sp.blank]
+
+def _cost(path):
+    return sum(a.state.tiles[b.state.blank] for a, b in zip(path, path[1:]))
+
+def test_compact_ucs_with_tile_costs(boards):
+    for board in boards(41, k=4, depth=12):
+        path, _ = compact_ucs(Puzzle(board), cost=lambda tile: tile)
+        ref, _ = UCS(_TileCost(board))
+        _check(path, board)
+        assert _cost(path) == _cost(ref)
+
+def test_compact_bfs_at_goal():
+    goal = Puzzle((1, 2, 3, 4, 5, 6, 7, 0, 8)).tables.goal
+    path, expanded = compact_bfs(Puzzle(goal))
+    assert len(path) == 1 and expanded == 0
+
+def test_store_grows_and_keeps_entries():
+    rng = random.Random(42)
+    for key_bits in (64, 100):
+        store = CompactStore(key_bits, capacity=4)
+        keys = {rng.getrandbits(key_bits) | 1: (rng.randrange(1000), rng.randrange(25)) for _ in range(5000)}
+        for k, (g, p) in keys.items():
+            store.put(k, g, p)
+        assert len(store) == len(keys)
+        for k, (g, p) in keys.items():
+            i = store.find(k)
+            assert i >= 0 and store.g[i] == g and store.parent[i] == p
+        assert store.find(2) < 0
+        store.put(2, 0, ROOT)
+        assert 2 in store and store.parent[store.find(2)] == ROOT
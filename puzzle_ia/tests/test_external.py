@@ -0,0 +1,41 @@
+import random
+import pytest
+from core.algorithms import A_star
+from core.external import DiskDistanceTable, external_bfs
+from core.generator import random_solvable
+from core.layered import depth_histogram
+from core.problem import Puzzle, board_tables
+from core.solution_db import load_or_build
+
+# BFS en disco: los estados por profundidad coinciden con la BFS por capas en
+# memoria (core.layered), y la tabla de distancias que escribe da distancias
+# exactas y sirve de heurística.
+
+def test_external_bfs_matches_depth_histogram(tmp_path):
+    goal = board_tables(3).goal
+    assert external_bfs([goal], str(tmp_path)) == depth_histogram(3)
+    # tramos pequeños: muchos archivos que mezclar por capa
+    assert external_bfs([goal], str(tmp_path), chunk_size=500, max_depth=14) == depth_histogram(3, max_depth=14)
+    assert external_bfs([board_tables(2).goal], str(tmp_path)) == depth_histogram(2)
+    assert not list(tmp_path.iterdir())
+
+def test_disk_distance_table(tmp_path, boards, optimal):
+    table_path = str(tmp_path / "dist.bin")
+    external_bfs([board_tables(3).goal], str(tmp_path), max_depth=18, table_path=table_path)
+    table = DiskDistanceTable(table_path)
+    try:
+        db = load_or_build()
+        rng = random.Random(70)
+        for _ in range(200):
+            board = random_solvable(rng=rng)
+            d = db.distance(board)
+            assert table.distance(board) == (d if d <= 18 else None)
+        # admisible: más allá de max_depth devuelve max_depth + 1
+        for board in boards(71, depth=30):
+            path, _ = A_star(Puzzle(board), table)
+            assert len(path) - 1 == optimal(board)
+        assert table.goal == board_tables(3).goal
+        with pytest.raises(ValueError):
+            table(Puzzle(board).initial_state(), (0, 1, 2, 3, 4, 5, 6, 7, 8))
+    finally:
+        table.close()
@@ -0,0 +1,29 @@
+import random
+from core.algorithms import BFS
+from core.generator import random_solvable
+from core.hda import hda_star
+from core.heuristics import linear_conflict, manhattan
+from core.problem import Puzzle
+from core.stats import SearchStats
+from ui.dispatcher import solve_puzzle
+
+# HDA* con 2 procesos: la primera meta que aparece no tiene por qué ser la
+# óptima, el incumbente y la terminación distribuida tienen que dar la de BFS.
+
+def test_hda_star_is_optimal(boards, optimal):
+    for k, board in enumerate(boards(50, k=5, depth=20)):
+        stats = SearchStats()
+        path, expanded = hda_star(Puzzle(board), (manhattan, linear_conflict)[k % 2], workers=2, stats=stats)
+        assert len(path) - 1 == optimal(board)
+        assert path[0].state.tiles == board
+        assert path[-1].state.tiles == Puzzle(board).tables.goal
+        assert len(stats.workers) == 2 and expanded > 0
+
+def test_hda_star_custom_goal():
+    rng = random.Random(51)
+    goal = random_solvable(rng=rng)
+    board = random_solvable(goal=goal, rng=rng)
+    ref, _ = BFS(Puzzle(board, goal))
+    path, _ = solve_puzzle(Puzzle(board, goal), "HDA*", manhattan, workers=2)
+    assert len(path) == len(ref)
+    assert path[-1].state.tiles == goal
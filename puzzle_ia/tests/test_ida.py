@@ -0,0 +1,43 @@
+import random
+import pytest
+from core.algorithms import BFS, IDA_star
+from core.generator import random_solvable
+from core.heuristics import linear_conflict, manhattan
+from core.ida import TranspositionTable
+from core.problem import Puzzle
+from ui.dispatcher import solve_puzzle
+
+# IDA* iterativo (core.ida): óptimo con y sin tabla de transposición, también
+# con una tabla tan pequeña que se llena y reemplaza entradas todo el rato.
+
+@pytest.mark.parametrize("tt_size", [None, 8, 100_000])
+@pytest.mark.parametrize("h", [manhattan, linear_conflict])
+def test_ida_star_is_optimal(boards, optimal, tt_size, h):
+    for board in boards(10):
+        path, _ = IDA_star(Puzzle(board), h, tt_size=tt_size)
+        assert len(path) - 1 == optimal(board)
+        assert path[-1].state.tiles == Puzzle(board).tables.goal
+
+def test_ida_star_custom_goal():
+    # meta propia: la heurística se redirige y la meta se reconoce aunque h != 0
+    rng = random.Random(12)
+    for _ in range(4):
+        goal = random_solvable(rng=rng)
+        board = random_solvable(goal=goal, rng=rng)
+        ref, _ = BFS(Puzzle(board, goal))
+        path, _ = solve_puzzle(Puzzle(board, goal), "IDA*", manhattan, tt_size=1000)
+        assert len(path) - 1 == len(ref) - 1
+        assert path[-1].state.tiles == goal
+
+def test_transposition_table_keeps_learning_when_full():
+    tt = TranspositionTable(4)
+    for k in range(100):
+        tt.store(k, 1)
+    assert len(tt) <= 4
+    # las claves nuevas entran aunque la tabla esté llena
+    assert tt.get(99) == 1
+    # la entrada profunda se queda con la cota mayor de su cubeta
+    tt.store(1000, 50)
+    for k in range(100, 200):
+        tt.store(k, 1)
+    assert tt.get(1000) == 50
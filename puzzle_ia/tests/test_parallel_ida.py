@@ -0,0 +1,28 @@
+import pytest
+from core.abstracts import LimitedProblem, SearchLimitExceeded
+from core.heuristics import linear_conflict, manhattan
+from core.parallel_ida import parallel_ida_star
+from core.problem import Puzzle
+
+# IDA* paralelo con 2 procesos: la meta que encuentra cualquier tarea dentro
+# de la cota es óptima, también cuando los subárboles se parten (split_nodes).
+
+@pytest.mark.parametrize("split_nodes", [200_000, 50])
+def test_parallel_ida_star_is_optimal(boards, optimal, split_nodes):
+    for k, board in enumerate(boards(60, k=4, depth=40)):
+        h = (manhattan, linear_conflict)[k % 2]
+        path, _ = parallel_ida_star(Puzzle(board), h, workers=2, split_nodes=split_nodes, tasks_per_worker=2)
+        assert len(path) - 1 == optimal(board)
+        assert path[0].state.tiles == board
+        assert path[-1].state.tiles == Puzzle(board).tables.goal
+
+def test_parallel_ida_star_solved_while_splitting():
+    # tablero tan cercano que la meta aparece al preparar las tareas
+    board = (1, 2, 3, 4, 5, 6, 0, 7, 8)
+    path, _ = parallel_ida_star(Puzzle(board), manhattan, workers=2)
+    assert len(path) - 1 == 2
+
+def test_parallel_ida_star_respects_node_limit():
+    board = (8, 6, 7, 2, 5, 4, 3, 0, 1)  # 31 movimientos
+    with pytest.raises(SearchLimitExceeded):
+        parallel_ida_star(LimitedProblem(Puzzle(board), max_nodes=1000), manhattan, workers=2)
@@ -0,0 +1,34 @@
+import pytest
+from core.abstracts import LimitedProblem, SearchLimitExceeded
+from core.algorithms import SMA_star
+from core.heuristics import linear_conflict, manhattan
+from core.problem import Puzzle
+from core.sma import node_bytes
+from ui.dispatcher import solve_puzzle
+
+# SMA*: con memoria justa (pocos nodos más que el camino) sigue siendo óptimo;
+# si ni el camino cabe, SearchLimitExceeded("memoria") en vez de uno peor.
+
+@pytest.mark.parametrize("max_nodes", [25, 40, 1000])
+@pytest.mark.parametrize("h", [manhattan, linear_conflict])
+def test_sma_star_tight_budget_is_optimal(boards, optimal, max_nodes, h):
+    for board in boards(30, depth=20):
+        # el límite de nodos del problema solo evita que un fallo cuelgue el test
+        path, _ = SMA_star(LimitedProblem(Puzzle(board), max_nodes=500_000), h, max_nodes=max_nodes)
+        assert len(path) - 1 == optimal(board)
+
+def test_sma_star_byte_budget(boards, optimal):
+    board = boards(31, k=1)[0]
+    s = Puzzle(board).initial_state()
+    path, _ = solve_puzzle(Puzzle(board), "SMA*", manhattan, max_bytes=40 * node_bytes(s))
+    assert len(path) - 1 == optimal(board)
+
+def test_sma_star_out_of_memory(boards, optimal):
+    # un camino de d movimientos necesita d + 1 nodos en memoria; estos
+    # tableros volvían a explorar la misma rama muerta sin terminar
+    for board in boards(32, k=3):
+        with pytest.raises(SearchLimitExceeded) as e:
+            SMA_star(LimitedProblem(Puzzle(board), max_nodes=100_000), manhattan, max_nodes=optimal(board))
+        assert e.value.reason == "memoria"
+    with pytest.raises(ValueError):
+        SMA_star(Puzzle(board), manhattan, max_nodes=1)
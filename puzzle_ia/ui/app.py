@@ -9,20 +9,30 @@ from kivy.uix.image import Image
 from core.create_puzzle import create_state
 from core.problem import Puzzle
 from metrics.evaluator import Metrics
+from metrics.sinks import open_sink
 from controllers.puzzle_controller import PuzzleController
 from ui.layouts import PuzzleLayout
+from ui.solve_cache import SolveCache
 
 import matplotlib
 
 class PuzzleApp(App):
+    # Lado del tablero (3 = 8-puzzle, 4 = 15-puzzle, ...)
+    board_size = 3
+    # Soluciones guardadas entre sesiones (None = solo en memoria)
+    cache_file = "solve_cache.json"
+
     def build(self):
-        self.initial_state = create_state()
+        self.initial_state = create_state(self.board_size)
         problem: Puzzle = Puzzle(self.initial_state)
         self.metrics = Metrics()
-        self.controller = PuzzleController(self, problem, self.metrics)
+        self.controller = PuzzleController(self, problem, self.metrics, SolveCache(path=self.cache_file))
         self.layout = PuzzleLayout(self.controller, self.initial_state)
         return self.layout
 
+    def on_stop(self):
+        self.controller.cache.save()
+
     def display_metrics(self):
         self.show_popup("Métricas de Solución", self.metrics.get_metrics_string())
 
@@ -38,9 +48,10 @@ class PuzzleApp(App):
         close_btn.bind(on_release=popup.dismiss)
         popup.open()
 
-    def save_metrics(self, filename="metrics.txt"):
-        with open(filename, "a") as f:
-            f.write(self.metrics.get_metrics_string() + "\n")
+    def save_metrics(self, filename="metrics.jsonl"):
+        # Un registro JSON por línea (o CSV si filename termina en .csv)
+        with open_sink(filename) as sink:
+            self.metrics.emit(sink)
 
     def reset_puzzle(self):
         """Restaura el tablero al estado inicial actual."""
@@ -49,7 +60,7 @@ class PuzzleApp(App):
 
     def new_puzzle(self):
         """Crea un nuevo tablero y lo establece como estado inicial."""
-        self.initial_state = create_state()
+        self.initial_state = create_state(self.board_size)
         self.controller.problem = Puzzle(self.initial_state)
         self.layout.reset_board(self.initial_state)
 
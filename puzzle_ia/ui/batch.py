@@ -0,0 +1,136 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.abstracts import LimitedProblem, SearchLimitExceeded
+from core.generator import unique_instances
+from core.problem import Puzzle
+from metrics.sinks import open_sink
+from ui.dispatcher import solve_puzzle, HEURISTICS, HEURISTIC_ALGORITHMS
+
+# Resolución en lote: muchos tableros, un algoritmo, varios procesos.
+# Los resultados salen en orden de finalización, no de entrada.
+# "Layered BFS" no reparte tableros: una sola búsqueda por capas (core.layered)
+# resuelve todos a la vez en este proceso.
+
+def _new_row(index, tiles, algorithm, heuristic):
+    return {
+        "indice": index,
+        "estado": list(tiles),
+        "algoritmo": algorithm,
+        "heuristica": heuristic,
+        "solucion_encontrada": False,
+        "pasos": None,
+        "nodos_expandidos": 0,
+        "tiempo": 0.0,
+        "acciones": None,
+    }
+
+def _solve_one(index, tiles, spec):
+    heuristic = spec["heuristic"] if spec["algorithm"] in HEURISTIC_ALGORITHMS else None
+    problem = LimitedProblem(Puzzle(tiles, spec["goal"]), spec["node_limit"], spec["time_limit"])
+    row = _new_row(index, tiles, spec["algorithm"], heuristic)
+    start_time = time.perf_counter()
+    try:
+        solution, expanded = solve_puzzle(
+            problem, spec["algorithm"], HEURISTICS[heuristic] if heuristic else None,
+            spec["weight"], spec["frontier"])
+        if solution:
+            row.update(solucion_encontrada=True, pasos=len(solution) - 1,
+                       acciones=[n.action for n in solution[1:]])
+        row["nodos_expandidos"] = expanded
+    except SearchLimitExceeded as e:
+        row.update(nodos_expandidos=e.expanded, limite=e.reason)
+    except Exception as e:
+        row.update(nodos_expandidos=problem.expanded, error=str(e))
+    row["tiempo"] = round(time.perf_counter() - start_time, 4)
+    return row
+
+def _solve_chunk(chunk, spec):
+    return [_solve_one(i, tiles, spec) for i, tiles in chunk]
+
+def _solve_layered(items, goal):
+    # El tiempo total (tabla de distancias incluida) se reparte entre los tableros;
+    # los estados de la BFS que construye la tabla se cuentan en la primera fila
+    from core.layered import solve_boards
+    from core.stats import SearchStats
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    solutions = solve_boards([tiles for _, tiles in items], goal, stats)
+    each = round((time.perf_counter() - start_time) / max(len(items), 1), 4)
+    for (i, tiles), actions in zip(items, solutions):
+        row = _new_row(i, tiles, "Layered BFS", None)
+        row["nodos_expandidos"], stats.expanded = stats.expanded, 0
+        if actions is not None:
+            row.update(solucion_encontrada=True, pasos=len(actions), acciones=actions)
+        row["tiempo"] = each
+        yield row
+
+def solve_batch(states, algorithm, heuristic=None, weight=1.5, frontier="minheap", goal=None,
+                workers=None, chunksize=1, time_limit=None, node_limit=None):
+    # states: iterable de tuplas; heuristic: nombre en HEURISTICS.
+    # Generador: produce un dict por tablero a medida que terminan.
+    if algorithm in HEURISTIC_ALGORITHMS and heuristic not in HEURISTICS:
+        raise ValueError(f"{algorithm} requiere una heurística: {', '.join(HEURISTICS)}")
+    spec = {"algorithm": algorithm, "heuristic": heuristic, "weight": weight, "frontier": frontier,
+            "goal": goal, "time_limit": time_limit, "node_limit": node_limit}
+    items = list(enumerate(tuple(s) for s in states))
+    if algorithm == "Layered BFS":
+        yield from _solve_layered(items, goal)
+        return
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield from _solve_chunk(chunk, spec)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_solve_chunk, chunk, spec) for chunk in chunks]
+        for fut in as_completed(futures):
+            yield from fut.result()
+
+def read_states(lines):
+    # Un tablero por línea, números separados por espacios o comas; '#' comenta
+    for line in lines:
+        line = line.split("#", 1)[0].replace(",", " ").split()
+        if line:
+            yield tuple(int(x) for x in line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve muchos tableros en paralelo (salida JSONL).")
+    parser.add_argument("file", nargs="?", help="archivo con un tablero por línea ('-' = stdin)")
+    parser.add_argument("--random", type=int, default=0, help="genera N tableros aleatorios en vez de leer un archivo")
+    parser.add_argument("--size", type=int, default=3, help="lado del tablero para --random")
+    parser.add_argument("--seed", type=int, default=None, help="semilla de --random (reproducible)")
+    parser.add_argument("--depth", type=int, default=None, help="--random: paseos de esta longitud desde la meta")
+    parser.add_argument("--exact", action="store_true", help="--depth es la distancia óptima exacta (3x3)")
+    parser.add_argument("-a", "--algorithm", default="A*")
+    parser.add_argument("-H", "--heuristic", default="Manhattan", choices=list(HEURISTICS))
+    parser.add_argument("-w", "--weight", type=float, default=1.5)
+    parser.add_argument("--frontier", default="minheap")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=None, help="segundos por tablero")
+    parser.add_argument("--node-limit", type=int, default=None, help="nodos expandidos por tablero")
+    parser.add_argument("-o", "--output", default="-", help="archivo .jsonl o .csv ('-' = stdout en JSONL)")
+    parser.add_argument("--buffer", type=int, default=64, help="registros acumulados antes de escribir a archivo (stdout: uno a uno)")
+    args = parser.parse_args(argv)
+
+    if args.random:
+        states = list(unique_instances(args.random, args.size, seed=args.seed, depth=args.depth, exact=args.exact))
+    elif args.file == "-" or args.file is None:
+        states = list(read_states(sys.stdin))
+    else:
+        with open(args.file) as f:
+            states = list(read_states(f))
+
+    with open_sink(args.output, args.buffer) as sink:
+        for row in solve_batch(states, args.algorithm, args.heuristic, args.weight, args.frontier,
+                               workers=args.workers, chunksize=args.chunksize,
+                               time_limit=args.time_limit, node_limit=args.node_limit):
+            sink.write(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from math import isqrt
+from kivy.animation import Animation
+from kivy.uix.button import Button
+from kivy.uix.floatlayout import FloatLayout
+
+# Tablero con un botón persistente por ficha (el hueco no tiene widget).
+# set_state compara con el estado anterior y solo mueve las fichas que
+# cambiaron de celda: en un paso de la solución, una. Los botones se crean
+# de nuevo únicamente si cambia el tamaño del tablero.
+# El movimiento puede interpolarse (Animation); con duration=0 la ficha
+# salta a su celda, que es lo que conviene a velocidades altas.
+
+class BoardView(FloatLayout):
+    def __init__(self, on_tile_press, padding=5, spacing=5, **kwargs):
+        super().__init__(**kwargs)
+        self.on_tile_press = on_tile_press
+        self.padding = padding
+        self.spacing = spacing
+        self.n = 0
+        self.cells = []   # valor de cada celda
+        self.tiles = {}   # valor -> botón
+        self.cell_of = {} # valor -> celda actual
+        self.bind(pos=self._relayout, size=self._relayout)
+
+    def _create_tile(self, value):
+        btn = Button(
+            text=str(value),
+            font_size='36sp',
+            size_hint=(None, None),
+            background_normal='',
+            background_color=(0.2, 0.4, 0.5, 1),
+            color=(1, 1, 1, 1)
+        )
+        # la celda se consulta al pulsar: la ficha se mueve
+        btn.bind(on_press=lambda inst: self.on_tile_press(self.cell_of[value]))
+        return btn
+
+    def _build(self, n):
+        self.clear_widgets()
+        self.n = n
+        self.cells = [None] * (n * n)
+        self.cell_of = {}
+        self.tiles = {v: self._create_tile(v) for v in range(1, n * n)}
+        for btn in self.tiles.values():
+            self.add_widget(btn)
+
+    def _cell_size(self):
+        n = self.n
+        return ((self.width - 2 * self.padding - (n - 1) * self.spacing) / n,
+                (self.height - 2 * self.padding - (n - 1) * self.spacing) / n)
+
+    def _cell_pos(self, index):
+        # GridLayout llena de arriba a abajo; aquí igual
+        w, h = self._cell_size()
+        r, c = divmod(index, self.n)
+        return (self.x + self.padding + c * (w + self.spacing),
+                self.top - self.padding - h - r * (h + self.spacing))
+
+    def _relayout(self, *_):
+        if not self.n:
+            return
+        size = self._cell_size()
+        for v, btn in self.tiles.items():
+            Animation.cancel_all(btn)
+            btn.size = size
+            btn.pos = self._cell_pos(self.cell_of[v])
+
+    def set_state(self, tiles, duration=0):
+        # duration > 0: las fichas que cambian de celda se deslizan
+        tiles = list(tiles)
+        n = isqrt(len(tiles))
+        built = n != self.n
+        if built:
+            self._build(n)
+        moved = [(i, v) for i, v in enumerate(tiles) if v and self.cells[i] != v]
+        self.cells = tiles
+        for i, v in moved:
+            self.cell_of[v] = i
+        if built:
+            self._relayout()
+            return
+        for i, v in moved:
+            btn = self.tiles[v]
+            Animation.cancel_all(btn)
+            if duration > 0:
+                Animation(pos=self._cell_pos(i), duration=duration, t='out_quad').start(btn)
+            else:
+                btn.pos = self._cell_pos(i)
@@ -1,11 +1,22 @@
 from core.heuristics import misplaced, manhattan, linear_conflict
-from core.algorithms import BFS, DFS, UCS, Greedy, A_star, IDA_star, Weighted_A_star
+from core.pdb import pattern_database
 from core.problem import Puzzle
+from core.abstracts import SearchLimitExceeded
 from core.create_puzzle import create_state
 from metrics.evaluator import run_search
+from ui.solve_cache import SolveCache
 
-def action_choosing(problem, name, algorithm, heuristic=None, weight=None):
-    if( heuristic != None and weight != None):
+# Las opciones del menú pasan por la caché: repetir algoritmo, o cambiar a otro
+# óptimo sobre el mismo tablero, no vuelve a buscar
+CACHE_FILE = "solve_cache.json"
+
+def action_choosing(problem, name, algorithm, heuristic=None, weight=None, **kwargs):
+    if kwargs:
+        try:
+            print(run_search(name, algorithm, problem, heuristic, **kwargs))
+        except SearchLimitExceeded as e:
+            print(e)
+    elif( heuristic != None and weight != None):
         print(run_search(name, algorithm, problem, heuristic, weight=weight))
     elif(heuristic != None):
         print(run_search(name, algorithm, problem, heuristic))
@@ -19,6 +30,7 @@ def menu_cli():
     print("=== Bienvenido al Solucionador de Rompecabezas ===")
     initial = create_state()
     problem = Puzzle(initial)
+    cache = SolveCache(path=CACHE_FILE)
 
     problem.print_state(problem.initial_state())
     while True:
@@ -32,30 +44,70 @@ def menu_cli():
         print("7. Greedy")
         print("8. IDA*")
         print("9. Weighted A*")
+        print("10. A* (Base de patrones)")
+        print("11. IDA* (Base de patrones)")
+        print("12. BFS bidireccional")
+        print("13. A* bidireccional (manhattan)")
+        print("14. Base de soluciones (óptimo instantáneo, solo 3x3)")
+        print("15. SMA* (conflictos lineales, memoria acotada)")
+        print("16. BFS compacto")
+        print("17. UCS compacto")
+        print("18. A* por lotes (NumPy, conflictos lineales)")
+        print("19. BFS por capas (NumPy, tabla de distancias compartida, hasta 3x3)")
+        print("20. HDA* (A* en paralelo, conflictos lineales)")
+        print("21. IDA* en paralelo (conflictos lineales)")
         print("0. Salir")
 
         choice = input("Selecciona opción: ")
 
         if choice == "1":
-            action_choosing(problem, "BFS", BFS)
+            action_choosing(problem, "BFS", cache.solver("BFS"))
         elif choice == "2":
-            action_choosing(problem, "DFS", DFS)
+            action_choosing(problem, "DFS", cache.solver("DFS"))
         elif choice == "3":
-            action_choosing(problem, "A* (Manhattan)", A_star, manhattan)
+            action_choosing(problem, "A* (Manhattan)", cache.solver("A*"), manhattan)
         elif choice == "4":
-            action_choosing(problem, "A* (Misplaced Tiles)", A_star, misplaced)
+            action_choosing(problem, "A* (Misplaced Tiles)", cache.solver("A*"), misplaced)
         elif choice == "5":
-            action_choosing(problem, "A* (Conflictos Lineales)", A_star, linear_conflict)
+            action_choosing(problem, "A* (Conflictos Lineales)", cache.solver("A*"), linear_conflict)
         elif choice == "6":
-            action_choosing(problem, "UCS", UCS)
+            action_choosing(problem, "UCS", cache.solver("UCS"))
         elif choice == "7":
-            action_choosing(problem, "Greedy (manhattan)", Greedy, manhattan)
+            action_choosing(problem, "Greedy (manhattan)", cache.solver("Greedy"), manhattan)
         elif choice == "8":
-            action_choosing(problem, "IDA* (manhattan)", IDA_star, manhattan)
+            action_choosing(problem, "IDA* (manhattan)", cache.solver("IDA*"), manhattan)
         elif choice == "9":
             w = float(input("Introduce el valor de w: "))
-            action_choosing(problem, f"Weighted A* (w={w})", Weighted_A_star, manhattan, weight=w)
+            action_choosing(problem, f"Weighted A* (w={w})", cache.solver("Weighted A*"), manhattan, weight=w)
+        elif choice == "10":
+            action_choosing(problem, "A* (Base de patrones)", cache.solver("A*"), pattern_database)
+        elif choice == "11":
+            action_choosing(problem, "IDA* (Base de patrones)", cache.solver("IDA*"), pattern_database)
+        elif choice == "12":
+            action_choosing(problem, "BFS bidireccional", cache.solver("Bidirectional BFS"))
+        elif choice == "13":
+            action_choosing(problem, "A* bidireccional (manhattan)", cache.solver("Bidirectional A*"), manhattan)
+        elif choice == "14":
+            action_choosing(problem, "Base de soluciones", cache.solver("Solution DB"))
+        elif choice == "15":
+            m = int(input("Máximo de nodos en memoria: "))
+            action_choosing(problem, f"SMA* (max {m} nodos)", cache.solver("SMA*"), linear_conflict, max_nodes=m)
+        elif choice == "16":
+            action_choosing(problem, "BFS compacto", cache.solver("Compact BFS"))
+        elif choice == "17":
+            action_choosing(problem, "UCS compacto", cache.solver("Compact UCS"))
+        elif choice == "18":
+            action_choosing(problem, "A* por lotes (conflictos lineales)", cache.solver("Batched A*"), linear_conflict)
+        elif choice == "19":
+            action_choosing(problem, "BFS por capas", cache.solver("Layered BFS"))
+        elif choice == "20":
+            w = int(input("Número de procesos: "))
+            action_choosing(problem, f"HDA* ({w} procesos)", cache.solver("HDA*"), linear_conflict, workers=w)
+        elif choice == "21":
+            w = int(input("Número de procesos: "))
+            action_choosing(problem, f"IDA* paralelo ({w} procesos)", cache.solver("Parallel IDA*"), linear_conflict, workers=w)
         elif choice == "0":
+            cache.save()
             print("Saliendo...")
             break
         else:
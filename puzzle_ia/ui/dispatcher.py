@@ -1,19 +1,108 @@
-from core.algorithms import BFS, DFS, UCS, Greedy, A_star, IDA_star, Weighted_A_star
+from core.algorithms import BFS, DFS, UCS, Greedy, A_star, IDA_star, Weighted_A_star, SMA_star, HDA_star
+from core.algorithms import Parallel_IDA_star
+from core.algorithms import Bidirectional_BFS, Bidirectional_A_star, Solution_DB, Layered_BFS
+from core.algorithms import Compact_BFS, Compact_UCS
+from core.structures import FRONTIERS
+from core.problem import board_size, board_tables
+from core.heuristics import manhattan, misplaced, linear_conflict
+from core.pdb import pattern_database, DEFAULT_GROUPS
+from core.solution_db import solution_db
 
-def solve_puzzle(problem, algorithm, heuristic=None, weight=1.5):
+HEURISTICS = {
+    "Manhattan": manhattan,
+    "Misplaced Tiles": misplaced,
+    "Linear Conflict": linear_conflict,
+    "Pattern Database": pattern_database,
+    "Solution DB": solution_db,
+}
+# Tablas precalculadas para la meta estándar: no sirven hacia otra meta
+# (la búsqueda hacia atrás de Bidirectional A*, metas propias)
+FIXED_GOAL_HEURISTICS = ("Pattern Database", "Solution DB")
+# Tamaños de tablero para los que existe cada tabla
+TABLE_SIZES = {"Pattern Database": tuple(DEFAULT_GROUPS), "Solution DB": (3,)}
+HEURISTIC_ALGORITHMS = ("A*", "Greedy", "Weighted A*", "IDA*", "Bidirectional A*", "SMA*", "Batched A*",
+                        "HDA*", "Parallel IDA*")
+# Devuelven un camino de coste mínimo (con heurísticas admisibles, como todas las de HEURISTICS)
+OPTIMAL_ALGORITHMS = ("BFS", "UCS", "A*", "IDA*", "Bidirectional BFS", "Bidirectional A*", "SMA*",
+                      "Compact BFS", "Compact UCS", "Solution DB", "Batched A*", "Layered BFS",
+                      "HDA*", "Parallel IDA*")
+
+def available_heuristics(problem, algorithm=None):
+    # Nombres de HEURISTICS que sirven para este problema: las tablas
+    # precalculadas solo con la meta estándar, en su tamaño de tablero y fuera
+    # de Bidirectional A* (la búsqueda hacia atrás necesita h hacia el inicio)
+    goal = tuple(problem.goal_state().tiles)
+    n = board_size(goal)
+    fixed_ok = (algorithm != "Bidirectional A*" and goal == tuple(board_tables(n).goal))
+    return [name for name in HEURISTICS
+            if name not in FIXED_GOAL_HEURISTICS or (fixed_ok and n in TABLE_SIZES[name])]
+
+def _bind_goal(h, problem):
+    # h hacia la meta del problema: las de core.heuristics se redirigen con
+    # for_goal; las tablas precalculadas solo valen para la meta estándar
+    if h is None: return None
+    goal = tuple(problem.goal_state().tiles)
+    own = getattr(h, "goal", None) or board_tables(board_size(goal)).goal
+    if tuple(own) == goal: return h
+    if hasattr(h, "for_goal"): return h.for_goal(goal)
+    name = next((k for k, v in HEURISTICS.items() if v is h), getattr(h, "name", h))
+    raise ValueError(f"La heurística {name} solo admite la meta estándar")
+
+def solve_puzzle(problem, algorithm, heuristic=None, weight=1.5, frontier="minheap", stats=None,
+                 max_nodes=None, max_bytes=None, workers=None, checkpoint=None, tt_size=None):
+    # frontier: "minheap", "heapq" o "bucket" (solo prioridades enteras)
+    # stats: SearchStats opcional (core.stats)
+    # checkpoint: ruta o Checkpointer (core.checkpoint); BFS, A* e IDA* guardan
+    # su estado periódicamente y se reanudan desde él
+    # max_nodes / max_bytes: presupuesto de memoria de SMA*; si no alcanza lanza
+    # SearchLimitExceeded("memoria", ...)
+    # tt_size: entradas de la tabla de transposición de IDA* (None = sin tabla)
+    if frontier not in FRONTIERS:
+        raise ValueError(f"Frontera no soportada: {frontier}")
+    pq = FRONTIERS[frontier]
+    # con un peso fraccionario g + w*h no es entero: se avisa antes de buscar
+    if frontier == "bucket" and algorithm == "Weighted A*" and not float(weight).is_integer():
+        raise ValueError(f"La frontera bucket requiere un peso entero en Weighted A*, recibido {weight}")
+    # las instancias de HEURISTICS apuntan a la meta estándar
+    heuristic = _bind_goal(heuristic, problem)
+    if checkpoint is not None:
+        from core.checkpoint import solve_checkpointed
+        return solve_checkpointed(problem, algorithm, heuristic, checkpoint, stats=stats)
     if algorithm == "BFS":
-        return BFS(problem)
+        return BFS(problem, stats=stats)
     elif algorithm == "DFS":
-        return DFS(problem)
+        return DFS(problem, stats=stats)
     elif algorithm == "UCS":
-        return UCS(problem)
+        return UCS(problem, frontier=pq, stats=stats)
     elif algorithm == "Greedy":
-        return Greedy(problem, heuristic)
+        return Greedy(problem, heuristic, frontier=pq, stats=stats)
     elif algorithm == "A*":
-        return A_star(problem, heuristic)
+        return A_star(problem, heuristic, frontier=pq, stats=stats)
     elif algorithm == "Weighted A*":
-        return Weighted_A_star(problem, heuristic, weight)
+        return Weighted_A_star(problem, heuristic, weight, frontier=pq, stats=stats)
     elif algorithm == "IDA*":
-        return IDA_star(problem, heuristic)
+        return IDA_star(problem, heuristic, stats=stats, tt_size=tt_size)
+    elif algorithm == "Bidirectional BFS":
+        return Bidirectional_BFS(problem, stats=stats)
+    elif algorithm == "Bidirectional A*":
+        return Bidirectional_A_star(problem, heuristic, stats=stats)
+    elif algorithm == "Compact BFS":
+        return Compact_BFS(problem, stats=stats)
+    elif algorithm == "Compact UCS":
+        return Compact_UCS(problem, stats=stats)
+    elif algorithm == "Batched A*":
+        # requiere NumPy; solo heurísticas con versión en lote (core.vectorized)
+        from core.vectorized import batched_a_star, batch_for
+        return batched_a_star(problem, batch_for(heuristic), stats=stats)
+    elif algorithm == "HDA*":
+        return HDA_star(problem, heuristic, workers, stats=stats)
+    elif algorithm == "Parallel IDA*":
+        return Parallel_IDA_star(problem, heuristic, workers, stats=stats)
+    elif algorithm == "SMA*":
+        return SMA_star(problem, heuristic, max_nodes, max_bytes, stats=stats)
+    elif algorithm == "Solution DB":
+        return Solution_DB(problem, stats=stats)
+    elif algorithm == "Layered BFS":
+        return Layered_BFS(problem, stats=stats)
     else:
         raise ValueError("Algoritmo no soportado")
\ No newline at end of file
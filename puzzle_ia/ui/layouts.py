@@ -1,10 +1,11 @@
 from controllers.puzzle_controller import PuzzleController
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.spinner import Spinner
 from kivy.uix.label import Label
 from kivy.uix.slider import Slider
+from ui.board import BoardView
+from ui.dispatcher import available_heuristics
 
 
 class PuzzleLayout(BoxLayout):
@@ -33,7 +34,9 @@ class PuzzleLayout(BoxLayout):
 
         self.algo_spinner = Spinner(
             text='Choose the algorithm',
-            values=('BFS', 'DFS', 'UCS', 'Greedy', 'A*', 'Weighted A*', 'IDA*'),
+            values=('BFS', 'DFS', 'UCS', 'Greedy', 'A*', 'Weighted A*', 'IDA*',
+                    'Bidirectional BFS', 'Bidirectional A*', 'SMA*', 'Batched A*', 'HDA*', 'Parallel IDA*', 'Compact BFS',
+                    'Compact UCS', 'Solution DB', 'Layered BFS'),
             size_hint=(0.7, 1)
         )
         self.algo_spinner.bind(text=self.controller.on_algorithm_selected)
@@ -45,7 +48,7 @@ class PuzzleLayout(BoxLayout):
 
         self.heuristic_spinner = Spinner(
             text='Choose the heuristic',
-            values=('Manhattan', 'Misplaced Tiles', 'Linear Conflict'),
+            values=available_heuristics(controller.problem),
             size_hint=(0.7, 1),
             opacity=0,
             disabled=True
@@ -111,6 +114,22 @@ class PuzzleLayout(BoxLayout):
         self.compare_button.bind(on_press=self.controller.run_heuristic_comparison)
         compare_row.add_widget(self.compare_button)
 
+        # Cancelar la búsqueda en curso y progreso (nodos, cota f)
+        self.cancel_button = Button(
+            text='Cancel',
+            size_hint=(0.25, 1),
+            font_size='20sp',
+            background_normal='',
+            background_color=(0.5, 0.5, 0.5, 1),
+            color=(1, 1, 1, 1),
+            disabled=True
+        )
+        self.cancel_button.bind(on_press=self.controller.cancel_solve)
+        compare_row.add_widget(self.cancel_button)
+
+        self.progress_label = Label(text='', size_hint=(0.5, 1))
+        compare_row.add_widget(self.progress_label)
+
         # Controles de animación
         anim_row = BoxLayout(orientation='horizontal', spacing=10, size_hint_y=0.2)
 
@@ -144,9 +163,9 @@ class PuzzleLayout(BoxLayout):
         # ===============================
         # Tablero
         # ===============================
-        self.board_layout = GridLayout(
-            cols=3,
-            rows=3,
+        # Fichas persistentes: cada paso solo mueve las que cambian (ui/board.py)
+        self.board_layout = BoardView(
+            self.controller.on_tile_press,
             padding=5,
             spacing=5,
             size_hint_y=0.6
@@ -162,20 +181,6 @@ class PuzzleLayout(BoxLayout):
     # -------------------------------
     # Helpers
     # -------------------------------
-    def create_tile(self, value: int, index: int):
-        """Crea un botón para representar una celda del puzzle."""
-        btn = Button(
-            text='' if value == 0 else str(value),
-            font_size='36sp',
-            background_normal='',
-            background_color=(0, 0, 0, 0) if value == 0 else (0.2, 0.4, 0.5, 1),
-            color=(1, 1, 1, 1)
-        )
-        btn.bind(on_press=lambda inst: self.controller.on_tile_press(index))
-        return btn
-
     def reset_board(self, new_state):
         """Reinicia el tablero con un nuevo estado."""
-        self.board_layout.clear_widgets()
-        for index, tile in enumerate(new_state):
-            self.board_layout.add_widget(self.create_tile(tile, index))
\ No newline at end of file
+        self.board_layout.set_state(new_state)
@@ -0,0 +1,117 @@
+import json
+import os
+from collections import OrderedDict
+from core.abstracts import path_from_actions
+from ui.dispatcher import solve_puzzle, HEURISTICS, OPTIMAL_ALGORITHMS
+
+# Caché de soluciones delante de solve_puzzle.
+# - Clave exacta: (tablero, meta, algoritmo, heurística, peso); el peso solo
+#   cuenta en Weighted A*.
+# - Los algoritmos óptimos comparten además una entrada por tablero: un
+#   camino óptimo de BFS sirve para A*, IDA*, UCS...
+# - fold_symmetry: en esas entradas óptimas se pliega la simetría de
+#   trasponer el tablero (renombrando fichas para que la meta no cambie);
+#   UP<->LEFT y DOWN<->RIGHT. Un tablero y su traspuesto comparten entrada.
+# - LRU acotado (OrderedDict) y persistencia opcional en JSON (acciones).
+# Los aciertos devuelven el camino reconstruido; los de la entrada óptima
+# compartida devuelven 0 nodos expandidos (no se buscó nada).
+
+SWAP = {"UP": "LEFT", "LEFT": "UP", "DOWN": "RIGHT", "RIGHT": "DOWN"}
+_NAMES = {id(h): name for name, h in HEURISTICS.items()}
+
+def heuristic_name(h):
+    if h is None: return None
+    return _NAMES.get(id(h)) or getattr(h, "name", None) or getattr(h, "__name__", repr(h))
+
+def transpose(tiles, goal):
+    # Tablero traspuesto con las fichas renombradas; None si la meta no tiene
+    # el hueco en la diagonal (entonces la simetría no conserva la meta)
+    n = round(len(tiles) ** 0.5)
+    tr = [(i % n) * n + i // n for i in range(n * n)]
+    pos = {v: i for i, v in enumerate(goal)}
+    if tr[pos[0]] != pos[0]: return None
+    out = [0] * (n * n)
+    for i, v in enumerate(tiles):
+        out[tr[i]] = goal[tr[pos[v]]]
+    return tuple(out)
+
+class SolveCache:
+    def __init__(self, maxsize=256, fold_symmetry=True, path=None):
+        self.maxsize = maxsize
+        self.fold_symmetry = fold_symmetry
+        self.path = path
+        self.entries = OrderedDict()  # clave -> (acciones, expandidos)
+        self.hits = self.misses = 0
+        if path is not None: self.load(path)
+
+    def _get(self, key):
+        v = self.entries.get(key)
+        if v is not None: self.entries.move_to_end(key)
+        return v
+
+    def _put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def _optimal_key(self, board, goal):
+        # (clave, traspuesto?) con el tablero canónico = el menor de los dos
+        if self.fold_symmetry:
+            t = transpose(board, goal)
+            if t is not None and t < board:
+                return ("*", t, goal), True
+        return ("*", board, goal), False
+
+    def solve(self, problem, algorithm, heuristic=None, weight=1.5, frontier="minheap", stats=None, **kwargs):
+        # Misma firma y resultado que solve_puzzle
+        board, goal = tuple(problem.initial_state().tiles), tuple(problem.goal)
+        hname = heuristic_name(heuristic)
+        key = (board, goal, algorithm, hname, weight if algorithm == "Weighted A*" else None)
+        hit = self._get(key)
+        if hit is not None:
+            self.hits += 1
+            return path_from_actions(problem, hit[0]), hit[1]
+        optimal = algorithm in OPTIMAL_ALGORITHMS
+        if optimal:
+            okey, flipped = self._optimal_key(board, goal)
+            hit = self._get(okey)
+            if hit is not None:
+                self.hits += 1
+                actions = [SWAP[a] for a in hit[0]] if flipped else hit[0]
+                return path_from_actions(problem, actions), 0
+        self.misses += 1
+        path, expanded = solve_puzzle(problem, algorithm, heuristic, weight, frontier, stats, **kwargs)
+        if path:
+            actions = [n.action for n in path[1:]]
+            self._put(key, (actions, expanded))
+            if optimal:
+                self._put(okey, ([SWAP[a] for a in actions] if flipped else actions, expanded))
+        return path, expanded
+
+    def solver(self, algorithm):
+        # Función (problem, heuristic=None, **kwargs) para run_search y similares
+        return lambda problem, heuristic=None, **kwargs: self.solve(problem, algorithm, heuristic, **kwargs)
+
+    def clear(self):
+        self.entries.clear()
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None: return
+        data = [list(k) + [v[0], v[1]] for k, v in self.entries.items()]
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "entradas": data}, f)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        try:
+            with open(path) as f: data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for row in data.get("entradas", []):
+            *key, actions, expanded = row
+            # las tuplas de tablero/meta vuelven como listas en JSON
+            key = tuple(tuple(x) if isinstance(x, list) else x for x in key)
+            self._put(key, (actions, expanded))